@@ -0,0 +1,369 @@
+"""
+Module : affiches
+Fonction : recherche, téléchargement et préchargement en arrière-plan des affiches de films.
+"""
+
+import json
+import mimetypes
+import os
+import queue
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+try:
+    from PIL import Image
+    HAS_PIL = True
+except Exception:
+    HAS_PIL = False
+
+DEFAULT_OMDB_KEY = "bb3780f4"
+DEFAULT_TMDB_KEY = "05567543c456f676f3852789a096ce75"
+
+# Points d'accès des services (modifiables, ex: serveur local pour les benchmarks)
+OMDB_URL = os.environ.get('OMDB_URL', "http://www.omdbapi.com/")
+TMDB_URL = os.environ.get('TMDB_URL', "https://api.themoviedb.org/3/search/movie")
+TMDB_IMAGE_URL = os.environ.get('TMDB_IMAGE_URL', "https://image.tmdb.org/t/p/w500")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DOSSIER_AFFICHES = os.path.join(BASE_DIR, 'posters')
+
+NB_TELECHARGEURS = 8  # nombre de threads de préchargement par défaut
+
+FICHIER_CACHE = 'cache_affiches.json'  # dans le dossier des affiches
+TTL_TROUVE = 30 * 24 * 3600  # affiche trouvée : revalidation (ETag/Last-Modified) après 30 jours
+TTL_ABSENT = 7 * 24 * 3600   # aucune affiche : nouvelle recherche après 7 jours
+
+DOSSIER_MINIATURES = 'miniatures'  # sous-dossier des vignettes pré-générées
+TAILLE_MINIATURE = (160, 240)
+
+
+def nom_fichier(titre: str) -> str:
+    """Nom de fichier sûr pour un titre (caractères non alphanumériques remplacés)."""
+    return ''.join(c if c.isalnum() else '_' for c in titre)
+
+
+def _chercher_en_ligne(titre: str) -> Tuple[Optional[str], bool]:
+    """
+    Cherche l'URL d'affiche sur OMDb (clé OMDB_API_KEY) ou TMDb (TMDB_API_KEY).
+    Retourne (url, repondu) : repondu vaut False si aucun service n'a pu être joint.
+    """
+    omdb_key = os.environ.get('OMDB_API_KEY') or DEFAULT_OMDB_KEY
+    tmdb_key = os.environ.get('TMDB_API_KEY') or DEFAULT_TMDB_KEY
+    title_q = urllib.parse.quote_plus(titre)
+    repondu = False
+    # OMDb
+    if omdb_key:
+        try:
+            url = f"{OMDB_URL}?t={title_q}&apikey={omdb_key}"
+            with urllib.request.urlopen(url, timeout=10) as resp:
+                data = json.load(resp)
+            repondu = True
+            poster = data.get('Poster')
+            if poster and poster != 'N/A':
+                return poster, True
+        except Exception:
+            pass
+    # TMDb
+    if tmdb_key:
+        try:
+            url = f"{TMDB_URL}?api_key={tmdb_key}&query={title_q}"
+            with urllib.request.urlopen(url, timeout=10) as resp:
+                data = json.load(resp)
+            repondu = True
+            results = data.get('results', [])
+            if results:
+                poster_path = results[0].get('poster_path')
+                if poster_path:
+                    return f"{TMDB_IMAGE_URL}{poster_path}", True
+        except Exception:
+            pass
+    return None, repondu
+
+
+def _telecharger(url: str, dest_path: str, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Télécharge une image (requête conditionnelle si etag/last_modified sont fournis).
+    Retourne {'chemin', 'etag', 'last_modified', 'modifie'} ou None en cas d'échec.
+    """
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    try:
+        req = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(req, timeout=20) as resp:
+            data = resp.read()
+            # essayer déterminer extension
+            content_type = resp.headers.get('Content-Type')
+            ext = None
+            if content_type:
+                ext = mimetypes.guess_extension(content_type.split(';')[0].strip())
+            if not ext:
+                parsed = urllib.parse.urlparse(url)
+                root, e = os.path.splitext(parsed.path)
+                ext = e or '.jpg'
+            if not dest_path.lower().endswith(ext):
+                dest_path = dest_path + ext
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            # écriture atomique : l'interface ne doit jamais lire un fichier partiel
+            tmp_path = f"{dest_path}.{threading.get_ident()}.part"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, dest_path)
+            return {'chemin': dest_path, 'etag': resp.headers.get('ETag'),
+                    'last_modified': resp.headers.get('Last-Modified'), 'modifie': True}
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return {'chemin': dest_path, 'etag': etag, 'last_modified': last_modified, 'modifie': False}
+        return None
+    except Exception:
+        return None
+
+
+class CacheAffiches:
+    """
+    Cache disque des recherches d'affiches : titre -> URL, chemin local ou "absent".
+    Les absences sont mémorisées (cache négatif) pour ne pas refaire indéfiniment
+    les mêmes recherches ; chaque entrée expire selon son TTL.
+    """
+
+    def __init__(self, chemin: str, ttl_trouve: float = TTL_TROUVE, ttl_absent: float = TTL_ABSENT):
+        self.chemin = chemin
+        self.ttl_trouve = ttl_trouve
+        self.ttl_absent = ttl_absent
+        self._entrees: Dict[str, dict] = {}
+        self._modifie = False
+        self._verrou = threading.Lock()
+        try:
+            with open(chemin, encoding='utf-8') as f:
+                self._entrees = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def get(self, titre: str) -> Optional[dict]:
+        """Retourne l'entrée du cache pour un titre (copie) ou None."""
+        with self._verrou:
+            e = self._entrees.get(titre)
+            return dict(e) if e else None
+
+    def est_valide(self, entree: dict) -> bool:
+        """Indique si une entrée est encore dans sa durée de validité."""
+        ttl = self.ttl_trouve if entree.get('statut') == 'ok' else self.ttl_absent
+        return time.time() - entree.get('date', 0) < ttl
+
+    def enregistrer_trouve(self, titre: str, url: str, chemin: str,
+                           etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Mémorise une affiche trouvée et stockée localement."""
+        self._poser(titre, {'statut': 'ok', 'url': url, 'chemin': os.path.relpath(chemin, BASE_DIR),
+                            'etag': etag, 'last_modified': last_modified, 'date': time.time()})
+
+    def enregistrer_absent(self, titre: str) -> None:
+        """Mémorise qu'aucune affiche n'existe pour ce titre."""
+        self._poser(titre, {'statut': 'absent', 'date': time.time()})
+
+    def _poser(self, titre: str, entree: dict) -> None:
+        with self._verrou:
+            self._entrees[titre] = entree
+            self._modifie = True
+
+    def sauver(self) -> None:
+        """Écrit le cache sur disque (atomiquement) s'il a été modifié."""
+        with self._verrou:
+            if not self._modifie:
+                return
+            os.makedirs(os.path.dirname(self.chemin) or '.', exist_ok=True)
+            tmp = self.chemin + '.part'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._entrees, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.chemin)
+            self._modifie = False
+
+
+def trouver_affiche(film, dossier: str = DOSSIER_AFFICHES) -> Optional[str]:
+    """Retourne le chemin local de l'affiche d'un film s'il existe, sinon None."""
+    # Priorité: chemin explicite dans l'objet film
+    candidates = []
+    if getattr(film, 'affiche', None):
+        candidates.append(os.path.join(BASE_DIR, film.affiche))
+        candidates.append(film.affiche)
+    # chercher dans dossier posters par titre (espaces remplacés)
+    safe_name = nom_fichier(film.titre)
+    exts = ['.png', '.jpg', '.jpeg', '.gif']
+    for ext in exts:
+        candidates.append(os.path.join(dossier, f"{safe_name}{ext}"))
+        candidates.append(os.path.join(dossier, f"{film.titre}{ext}"))
+        candidates.append(os.path.join(BASE_DIR, f"{safe_name}{ext}"))
+        candidates.append(os.path.join(BASE_DIR, f"{film.titre}{ext}"))
+    for p in candidates:
+        if p and os.path.exists(p):
+            return p
+    return None
+
+
+def recuperer_affiche(film, dossier: str = DOSSIER_AFFICHES,
+                      cache: Optional[CacheAffiches] = None) -> Optional[str]:
+    """
+    Retourne l'affiche locale du film, ou la télécharge si elle n'existe pas encore.
+    Si un cache est fourni, il est consulté avant tout accès réseau.
+    """
+    entree = cache.get(film.titre) if cache else None
+    if entree and entree['statut'] == 'absent' and cache.est_valide(entree):
+        return None
+    existing = trouver_affiche(film, dossier)
+    if entree and entree['statut'] == 'ok':
+        chemin = os.path.normpath(os.path.join(BASE_DIR, entree['chemin']))
+        if existing and cache.est_valide(entree):
+            return existing
+        # entrée expirée ou fichier disparu : revalidation conditionnelle de l'URL connue
+        cond = os.path.exists(chemin)
+        res = _telecharger(entree['url'], os.path.splitext(chemin)[0],
+                           entree.get('etag') if cond else None,
+                           entree.get('last_modified') if cond else None)
+        if res:
+            if not res['modifie']:  # 304 : le fichier local est toujours à jour
+                res['chemin'] = chemin
+            cache.enregistrer_trouve(film.titre, entree['url'], res['chemin'],
+                                     res['etag'], res['last_modified'])
+            return res['chemin']
+        return existing
+    # Si affiche déjà trouvée localement, garder
+    if existing:
+        return existing
+    # tenter récupération en ligne
+    url, repondu = _chercher_en_ligne(film.titre)
+    if not url:
+        # une erreur réseau n'est pas une absence : on ne la met pas en cache
+        if cache and repondu:
+            cache.enregistrer_absent(film.titre)
+        return None
+    res = _telecharger(url, os.path.join(dossier, nom_fichier(film.titre)))
+    if not res:
+        return None
+    if cache:
+        cache.enregistrer_trouve(film.titre, url, res['chemin'], res['etag'], res['last_modified'])
+    return res['chemin']
+
+
+def generer_miniature(chemin: str, dossier: str) -> Optional[str]:
+    """
+    Retourne la vignette PNG d'une affiche, générée si absente ou plus ancienne que l'affiche.
+    PNG pour pouvoir être relue par tk.PhotoImage même sans PIL ; None si PIL est absent.
+    """
+    if not HAS_PIL:
+        return None
+    dest = os.path.join(dossier, os.path.splitext(os.path.basename(chemin))[0] + '.png')
+    try:
+        if os.path.getmtime(dest) >= os.path.getmtime(chemin):
+            return dest
+    except OSError:
+        pass
+    try:
+        img = Image.open(chemin)
+        img.thumbnail(TAILLE_MINIATURE)
+        os.makedirs(dossier, exist_ok=True)
+        tmp = f"{dest}.{threading.get_ident()}.part"
+        img.save(tmp, 'PNG')
+        os.replace(tmp, dest)
+        return dest
+    except Exception:
+        return None
+
+
+class CacheLRU:
+    """Cache mémoire borné : les entrées les moins récemment utilisées sont évincées."""
+
+    def __init__(self, taille_max: int = 256):
+        self.taille_max = taille_max
+        self._entrees: "OrderedDict" = OrderedDict()
+
+    def get(self, cle: Hashable):
+        """Retourne la valeur associée à la clé (ou None) et la marque comme récente."""
+        valeur = self._entrees.get(cle)
+        if valeur is not None:
+            self._entrees.move_to_end(cle)
+        return valeur
+
+    def put(self, cle: Hashable, valeur) -> None:
+        """Ajoute une valeur, en évinçant la plus ancienne si le cache est plein."""
+        self._entrees[cle] = valeur
+        self._entrees.move_to_end(cle)
+        while len(self._entrees) > self.taille_max:
+            self._entrees.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entrees)
+
+
+class PrefetchAffiches:
+    """
+    Précharge les affiches en arrière-plan avec un nombre borné de threads,
+    et génère leurs vignettes pour que l'interface ne décode jamais d'affiche pleine taille.
+    Les résultats sont déposés dans une file ; l'interface les récupère depuis
+    son propre thread via `traiter_resultats` (Tk n'est pas thread-safe).
+    """
+
+    def __init__(self, nb_threads: int = NB_TELECHARGEURS, dossier: str = DOSSIER_AFFICHES,
+                 cache: Optional[CacheAffiches] = None):
+        self.dossier = dossier
+        self.cache = cache if cache is not None else CacheAffiches(os.path.join(dossier, FICHIER_CACHE))
+        self.dossier_miniatures = os.path.join(dossier, DOSSIER_MINIATURES)
+        self._a_faire: "queue.Queue" = queue.Queue()
+        self._resultats: "queue.Queue" = queue.Queue()
+        self._en_cours = set()
+        self._verrou = threading.Lock()
+        self._threads = []
+        for _ in range(nb_threads):
+            t = threading.Thread(target=self._travailler, daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def demander(self, films: Iterable) -> None:
+        """Ajoute des films à précharger (ignorés s'ils sont déjà en file)."""
+        for film in films:
+            with self._verrou:
+                if film.titre in self._en_cours:
+                    continue
+                self._en_cours.add(film.titre)
+            self._a_faire.put(film)
+
+    def en_attente(self) -> int:
+        """Nombre de films demandés dont le résultat n'a pas encore été traité."""
+        with self._verrou:
+            return len(self._en_cours)
+
+    def _travailler(self) -> None:
+        while True:
+            film = self._a_faire.get()
+            chemin = miniature = None
+            try:
+                chemin = recuperer_affiche(film, self.dossier, self.cache)
+                if chemin:
+                    miniature = generer_miniature(chemin, self.dossier_miniatures)
+            except Exception:
+                pass
+            # file vide : on persiste le cache une fois le lot traité
+            if self._a_faire.empty():
+                try:
+                    self.cache.sauver()
+                except OSError:
+                    pass
+            self._resultats.put((film, chemin, miniature))
+
+    def traiter_resultats(self, rappel: Callable) -> int:
+        """Appelle `rappel(film, chemin, miniature)` pour chaque affiche arrivée, retourne le nombre traité."""
+        n = 0
+        while True:
+            try:
+                film, chemin, miniature = self._resultats.get_nowait()
+            except queue.Empty:
+                return n
+            with self._verrou:
+                self._en_cours.discard(film.titre)
+            rappel(film, chemin, miniature)
+            n += 1
@@ -0,0 +1,225 @@
+"""
+Module : analyses
+Fonction : statistiques de fréquentation (taux de remplissage, meilleures ventes, cartes de chaleur).
+
+Les séances sont d'abord exportées en colonnes (une ligne par séance, un tableau `array`
+par colonne, films codés par entier) ; les agrégations se font ensuite sur ces colonnes,
+sans parcourir les objets Seance ni les réservations une à une.
+Si NumPy est installé, les sommes par clé sont calculées par numpy.bincount.
+L'export se fait en CSV ou en format colonnes (un fichier binaire par colonne + schema.json).
+"""
+
+import csv
+import json
+import os
+import sys
+from array import array
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except Exception:
+    HAS_NUMPY = False
+
+from reservation import GestionSeances, Seance
+
+
+# colonnes de la table des séances (toutes entières, typecode 'i' : 32 bits)
+COLONNES = ('seance', 'film', 'salle', 'jour', 'creneau', 'capacite', 'vendues')
+REGROUPEMENTS = ('film', 'salle', 'jour', 'creneau')
+
+
+class TableSeances:
+    """
+    Table des séances en colonnes : une ligne par séance.
+    film : code du film (indice dans `films`) ; jour : ordinal de la date (date.toordinal) ;
+    creneau : heure de début (0-23) ; vendues : places réservées au moment de l'export.
+    """
+
+    def __init__(self, films: Optional[List[str]] = None):
+        self.films: List[str] = films if films is not None else []
+        self.colonnes: Dict[str, array] = {nom: array('i') for nom in COLONNES}
+
+    @classmethod
+    def depuis_seances(cls, seances: Iterable[Seance]) -> "TableSeances":
+        """Exporte des séances (instantané des places vendues) en colonnes."""
+        table = cls()
+        codes: Dict[str, int] = {}
+        jours: Dict[str, int] = {}  # "AAAA-MM-JJ" -> ordinal, une conversion par jour distinct
+        c = table.colonnes
+        for s in seances:
+            titre = s.film.titre
+            code = codes.get(titre)
+            if code is None:
+                code = codes[titre] = len(table.films)
+                table.films.append(titre)
+            jour = s.horaire[:10]
+            ordinal = jours.get(jour)
+            if ordinal is None:
+                ordinal = jours[jour] = date.fromisoformat(jour).toordinal()
+            c['seance'].append(s.id)
+            c['film'].append(code)
+            c['salle'].append(s.salle.numero)
+            c['jour'].append(ordinal)
+            c['creneau'].append(int(s.horaire[11:13]))
+            c['capacite'].append(s.salle.capacite)
+            c['vendues'].append(s.places_vendues())
+        return table
+
+    @classmethod
+    def depuis_gestion(cls, gestion: GestionSeances) -> "TableSeances":
+        return cls.depuis_seances(gestion.lister_seances())
+
+    def __len__(self) -> int:
+        return len(self.colonnes['seance'])
+
+    def ecrire_csv(self, chemin: str) -> None:
+        """Écrit la table en CSV (titre du film et date en clair)."""
+        c = self.colonnes
+        with open(chemin, 'w', newline='', encoding='utf-8') as f:
+            w = csv.writer(f)
+            w.writerow(COLONNES)
+            films = self.films
+            w.writerows((s, films[fi], sa, date.fromordinal(j).isoformat(), cr, ca, v)
+                        for s, fi, sa, j, cr, ca, v in zip(*(c[nom] for nom in COLONNES)))
+
+    def ecrire_colonnes(self, dossier: str) -> None:
+        """
+        Écrit la table en format colonnes dans `dossier` : un fichier <colonne>.bin par colonne
+        (entiers 32 bits bruts, relisibles par array.fromfile ou numpy.fromfile) et un schema.json.
+        """
+        os.makedirs(dossier, exist_ok=True)
+        for nom, col in self.colonnes.items():
+            with open(os.path.join(dossier, f"{nom}.bin"), 'wb') as f:
+                col.tofile(f)
+        schema = {'lignes': len(self), 'type': 'int32', 'ordre_octets': sys.byteorder,
+                  'colonnes': list(COLONNES), 'films': self.films}
+        with open(os.path.join(dossier, "schema.json"), 'w', encoding='utf-8') as f:
+            json.dump(schema, f, ensure_ascii=False)
+
+    @classmethod
+    def lire_colonnes(cls, dossier: str) -> "TableSeances":
+        """Relit une table écrite par `ecrire_colonnes`. Lève ValueError si le format est inconnu."""
+        with open(os.path.join(dossier, "schema.json"), encoding='utf-8') as f:
+            schema = json.load(f)
+        if schema.get('type') != 'int32' or list(schema.get('colonnes', ())) != list(COLONNES):
+            raise ValueError(f"Format de table inconnu dans {dossier}.")
+        table = cls(schema['films'])
+        for nom in COLONNES:
+            col = table.colonnes[nom]
+            with open(os.path.join(dossier, f"{nom}.bin"), 'rb') as f:
+                col.fromfile(f, schema['lignes'])
+            if schema['ordre_octets'] != sys.byteorder:
+                col.byteswap()
+        return table
+
+
+def _sommes_par_cle(cles: array, valeurs: array, taille: int, decalage: int = 0) -> List[int]:
+    """Somme de `valeurs` pour chaque clé (cle - decalage dans 0..taille-1)."""
+    if HAS_NUMPY:
+        k = np.frombuffer(cles, dtype=np.intc) - decalage
+        return np.bincount(k, weights=np.frombuffer(valeurs, dtype=np.intc), minlength=taille).astype(np.int64).tolist()
+    sommes = [0] * taille
+    if decalage:
+        for k, v in zip(cles, valeurs):
+            sommes[k - decalage] += v
+    else:
+        for k, v in zip(cles, valeurs):
+            sommes[k] += v
+    return sommes
+
+
+def _agreger(table: TableSeances, par: str) -> Tuple[List[int], List[int], int]:
+    # (places vendues, capacité offerte) par valeur de la colonne `par`, et décalage des clés
+    if par not in REGROUPEMENTS:
+        raise ValueError(f"Regroupement inconnu : {par!r} (attendu : {', '.join(REGROUPEMENTS)}).")
+    cles = table.colonnes[par]
+    if not cles:
+        return [], [], 0
+    decalage = min(cles) if par == 'jour' else 0
+    taille = max(cles) - decalage + 1
+    return (_sommes_par_cle(cles, table.colonnes['vendues'], taille, decalage),
+            _sommes_par_cle(cles, table.colonnes['capacite'], taille, decalage), decalage)
+
+
+def _libelle(table: TableSeances, par: str, cle: int):
+    if par == 'film':
+        return table.films[cle]
+    if par == 'jour':
+        return date.fromordinal(cle).isoformat()
+    return cle  # numéro de salle, heure du créneau
+
+
+def remplissage(table: TableSeances, par: str) -> Dict[object, float]:
+    """
+    Taux de remplissage (places vendues / places offertes, entre 0 et 1) regroupé par
+    'film' (titre), 'salle' (numéro), 'jour' ("AAAA-MM-JJ") ou 'creneau' (heure de début).
+    Lève ValueError si le regroupement est inconnu.
+    """
+    vendues, offertes, decalage = _agreger(table, par)
+    return {_libelle(table, par, k + decalage): v / o
+            for k, (v, o) in enumerate(zip(vendues, offertes)) if o}
+
+
+def ventes(table: TableSeances, par: str) -> Dict[object, int]:
+    """Places vendues regroupées comme pour `remplissage`."""
+    vendues, offertes, decalage = _agreger(table, par)
+    return {_libelle(table, par, k + decalage): v for k, (v, o) in enumerate(zip(vendues, offertes)) if o}
+
+
+def meilleures_ventes(table: TableSeances, n: int = 10) -> List[Tuple[str, int]]:
+    """Les `n` films ayant vendu le plus de places, avec leur nombre de places vendues."""
+    vendues = _sommes_par_cle(table.colonnes['film'], table.colonnes['vendues'], len(table.films))
+    classement = sorted(range(len(vendues)), key=vendues.__getitem__, reverse=True)[:n]
+    return [(table.films[k], vendues[k]) for k in classement]
+
+
+def carte_chaleur(gestion: GestionSeances, numero_salle: int) -> List[List[float]]:
+    """
+    Carte de chaleur d'une salle : pour chaque place (par rangée, dans l'ordre du plan),
+    la fraction des séances de la salle où elle a été réservée. Liste vide si la salle n'a pas de séance.
+    """
+    seances = gestion.seances_de_salle(numero_salle)
+    if not seances:
+        return []
+    salle = seances[0].salle
+    capacite = salle.capacite
+    occupations = [s.occupation() for s in seances]
+    if HAS_NUMPY:
+        totaux = np.zeros(capacite, dtype=np.int64)
+        for occ in occupations:
+            totaux += np.frombuffer(occ, dtype=np.uint8)
+        totaux = totaux.tolist()
+    else:
+        # chaque occupation devient un grand entier à 4 octets par place : une seule addition
+        # (en C) cumule toutes les places de la séance, sans débordement d'une place sur l'autre
+        largeur = 4
+        total = 0
+        tampon = bytearray(largeur * capacite)
+        for occ in occupations:
+            tampon[largeur - 1::largeur] = occ
+            total += int.from_bytes(tampon, 'big')
+        octets = total.to_bytes(largeur * capacite, 'big')
+        totaux = [int.from_bytes(octets[i:i + largeur], 'big') for i in range(0, len(octets), largeur)]
+    nb = len(seances)
+    plan = salle.plan_salle
+    carte = []
+    for i in range(plan.lignes):
+        debut, fin = plan.bornes_rangee(i)
+        carte.append([t / nb for t in totaux[debut:fin]])
+    return carte
+
+
+if __name__ == "__main__":
+    from film import charger_films_csv
+    from salle import salles_par_defaut
+    from reservation import creer_seances_par_defaut
+
+    films = charger_films_csv(os.path.join(os.path.dirname(os.path.abspath(__file__)), "films_init.csv"))
+    gs = GestionSeances()
+    creer_seances_par_defaut(gs, films.lister_films(), salles_par_defaut().lister_salles())
+    table = TableSeances.depuis_gestion(gs)
+    for par in REGROUPEMENTS:
+        print(par, {k: f"{t:.0%}" for k, t in remplissage(table, par).items()})
+    print("Meilleures ventes :", meilleures_ventes(table, 5))
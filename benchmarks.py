@@ -0,0 +1,1105 @@
+"""
+Module : benchmarks
+Fonction : mesures de performance (mémoire, temps, débit) des composants du cinéma.
+
+Usage :
+    python benchmarks.py              # lance tous les benchmarks
+    python benchmarks.py memoire      # lance seulement ceux dont le nom contient "memoire"
+"""
+
+import asyncio
+import csv
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.parse
+from dataclasses import dataclass
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from film import Film, GestionFilms
+from salle import Salle, GestionSalles
+from reservation import GestionSeances, Reservation, SallePleineError, Seance
+from plan_salle import PlanSalle
+import affiches
+from stockage import StockageSQLite
+import journal
+from import_films import importer_films
+import programmation
+from retenues import Echeancier
+import analyses
+from recherche import IndexFilms, normaliser
+
+
+class _SeanceAncienne:
+    """Ancienne représentation d'une séance (set d'étiquettes + plan en chaînes), pour comparaison."""
+
+    def __init__(self, seance_id, film, salle, horaire):
+        self.id = seance_id
+        self.film = film
+        self.salle = salle
+        self.horaire = horaire
+        self._reservations = []
+        self._places_reservees = set()
+        colonnes = 12
+        nb = salle.capacite
+        lignes = max(1, nb // colonnes + (1 if nb % colonnes else 0))
+        alphabet = string.ascii_uppercase
+        self.plan = [[f"{alphabet[i]}{j+1}" for j in range(colonnes) if i * colonnes + j < nb]
+                     for i in range(lignes)]
+
+    def reserver(self, client_nom, place):
+        self._places_reservees.add(place)
+
+
+def _mesurer_memoire(fabrique, nb: int) -> int:
+    """Retourne le nombre d'octets alloués par `nb` appels à `fabrique(i)`."""
+    tracemalloc.start()
+    avant = tracemalloc.take_snapshot()
+    objets = [fabrique(i) for i in range(nb)]
+    apres = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in apres.compare_to(avant, 'filename'))
+    del objets
+    return total
+
+
+def bench_memoire_seances(nb_seances: int = 2000, capacite: int = 300, taux_remplissage: float = 0.0):
+    """Mémoire par séance : ancienne représentation (set + chaînes) contre plan bitmap."""
+    film = Film("Bench", 120, "Drame")
+    salle = Salle(1, capacite)
+    nb_reservees = int(capacite * taux_remplissage)
+
+    def ancienne(i):
+        s = _SeanceAncienne(i, film, salle, "2025-12-31 20:00")
+        for p in range(nb_reservees):
+            s.reserver("client", f"{string.ascii_uppercase[p // 12]}{p % 12 + 1}")
+        return s
+
+    def nouvelle(i):
+        s = Seance(i, film, salle, "2025-12-31 20:00")
+        for p in range(nb_reservees):
+            s._occupation[p] = 1
+        return s
+
+    o_anc = _mesurer_memoire(ancienne, nb_seances) / nb_seances
+    o_nouv = _mesurer_memoire(nouvelle, nb_seances) / nb_seances
+    print(f"[memoire_seances] {nb_seances} séances de {capacite} places, remplissage {taux_remplissage:.0%}")
+    print(f"  avant : {o_anc:10.0f} octets/séance")
+    print(f"  après : {o_nouv:10.0f} octets/séance  (x{o_anc / o_nouv:.1f})")
+
+
+class _ServeurAffichesLocal:
+    """
+    Serveur HTTP local imitant OMDb et le téléchargement d'images, avec une latence simulée.
+    Les titres commençant par "Inconnu" n'ont pas d'affiche.
+    """
+
+    def __init__(self, latence: float = 0.05):
+        latence_s = latence
+        compteur = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                time.sleep(latence_s)
+                with compteur._verrou:
+                    compteur.nb_requetes += 1
+                url = urllib.parse.urlparse(self.path)
+                if url.path == "/omdb":
+                    titre = urllib.parse.parse_qs(url.query).get('t', [''])[0]
+                    poster = "N/A" if titre.startswith("Inconnu") else \
+                        f"http://127.0.0.1:{compteur.port}/img/{urllib.parse.quote(titre)}.jpg"
+                    corps = json.dumps({"Poster": poster}).encode()
+                    type_ = "application/json"
+                elif url.path == "/tmdb":
+                    corps = json.dumps({"results": []}).encode()
+                    type_ = "application/json"
+                else:
+                    corps = b"\xff\xd8\xff" + b"0" * 20000
+                    type_ = "image/jpeg"
+                self.send_response(200)
+                self.send_header("Content-Type", type_)
+                self.send_header("Content-Length", str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+        self._verrou = threading.Lock()
+        self.nb_requetes = 0
+        self._serveur = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._serveur.daemon_threads = True
+        self.port = self._serveur.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self._serveur.serve_forever, daemon=True).start()
+        self._anciens = (affiches.OMDB_URL, affiches.TMDB_URL)
+        affiches.OMDB_URL = f"http://127.0.0.1:{self.port}/omdb"
+        affiches.TMDB_URL = f"http://127.0.0.1:{self.port}/tmdb"
+        return self
+
+    def __exit__(self, *exc):
+        affiches.OMDB_URL, affiches.TMDB_URL = self._anciens
+        self._serveur.shutdown()
+        self._serveur.server_close()
+
+
+def bench_prefetch_affiches(nb_films: int = 64, latence: float = 0.05):
+    """Temps de démarrage : téléchargement séquentiel des affiches contre préchargement en arrière-plan."""
+    films = [Film(f"Film {i}", 100) for i in range(nb_films)]
+    with _ServeurAffichesLocal(latence):
+        with tempfile.TemporaryDirectory() as dossier:
+            debut = time.perf_counter()
+            for f in films:
+                affiches.recuperer_affiche(f, dossier)
+            t_seq = time.perf_counter() - debut
+        with tempfile.TemporaryDirectory() as dossier:
+            debut = time.perf_counter()
+            prefetch = affiches.PrefetchAffiches(dossier=dossier)
+            prefetch.demander(films)
+            t_demarrage = time.perf_counter() - debut
+            recues = []
+            while len(recues) < nb_films:
+                prefetch.traiter_resultats(lambda f, c, m: recues.append(c))
+                time.sleep(0.001)
+            t_total = time.perf_counter() - debut
+            nb_fichiers = sum(1 for n in os.listdir(dossier) if n.endswith('.jpg'))
+    print(f"[prefetch_affiches] {nb_films} films, latence serveur {latence * 1000:.0f} ms")
+    print(f"  séquentiel (ancien démarrage) : {t_seq:.2f}s bloquantes")
+    print(f"  préchargement : {t_demarrage * 1000:.1f} ms bloquantes, "
+          f"{t_total:.2f}s pour {nb_fichiers} affiches ({affiches.NB_TELECHARGEURS} threads)")
+
+
+def bench_cache_affiches(nb_films: int = 40, nb_sans_affiche: int = 10, latence: float = 0.01):
+    """Requêtes réseau au premier lancement puis aux suivants, avec le cache disque des affiches."""
+    films = [Film(f"Film {i}", 100) for i in range(nb_films)]
+    films += [Film(f"Inconnu {i}", 100) for i in range(nb_sans_affiche)]
+    with _ServeurAffichesLocal(latence) as serveur, tempfile.TemporaryDirectory() as dossier:
+        for lancement in ("premier", "second"):
+            serveur.nb_requetes = 0
+            cache = affiches.CacheAffiches(os.path.join(dossier, affiches.FICHIER_CACHE))
+            debut = time.perf_counter()
+            for f in films:
+                affiches.recuperer_affiche(f, dossier, cache)
+            cache.sauver()
+            duree = time.perf_counter() - debut
+            print(f"[cache_affiches] {lancement} lancement : {serveur.nb_requetes} requêtes, {duree:.2f}s "
+                  f"({nb_films} films avec affiche, {nb_sans_affiche} sans)")
+
+
+def _plan_synthetique(capacite: int, colonnes: int = 20):
+    """Grille d'affichage de `capacite` places (rangées A..Z puis AA, AB...), deux allées."""
+    return Salle(1, capacite, colonnes, (5, colonnes - 5)).plan_salle.grille()
+
+
+def bench_plan_canvas(capacites=(100, 400, 1000, 2000)):
+    """Temps de (re)dessin du plan de salle : grille de tk.Button contre PlanCanvas."""
+    import tkinter as tk
+    from widgets import PlanCanvas
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"[plan_canvas] ignoré (pas d'affichage disponible : {e})")
+        return
+    print("[plan_canvas] places | boutons (construction) | canvas (construction) | canvas (maj 1 place)")
+    for capacite in capacites:
+        plan = _plan_synthetique(capacite)
+        libre = lambda p: True
+        # ancienne méthode : un bouton par place, tout reconstruit après chaque réservation
+        debut = time.perf_counter()
+        frame = tk.Frame(root)
+        for i, row in enumerate(plan):
+            tk.Label(frame, text=str(i), width=4, height=2).grid(row=i+1, column=0)
+            for j, place in enumerate(row):
+                if place is not None:
+                    tk.Button(frame, text="", width=4, height=2, bg="green").grid(row=i+1, column=j+1, padx=2, pady=2)
+        frame.pack()
+        root.update_idletasks()
+        t_boutons = time.perf_counter() - debut
+        frame.destroy()
+        debut = time.perf_counter()
+        plan_canvas = PlanCanvas(root, plan, libre, lambda p: None)
+        plan_canvas.pack()
+        root.update_idletasks()
+        t_canvas = time.perf_counter() - debut
+        debut = time.perf_counter()
+        plan_canvas.maj_place(next(p for p in plan[0] if p is not None))
+        root.update_idletasks()
+        t_maj = time.perf_counter() - debut
+        plan_canvas.destroy()
+        print(f"  {capacite:6d} | {t_boutons * 1000:10.1f} ms | {t_canvas * 1000:10.1f} ms | {t_maj * 1000:8.2f} ms")
+    root.destroy()
+
+
+def _remplir_seances(nb_seances: int, capacite: int, nb_clients: int = 10000) -> GestionSeances:
+    """GestionSeances de `nb_seances` séances complètes, réservées par `nb_clients` clients."""
+    gs = GestionSeances()
+    film = Film("Bench", 120, "Drame")
+    salle = Salle(1, capacite)
+    k = 0
+    for i in range(nb_seances):
+        s = gs.creer_seance(film, salle, f"2025-12-{1 + i % 28:02d} {10 + i % 12}:00", verifier=False)
+        for rangee in s.plan:
+            for place in rangee:
+                s.reserver(f"client{k % nb_clients}", place)
+                k += 1
+    return gs
+
+
+def bench_reservations_client(nb_seances: int = 2000, capacite: int = 300):
+    """'Mes réservations' : parcours de toutes les séances contre index global par client."""
+    gs = _remplir_seances(nb_seances, capacite)
+    nom = "client42"
+    debut = time.perf_counter()
+    scan = [(s, [r.place for r in s.lister_reservations() if r.client_nom == nom]) for s in gs.lister_seances()]
+    scan = [x for x in scan if x[1]]
+    t_scan = time.perf_counter() - debut
+    debut = time.perf_counter()
+    index = gs.reservations_du_client(nom)
+    t_index = time.perf_counter() - debut
+    s, places = index[0]
+    debut = time.perf_counter()
+    s.annuler_reservation(nom, places[0])
+    t_annul = time.perf_counter() - debut
+    print(f"[reservations_client] {nb_seances * capacite} réservations, {len(index)} séances pour {nom}")
+    print(f"  parcours complet : {t_scan * 1000:8.1f} ms")
+    print(f"  index client     : {t_index * 1000:8.3f} ms")
+    print(f"  annulation       : {t_annul * 1e6:8.1f} µs")
+
+
+def bench_stockage(nb_seances: int = 500, capacite: int = 300):
+    """Débit des réservations persistées dans SQLite (écritures groupées) et temps de rechargement."""
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "cinema.db")
+        stockage = StockageSQLite(chemin)
+        gs = GestionSeances()
+        gs.ajouter_ecouteur(stockage)
+        film, salle = Film("Bench", 120, "Drame"), Salle(1, capacite)
+        films, salles = GestionFilms(), GestionSalles()
+        films.ajouter_ecouteur(stockage)
+        salles.ajouter_ecouteur(stockage)
+        films.ajouter_film(film)
+        salles.ajouter_salle(salle)
+        debut = time.perf_counter()
+        n = 0
+        for i in range(nb_seances):
+            s = gs.creer_seance(film, salle, f"2025-12-{1 + i % 28:02d} {10 + i % 12}:00", verifier=False)
+            for rangee in s.plan:
+                for place in rangee:
+                    s.reserver(f"client{n % 1000}", place)
+                    n += 1
+        stockage.fermer()
+        t_ecriture = time.perf_counter() - debut
+        debut = time.perf_counter()
+        _, _, gs2 = StockageSQLite(chemin).charger()
+        t_chargement = time.perf_counter() - debut
+    print(f"[stockage] {n} réservations persistées : {n / t_ecriture:,.0f} réservations/s")
+    print(f"  rechargement de {len(gs2.lister_seances())} séances : {t_chargement:.2f}s")
+
+
+def bench_journal(nb_reservations: int = 200000, nb_rejeu: int = 1000000):
+    """
+    Débit des réservations avec journal (selon la fréquence de fsync) et temps de rejeu.
+    Pour un journal de 10M d'entrées : python -c "import benchmarks; benchmarks.bench_journal(nb_rejeu=10**7)"
+    """
+    capacite = 300
+    film, salle = Film("Bench", 120, "Drame"), Salle(1, capacite)
+    films, salles = GestionFilms(), GestionSalles()
+    films.ajouter_film(film)
+    salles.ajouter_salle(salle)
+    places = [p for rangee in Seance(0, film, salle, "").plan for p in rangee]
+    print(f"[journal] {nb_reservations} réservations")
+    for fsync_tous in (None, 0, 1000, 100):
+        with tempfile.TemporaryDirectory() as dossier:
+            gs = GestionSeances()
+            jr = None
+            if fsync_tous is not None:
+                jr = journal.JournalReservations(dossier, fsync_tous=fsync_tous)
+                jr.attacher(gs)
+            debut = time.perf_counter()
+            n = 0
+            while n < nb_reservations:
+                s = gs.creer_seance(film, salle, "2025-12-10 20:00", verifier=False)
+                for p in places[:nb_reservations - n]:
+                    s.reserver("client", p)
+                    n += 1
+            if jr is not None:
+                jr.fermer()
+            duree = time.perf_counter() - debut
+        mode = "sans journal" if fsync_tous is None else f"fsync tous les {fsync_tous}" if fsync_tous else "sans fsync"
+        print(f"  {mode:22s} : {n / duree:10,.0f} réservations/s")
+    # rejeu : journal synthétique écrit directement
+    with tempfile.TemporaryDirectory() as dossier:
+        with open(os.path.join(dossier, "journal.000001.log"), 'w', encoding='utf-8') as f:
+            n, sid = 0, 0
+            while n < nb_rejeu:
+                sid += 1
+                f.write(f"S\t{sid}\tBench\t1\t2025-12-10 20:00\n")
+                for p in places[:nb_rejeu - n]:
+                    f.write(f"R\t{sid}\t{p}\tclient{n % 1000}\n")
+                    n += 1
+        debut = time.perf_counter()
+        gs = journal.restaurer(dossier, films, salles)
+        duree = time.perf_counter() - debut
+    print(f"  rejeu de {nb_rejeu:,} entrées ({len(gs.lister_seances())} séances) : {duree:.2f}s "
+          f"({nb_rejeu / duree:,.0f} entrées/s)")
+
+
+class _SeanceSansVerrou(Seance):
+    """Séance sans synchronisation (vérification puis ajout), pour vérifier que le harnais détecte les doubles réservations."""
+
+    def reserver(self, client_nom, place):
+        idx = self._plan_salle.index(place)
+        if self._occupation[idx]:
+            raise SallePleineError(f"La place {place} n'est pas disponible.")
+        time.sleep(0)  # laisse la main aux autres threads entre la vérification et l'écriture
+        self._occupation[idx] = 1
+        return Reservation(client_nom, place, self.id)
+
+
+def _marteler(seances, nb_threads: int, tentatives: int, groupes: bool):
+    """Lance `nb_threads` vendeurs sur les séances ; retourne (ventes par thread, durée)."""
+    ventes = [[] for _ in range(nb_threads)]
+    depart = threading.Barrier(nb_threads + 1)
+
+    def vendeur(n):
+        rnd = random.Random(n)
+        places = [p for rangee in seances[0].plan for p in rangee]
+        depart.wait()
+        for _ in range(tentatives):
+            s = rnd.choice(seances)
+            try:
+                if groupes and rnd.random() < 0.3:
+                    demandees = rnd.sample(places, rnd.randint(2, 4))
+                    s.reserver_places(f"vendeur{n}", demandees)
+                    ventes[n].extend((s.id, p) for p in demandees)
+                else:
+                    p = rnd.choice(places)
+                    s.reserver(f"vendeur{n}", p)
+                    ventes[n].append((s.id, p))
+            except SallePleineError:
+                pass
+
+    threads = [threading.Thread(target=vendeur, args=(n,)) for n in range(nb_threads)]
+    for t in threads:
+        t.start()
+    depart.wait()
+    debut = time.perf_counter()
+    for t in threads:
+        t.join()
+    return ventes, time.perf_counter() - debut
+
+
+def bench_concurrence(nb_threads: int = 16, nb_seances: int = 8, capacite: int = 300, tentatives: int = 5000):
+    """Harnais de stress : nombreux threads réservant les mêmes séances ; vérifie l'absence de double réservation."""
+    film, salle = Film("Bench", 120, "Drame"), Salle(1, capacite)
+    intervalle = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)  # bascules de threads fréquentes pour provoquer les courses
+    try:
+        for nom, fabrique, groupes in (("sans verrou (contrôle)", _SeanceSansVerrou, False),
+                                       ("Seance", Seance, True)):
+            gs = GestionSeances()
+            seances = [fabrique(i, film, salle, "2025-12-10 20:00", gestion=gs) for i in range(nb_seances)]
+            ventes, duree = _marteler(seances, nb_threads, tentatives, groupes)
+            toutes = [v for lst in ventes for v in lst]
+            doubles = len(toutes) - len(set(toutes))
+            occupees = sum(sum(s._occupation) for s in seances)
+            print(f"[concurrence] {nom:22s} : {nb_threads} threads, {nb_threads * tentatives / duree:10,.0f} tentatives/s, "
+                  f"{len(toutes)} ventes, {occupees} places occupées, {doubles} doubles réservations")
+            if fabrique is Seance:
+                assert doubles == 0 and occupees == len(toutes), "double réservation"
+    finally:
+        sys.setswitchinterval(intervalle)
+
+
+def _bloc_force_brute(seance, n):
+    """Recherche naïve du meilleur bloc : toutes les positions de toutes les rangées (allées exclues)."""
+    plan = seance.salle.plan_salle.grille()
+    ideale = round((len(plan) - 1) * 0.6)
+    for i in sorted(range(len(plan)), key=lambda i: (abs(i - ideale), -i)):
+        rangee = plan[i]
+        centre = len(rangee) / 2
+        candidats = [d for d in range(len(rangee) - n + 1)
+                     if all(p is not None and seance.est_place_disponible(p) for p in rangee[d:d + n])]
+        if candidats:
+            return min(candidats, key=lambda d: abs(d + n / 2 - centre))
+    return None
+
+
+def bench_groupes(capacite: int = 1000, remplissage: float = 0.7, nb_recherches: int = 2000, taille: int = 3):
+    """Recherche du meilleur bloc de places contiguës dans une salle fragmentée : index par rangée contre force brute."""
+    rnd = random.Random(1)
+    film, salle = Film("Bench", 120, "Drame"), Salle(1, capacite, 24, (6, 18))
+    s = Seance(1, film, salle, "2025-12-10 20:00")
+    places = [p for rangee in s.plan for p in rangee]
+    for p in rnd.sample(places, int(capacite * remplissage)):
+        s.reserver("client", p)
+    libres = [p for p in places if s.est_place_disponible(p)]
+    rnd.shuffle(libres)
+    # chaque recherche suit une réservation isolée, qui invalide une rangée de l'index
+    debut = time.perf_counter()
+    for k in range(nb_recherches):
+        p = libres[k % len(libres)]
+        s.reserver("x", p)
+        s._meilleur_bloc(taille)
+        s.annuler_reservation("x", p)
+    t_index = (time.perf_counter() - debut) / nb_recherches
+    debut = time.perf_counter()
+    for k in range(nb_recherches // 20):
+        _bloc_force_brute(s, taille)
+    t_brute = (time.perf_counter() - debut) / (nb_recherches // 20)
+    print(f"[groupes] salle de {capacite} places (2 allées) remplie à {remplissage:.0%}, blocs de {taille}")
+    print(f"  force brute        : {t_brute * 1e6:8.1f} µs/recherche")
+    print(f"  index par rangée   : {t_index * 1e6:8.1f} µs/recherche (réservation + annulation comprises)")
+
+
+def bench_retenues(nb_retenues: int = 1_000_000, capacite: int = 312, nb_minuteurs: int = 2000):
+    """Retenues temporaires : un échéancier (tas) unique contre un threading.Timer par retenue."""
+    film, salle = Film("Bench", 120, "Drame"), Salle(1, capacite)
+    gs = GestionSeances()
+    nb_seances = -(-nb_retenues // capacite)
+    seances = [gs.creer_seance(film, salle, "2025-12-10 20:00", verifier=False) for _ in range(nb_seances)]
+    etiquettes = [p for rangee in seances[0].plan for p in rangee]
+    echeancier = Echeancier(automatique=False)  # expiration déclenchée à la main pour la mesure
+    rnd = random.Random(1)
+    debut = time.perf_counter()
+    n = 0
+    for s in seances:
+        for p in etiquettes[:nb_retenues - n]:
+            s.retenir(p, "caisse", duree=rnd.uniform(30, 300), echeancier=echeancier)
+        n += len(etiquettes[:nb_retenues - n])
+    t_retenir = time.perf_counter() - debut
+    debut = time.perf_counter()
+    liberees = echeancier.expirer(time.monotonic() + 3600)
+    t_expirer = time.perf_counter() - debut
+    print(f"[retenues] {n} retenues sur {nb_seances} séances, un seul échéancier")
+    print(f"  retenir            : {n / t_retenir:10.0f} retenues/s ({t_retenir * 1e6 / n:.2f} µs/retenue)")
+    print(f"  expiration         : {liberees / t_expirer:10.0f} libérations/s ({liberees} places libérées)")
+    # comparaison : un minuteur (et donc un thread) par retenue
+    debut = time.perf_counter()
+    minuteurs = [threading.Timer(300, lambda: None) for _ in range(nb_minuteurs)]
+    for m in minuteurs:
+        m.start()
+    t_minuteurs = time.perf_counter() - debut
+    for m in minuteurs:
+        m.cancel()
+    print(f"  threading.Timer    : {nb_minuteurs / t_minuteurs:10.0f} retenues/s (sur {nb_minuteurs}, un thread chacune)")
+
+
+async def _client_http(hote, port, fin, requetes, latences, statuts, rnd):
+    lecteur, ecrivain = await asyncio.open_connection(hote, port)
+    try:
+        while time.perf_counter() < fin:
+            methode, chemin, corps = rnd.choice(requetes)
+            debut = time.perf_counter()
+            ecrivain.write(f"{methode} {chemin} HTTP/1.1\r\nHost: {hote}\r\n"
+                           f"Content-Length: {len(corps)}\r\n\r\n".encode() + corps)
+            await ecrivain.drain()
+            statut = int((await lecteur.readline()).split()[1])
+            longueur = 0
+            while True:
+                ligne = await lecteur.readline()
+                if ligne == b'\r\n':
+                    break
+                if ligne.lower().startswith(b'content-length:'):
+                    longueur = int(ligne.split(b':')[1])
+            await lecteur.readexactly(longueur)
+            latences.append(time.perf_counter() - debut)
+            statuts[statut] = statuts.get(statut, 0) + 1
+    finally:
+        ecrivain.close()
+
+
+def _base_serveur(dossier: str, nb_films: int, nb_seances: int, nb_salles: int = 16):
+    """Crée une base SQLite de test ; retourne son chemin et le mélange de requêtes à jouer."""
+    films, salles, seances = GestionFilms(), GestionSalles(), GestionSeances()
+    for i in range(nb_films):
+        films.ajouter_film(Film(f"Film {i}", 90 + i % 60, "Drame"))
+    for n in range(1, nb_salles + 1):
+        salles.ajouter_salle(Salle(n, 150))
+    liste_films, liste_salles = films.lister_films(), salles.lister_salles()
+    for i in range(nb_seances):
+        seances.creer_seance(liste_films[i % nb_films], liste_salles[i % nb_salles],
+                             f"2025-12-{1 + i // 100 % 28:02d} {10 + i % 12:02d}:00", verifier=False)
+    chemin_db = os.path.join(dossier, "bench.db")
+    stockage = StockageSQLite(chemin_db)
+    stockage.sauver_tout(films, salles, seances)
+    stockage.fermer()
+    requetes = ([("GET", f"/seances?film=Film%20{i}", b"") for i in range(nb_films)] * 4
+                + [("GET", f"/seances/{i}", b"") for i in range(1, nb_seances + 1, 10)]
+                + [("GET", "/films", b"")] * 10
+                + [("POST", f"/seances/{i}/reservations", json.dumps({"client": f"c{i}", "nombre": 2}).encode())
+                   for i in range(1, nb_seances + 1, 10)])
+    return chemin_db, requetes
+
+
+def _charge_http(commande, requetes, nb_clients: int, duree: float):
+    """
+    Lance le serveur (commande, dans son propre processus : le générateur de charge ne lui
+    prend pas le GIL) puis le sollicite avec des clients persistants.
+    Retourne (latences triées, statuts, durée écoulée).
+    """
+    proc = subprocess.Popen([sys.executable, "-u"] + commande, stdout=subprocess.PIPE, text=True)
+    try:
+        hote, port = proc.stdout.readline().rsplit("/", 3)[2].split(":")
+        rnd = random.Random(1)
+        latences, statuts = [], {}
+
+        async def charge():
+            fin = time.perf_counter() + duree
+            await asyncio.gather(*[_client_http(hote, int(port), fin, requetes, latences, statuts,
+                                                random.Random(rnd.random())) for _ in range(nb_clients)])
+
+        debut = time.perf_counter()
+        asyncio.run(charge())
+        ecoule = time.perf_counter() - debut
+    finally:
+        proc.terminate()
+        proc.wait()
+    latences.sort()
+    return latences, statuts, ecoule
+
+
+def _script(nom: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), nom)
+
+
+def bench_serveur(nb_clients: int = 32, duree: float = 5.0, nb_films: int = 50, nb_seances: int = 2000):
+    """Générateur de charge HTTP : clients asyncio persistants contre serveur.py lancé sur localhost."""
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin_db, requetes = _base_serveur(dossier, nb_films, nb_seances)
+        latences, statuts, ecoule = _charge_http([_script("serveur.py"), "--port", "0", "--db", chemin_db],
+                                                 requetes, nb_clients, duree)
+    print(f"[serveur] {nb_clients} clients persistants pendant {duree:.0f}s, {nb_seances} séances")
+    print(f"  débit              : {len(latences) / ecoule:10.0f} requêtes/s ({len(latences)} requêtes)")
+    print(f"  latence p50        : {latences[len(latences) // 2] * 1e3:8.2f} ms")
+    print(f"  latence p99        : {latences[int(len(latences) * 0.99)] * 1e3:8.2f} ms")
+    print(f"  statuts            : {dict(sorted(statuts.items()))}")
+
+
+def bench_repartition(nb_clients: int = 64, duree: float = 5.0, nb_films: int = 50, nb_seances: int = 2000):
+    """Service réparti (repartition.py) : débit de 1 à N shards, N = nombre de cœurs (au moins 4)."""
+    nb_max = max(4, os.cpu_count() or 1)
+    print(f"[repartition] {nb_clients} clients persistants pendant {duree:.0f}s, {os.cpu_count()} cœur(s) disponible(s)")
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin_db, requetes = _base_serveur(dossier, nb_films, nb_seances)
+        nb = 1
+        while nb <= nb_max:
+            latences, _, ecoule = _charge_http([_script("repartition.py"), "--shards", str(nb), "--port", "0",
+                                                "--db", chemin_db], requetes, nb_clients, duree)
+            print(f"  {nb:2d} shard(s)        : {len(latences) / ecoule:10.0f} requêtes/s"
+                  f"   p50 {latences[len(latences) // 2] * 1e3:6.2f} ms"
+                  f"   p99 {latences[int(len(latences) * 0.99)] * 1e3:6.2f} ms")
+            nb *= 2
+
+
+def _catalogue_synthetique(chemin: str, nb_lignes: int, taux_invalides: float = 0.01, taux_doublons: float = 0.05):
+    """Écrit un catalogue CSV de test : quelques lignes invalides et des titres répétés (mises à jour)."""
+    rnd = random.Random(1)
+    genres = ["Drame", "Comédie", "Action", "Animation", "Science-fiction", "Documentaire"]
+    with open(chemin, 'w', newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["titre", "duree", "genre", "affiche"])
+        for i in range(nb_lignes):
+            x = rnd.random()
+            if x < taux_invalides:
+                w.writerow([f"Film {i}", rnd.choice(["", "abc", "-10", "0"]), "Drame", ""])
+            elif x < taux_invalides + taux_doublons and i:
+                w.writerow([f"Film {rnd.randrange(i)}", rnd.randint(70, 200), rnd.choice(genres), ""])
+            else:
+                w.writerow([f"Film {i}", rnd.randint(70, 200), rnd.choice(genres), f"posters/film_{i}.jpg"])
+
+
+def _charger_films_csv_ancien(chemin: str) -> GestionFilms:
+    """charger_films_csv avant l'import en flux (DictReader, exception avalée par ligne)."""
+    gestion = GestionFilms()
+    with open(chemin, newline='', encoding='utf-8') as csvfile:
+        for row in csv.DictReader(csvfile):
+            try:
+                gestion.ajouter_film(Film(row['titre'], int(row['duree']), row.get('genre', None), row.get('affiche', None)))
+            except Exception:
+                pass
+    return gestion
+
+
+def bench_import_films(nb_lignes: int = 1_000_000):
+    """Import d'un catalogue de films de 1M lignes : ancien chargement contre import en flux (1 et N processus)."""
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "catalogue.csv")
+        _catalogue_synthetique(chemin, nb_lignes)
+        print(f"[import_films] catalogue synthétique de {nb_lignes} lignes ({os.path.getsize(chemin) / 1e6:.0f} Mo)")
+        debut = time.perf_counter()
+        _charger_films_csv_ancien(chemin)
+        t = time.perf_counter() - debut
+        print(f"  ancien chargement  : {nb_lignes / t:10.0f} lignes/s (rejets non signalés)")
+        for processus in sorted({0, max(2, os.cpu_count() or 1)}):
+            r = importer_films(chemin, GestionFilms(), processus=processus, suspendre_gc=True)
+            libelle = f"import, {processus} proc." if processus else "import en flux"
+            print(f"  {libelle:<19}: {r.lignes_par_seconde:10.0f} lignes/s ({r.ajoutees} ajoutés, "
+                  f"{r.mises_a_jour} mis à jour, {r.nb_rejetees} rejetés)")
+
+
+def bench_programmation(nb_salles: int = 50, nb_jours: int = 365, nb_films: int = 40):
+    """Programmation d'une année pour 50 salles : génération + création en masse contre creer_seance une à une."""
+    rnd = random.Random(1)
+    films = [Film(f"Film {i}", rnd.randint(80, 180), "Drame") for i in range(nb_films)]
+    salles = [Salle(n, rnd.randint(60, 300)) for n in range(1, nb_salles + 1)]
+    debut = time.perf_counter()
+    programme = programmation.planifier(films, salles, programmation.lundi_suivant(), nb_jours)
+    t_planif = time.perf_counter() - debut
+    debut = time.perf_counter()
+    GestionSeances().creer_seances(programme)
+    t_masse = time.perf_counter() - debut
+    debut = time.perf_counter()
+    gs = GestionSeances()
+    for film, salle, horaire in programme:
+        gs.creer_seance(film, salle, horaire)
+    t_unitaire = time.perf_counter() - debut
+    print(f"[programmation] {nb_salles} salles x {nb_jours} jours : {len(programme)} séances")
+    print(f"  planification     : {t_planif:8.2f} s")
+    print(f"  creer_seance x N  : {t_unitaire:8.2f} s")
+    print(f"  creer_seances     : {t_masse:8.2f} s")
+
+
+def bench_creneaux(nb_salles: int = 50, nb_jours: int = 365, nb_requetes: int = 2000):
+    """Salles libres entre X et Y sur une année de programme : index de créneaux contre parcours des séances."""
+    rnd = random.Random(1)
+    films = [Film(f"Film {i}", rnd.randint(80, 180), "Drame") for i in range(40)]
+    salles = [Salle(n, 100) for n in range(1, nb_salles + 1)]
+    gs = GestionSeances()
+    premier = programmation.lundi_suivant()
+    programmation.programmer(gs, films, salles, premier, nb_jours)
+    requetes = []
+    for _ in range(nb_requetes):
+        d = premier.toordinal() + rnd.randrange(nb_jours)
+        h = rnd.randrange(9 * 60, 23 * 60)
+        debut = f"{date.fromordinal(d).isoformat()} {h // 60:02d}:{h % 60:02d}"
+        fin = f"{date.fromordinal(d).isoformat()} {(h + 30) // 60:02d}:{(h + 30) % 60:02d}"
+        requetes.append((debut, fin))
+
+    def libres_naif(debut, fin):
+        d, f = datetime.fromisoformat(debut), datetime.fromisoformat(fin)
+        return [salle for salle in salles
+                if all(not (s.debut < f and s.fin > d) for s in gs.seances_de_salle(salle.numero))]
+
+    t0 = time.perf_counter()
+    for debut, fin in requetes[:nb_requetes // 100]:
+        attendu = libres_naif(debut, fin)
+    t_naif = (time.perf_counter() - t0) / (nb_requetes // 100)
+    t0 = time.perf_counter()
+    for debut, fin in requetes:
+        gs.salles_libres(salles, debut, fin)
+    t_index = (time.perf_counter() - t0) / nb_requetes
+    assert gs.salles_libres(salles, *requetes[nb_requetes // 100 - 1]) == attendu
+    print(f"[creneaux] {len(gs.lister_seances())} séances, {nb_salles} salles : quelles salles sont libres entre X et Y ?")
+    print(f"  parcours des séances : {t_naif * 1e3:10.2f} ms/requête")
+    print(f"  index de créneaux    : {t_index * 1e3:10.3f} ms/requête")
+
+
+def bench_analyses(nb_salles: int = 50, nb_jours: int = 365):
+    """Remplissage et carte de chaleur sur une année de séances : colonnes contre parcours des objets."""
+    rnd = random.Random(1)
+    films = [Film(f"Film {i}", rnd.randint(80, 180), "Drame") for i in range(40)]
+    salles = [Salle(n, rnd.randint(60, 300)) for n in range(1, nb_salles + 1)]
+    gs = GestionSeances()
+    programmation.programmer(gs, films, salles, programmation.lundi_suivant(), nb_jours)
+    seances = gs.lister_seances()
+    for s in seances:
+        # remplissage direct de l'occupation (sans objets Reservation) : seule l'analyse est mesurée
+        n = rnd.randrange(s.salle.capacite + 1)
+        s._occupation[:n] = b'\x01' * n
+        s._nb_reservees = n
+
+    t0 = time.perf_counter()
+    par_film, offertes = {}, {}
+    for s in seances:
+        titre = s.film.titre
+        par_film[titre] = par_film.get(titre, 0) + s.salle.capacite - s.places_disponibles()
+        offertes[titre] = offertes.get(titre, 0) + s.salle.capacite
+    attendu = {t: par_film[t] / offertes[t] for t in par_film}
+    t_objets = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    table = analyses.TableSeances.depuis_gestion(gs)
+    t_export = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    taux = {par: analyses.remplissage(table, par) for par in analyses.REGROUPEMENTS}
+    top = analyses.meilleures_ventes(table, 10)
+    t_agreg = time.perf_counter() - t0
+    assert all(abs(taux['film'][t] - attendu[t]) < 1e-9 for t in attendu)
+    salle = salles[0]
+    t0 = time.perf_counter()
+    compte = [0] * salle.capacite
+    plan = gs.seances_de_salle(salle.numero)[0].plan
+    etiquettes = [p for rangee in plan for p in rangee]
+    for s in gs.seances_de_salle(salle.numero):
+        for i, p in enumerate(etiquettes):
+            if not s.est_place_disponible(p):
+                compte[i] += 1
+    t_carte_naif = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    carte = analyses.carte_chaleur(gs, salle.numero)
+    t_carte = time.perf_counter() - t0
+    nb = len(gs.seances_de_salle(salle.numero))
+    assert [round(c * nb) for rangee in carte for c in rangee] == compte
+    with tempfile.TemporaryDirectory() as dossier:
+        t0 = time.perf_counter()
+        table.ecrire_colonnes(os.path.join(dossier, "table"))
+        relue = analyses.TableSeances.lire_colonnes(os.path.join(dossier, "table"))
+        t_colonnes = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        table.ecrire_csv(os.path.join(dossier, "table.csv"))
+        t_csv = time.perf_counter() - t0
+    assert relue.colonnes == table.colonnes
+    print(f"[analyses] {len(seances)} séances, {sum(table.colonnes['vendues'])} places vendues "
+          f"(NumPy : {'oui' if analyses.HAS_NUMPY else 'non'}) ; meilleur film : {top[0][0]}")
+    print(f"  remplissage par film (objets)    : {t_objets * 1e3:8.1f} ms")
+    print(f"  export en colonnes               : {t_export * 1e3:8.1f} ms")
+    print(f"  4 regroupements + top 10         : {t_agreg * 1e3:8.1f} ms")
+    print(f"  carte de chaleur (place/place)   : {t_carte_naif * 1e3:8.1f} ms ({nb} séances)")
+    print(f"  carte de chaleur (colonnes)      : {t_carte * 1e3:8.1f} ms")
+    print(f"  écriture + relecture colonnes    : {t_colonnes * 1e3:8.1f} ms (CSV : {t_csv * 1e3:.1f} ms)")
+
+
+def bench_compteurs(nb_salles: int = 50, nb_jours: int = 365, nb_reservations: int = 200000, nb_lectures: int = 20000):
+    """Tableau de bord (ventes du jour, d'un film, d'une salle) : compteurs incrémentaux contre parcours des séances."""
+    rnd = random.Random(1)
+    films = [Film(f"Film {i}", rnd.randint(80, 180), "Drame") for i in range(40)]
+    salles = [Salle(n, 300) for n in range(1, nb_salles + 1)]
+    gs = GestionSeances()
+    premier = programmation.lundi_suivant()
+    seances = programmation.programmer(gs, films, salles, premier, nb_jours)
+    plan = seances[0].plan
+    etiquettes = [p for rangee in plan for p in rangee]
+    t0 = time.perf_counter()
+    for i in range(nb_reservations):
+        s = seances[rnd.randrange(len(seances))]
+        try:
+            s.reserver(f"C{i}", etiquettes[rnd.randrange(len(etiquettes))])
+        except (SallePleineError, ValueError):
+            pass
+    t_resa = (time.perf_counter() - t0) / nb_reservations
+    jours = [date.fromordinal(premier.toordinal() + rnd.randrange(nb_jours)).isoformat() for _ in range(nb_lectures)]
+
+    def ventes_du_jour(jour):
+        return sum(len(s.lister_reservations()) for s in gs.seances_entre(f"{jour} 00:00", f"{jour} 23:59"))
+
+    def ventes_du_film(titre):
+        return sum(len(s.lister_reservations()) for s in gs.seances_du_film(titre))
+
+    t0 = time.perf_counter()
+    for jour in jours[:nb_lectures // 100]:
+        ventes_du_jour(jour)
+        ventes_du_film(films[0].titre)
+    t_scan = (time.perf_counter() - t0) / (nb_lectures // 100)
+    t0 = time.perf_counter()
+    for jour in jours:
+        gs.compteurs.ventes('jour', jour)
+        gs.compteurs.ventes('film', films[0].titre)
+    t_compteurs = (time.perf_counter() - t0) / nb_lectures
+    assert gs.compteurs.ventes('jour', jours[0]) == ventes_du_jour(jours[0])
+    assert gs.compteurs.ventes('film', films[0].titre) == ventes_du_film(films[0].titre)
+    assert gs.compteurs.total()[0] == len(gs.index_reservations)
+    print(f"[compteurs] {len(seances)} séances, {len(gs.index_reservations)} réservations")
+    print(f"  réservation (compteurs compris)  : {t_resa * 1e6:10.2f} µs")
+    print(f"  jour + film, parcours            : {t_scan * 1e6:10.2f} µs/lecture")
+    print(f"  jour + film, compteurs           : {t_compteurs * 1e6:10.2f} µs/lecture")
+
+
+def bench_grandes_salles(capacite: int = 1000, nb_seances: int = 5000):
+    """Séances d'une salle de 1000 places avec allées : plan partagé par la salle contre plan généré par séance."""
+    film = Film("Bench", 120, "Drame")
+    salle = Salle(1, capacite, 30, (8, 22), {"A1", "A30"})
+    debut = time.perf_counter()
+    plan = salle.plan_salle
+    t_plan = time.perf_counter() - debut
+
+    def plan_par_seance(i):
+        # ancienne approche : plan d'étiquettes construit et gardé par chaque séance
+        return Seance(i, film, salle, "2025-12-31 20:00"), PlanSalle(capacite, 30, (8, 22), {"A1", "A30"}).rangees()
+
+    nb_anc = nb_seances // 20
+    debut = time.perf_counter()
+    o_anc = _mesurer_memoire(plan_par_seance, nb_anc) / nb_anc
+    t_anc = (time.perf_counter() - debut) / nb_anc
+    debut = time.perf_counter()
+    o_nouv = _mesurer_memoire(lambda i: Seance(i, film, salle, "2025-12-31 20:00"), nb_seances) / nb_seances
+    t_nouv = (time.perf_counter() - debut) / nb_seances
+    s = Seance(0, film, salle, "2025-12-31 20:00")
+    etiquettes = [plan.etiquette(i) for i in range(capacite)]
+    debut = time.perf_counter()
+    for p in etiquettes:
+        s.reserver("client", p)
+    t_resa = (time.perf_counter() - debut) / capacite
+    print(f"[grandes_salles] {nb_seances} séances, salle de {capacite} places en {plan.lignes} rangées "
+          f"({etiquettes[0]}..{etiquettes[-1]}), plan calculé en {t_plan * 1e3:.2f} ms")
+    print(f"  plan par séance : {o_anc:10.0f} octets/séance, {t_anc * 1e6:8.1f} µs/séance")
+    print(f"  plan partagé    : {o_nouv:10.0f} octets/séance, {t_nouv * 1e6:8.1f} µs/séance")
+    print(f"  réservation de toutes les places : {t_resa * 1e6:.2f} µs/place")
+
+
+def bench_vues(nb_films: int = 500_000, taille_page: int = 30, nb_requetes: int = 20):
+    """Page de films (filtrée, triée) sur un grand catalogue : copie + tri complet contre vue + tas."""
+    rnd = random.Random(1)
+    films = GestionFilms()
+    genres = ["Drame", "Comédie", "Action", "Animation", "Horreur"]
+    films.fusionner_films([Film(f"Film {rnd.random():.12f}", rnd.randint(80, 180), rnd.choice(genres))
+                           for _ in range(nb_films)])
+    cle = lambda f: f.titre
+    drames = lambda f: f.genre == "Drame"
+    t0 = time.perf_counter()
+    for _ in range(nb_requetes):
+        attendu = sorted([f for f in films.lister_films() if drames(f)], key=cle)[:taille_page]
+    t_copie = (time.perf_counter() - t0) / nb_requetes
+    t0 = time.perf_counter()
+    for _ in range(nb_requetes):
+        page = films.chercher_films(drames, cle, limite=taille_page)
+    t_vue = (time.perf_counter() - t0) / nb_requetes
+    assert page == attendu
+    t0 = time.perf_counter()
+    for _ in range(nb_requetes):
+        films.lister_films()[:taille_page]
+    t_liste = (time.perf_counter() - t0) / nb_requetes
+    t0 = time.perf_counter()
+    for _ in range(nb_requetes):
+        films.chercher_films(limite=taille_page)
+    t_page = (time.perf_counter() - t0) / nb_requetes
+    print(f"[vues] {nb_films} films, pages de {taille_page}")
+    print(f"  drames par titre, copie + tri   : {t_copie * 1e3:8.1f} ms")
+    print(f"  drames par titre, vue + tas     : {t_vue * 1e3:8.1f} ms")
+    print(f"  premiers films, copie           : {t_liste * 1e3:8.3f} ms")
+    print(f"  premiers films, vue             : {t_page * 1e3:8.3f} ms")
+
+
+def _titres_synthetiques(nb: int, rnd: random.Random):
+    # titres de 1 à 5 mots pris dans un vocabulaire de 30 000 mots inventés (accents compris), parfois numérotés
+    syllabes = ["ba", "ra", "to", "mi", "lé", "ne", "ko", "su", "da", "vi", "an", "or", "è", "ti", "po", "ga", "ri", "lu"]
+    vocabulaire = list({"".join(rnd.choice(syllabes) for _ in range(rnd.randint(2, 4))) for _ in range(40_000)})[:30_000]
+    liaisons = ["le", "la", "les", "de", "du", "the", "of"]
+    vus = set()
+    while len(vus) < nb:
+        mots = [rnd.choice(vocabulaire) for _ in range(rnd.randint(1, 4))]
+        if len(mots) > 1 and rnd.random() < 0.4:
+            mots.insert(1, rnd.choice(liaisons))
+        titre = " ".join(m.capitalize() for m in mots)
+        if rnd.random() < 0.1:
+            titre += f" {rnd.randint(2, 5)}"
+        vus.add(titre)
+    return list(vus), vocabulaire
+
+
+def bench_recherche(nb_films: int = 500_000, nb_requetes: int = 300):
+    """Recherche de films (mot, préfixe, plusieurs mots, faute de frappe, filtres) : parcours du catalogue contre index."""
+    rnd = random.Random(1)
+    genres = ["Drame", "Comédie", "Action", "Animation", "Science-fiction", "Documentaire"]
+    titres, vocabulaire = _titres_synthetiques(nb_films, rnd)
+    films = GestionFilms()
+    films.fusionner_films([Film(t, rnd.randint(70, 200), rnd.choice(genres)) for t in titres])
+    t0 = time.perf_counter()
+    index = IndexFilms(films)
+    index.chercher("a")  # tri du vocabulaire
+    t_index = time.perf_counter() - t0
+
+    def fautes(mot):
+        i = rnd.randrange(len(mot))
+        return mot[:i] + mot[i + 1:] if len(mot) > 4 else mot + "e"
+
+    requetes = {
+        "mot entier": [rnd.choice(vocabulaire) for _ in range(nb_requetes)],
+        "préfixe (3 lettres)": [rnd.choice(vocabulaire)[:3] for _ in range(nb_requetes)],
+        "titre (2 mots, le 2e incomplet)": [" ".join(t.split()[:2])[:-1] for t in rnd.sample(titres, nb_requetes * 3)
+                                             if len(t.split()) > 1][:nb_requetes],
+        "faute de frappe": [fautes(rnd.choice(vocabulaire)) for _ in range(nb_requetes)],
+        "mot fréquent + 1 lettre": [f"{rnd.choice(['le', 'la', 'the', 'de'])} {rnd.choice(vocabulaire)[0]}"
+                                    for _ in range(nb_requetes)],
+    }
+    print(f"[recherche] {nb_films} films, {len(index._par_mot)} mots distincts, index construit en {t_index:.1f} s")
+    # parcours naïf (sous-chaîne du titre normalisé à la volée), sur quelques requêtes seulement
+    t0 = time.perf_counter()
+    for q in requetes["mot entier"][:3]:
+        q = normaliser(q)
+        [f for f in films.films() if q in normaliser(f.titre)][:20]
+    t_naif = (time.perf_counter() - t0) / 3
+    print(f"  parcours du catalogue             : {t_naif * 1e3:10.1f} ms/requête")
+    for nom, qs in requetes.items():
+        durees, trouves = [], 0
+        for q in qs:
+            t0 = time.perf_counter()
+            trouves += bool(index.chercher(q))
+            durees.append(time.perf_counter() - t0)
+        durees.sort()
+        print(f"  {nom:33s} : {durees[len(durees) // 2] * 1e3:7.3f} ms médiane, "
+              f"{durees[len(durees) * 99 // 100] * 1e3:7.3f} ms p99 ({trouves}/{len(qs)} trouvées)")
+    filtres = {
+        "préfixe + genre + durée": dict(genre="comedie", duree_min=90, duree_max=120),
+        "préfixe + durée courte": dict(duree_max=75),
+    }
+    for nom, filtre in filtres.items():
+        durees = []
+        for q in requetes["préfixe (3 lettres)"]:
+            t0 = time.perf_counter()
+            index.chercher(q[:1], **filtre)
+            durees.append(time.perf_counter() - t0)
+        durees.sort()
+        print(f"  {nom:33s} : {durees[len(durees) // 2] * 1e3:7.3f} ms médiane, "
+              f"{durees[len(durees) * 99 // 100] * 1e3:7.3f} ms p99")
+    t0 = time.perf_counter()
+    for t in titres[:1000]:
+        films.supprimer_film(t)
+    for t in titres[:1000]:
+        films.ajouter_film(Film(t, 100, "Drame"))
+    index.chercher("a")
+    print(f"  suppression + ajout d'un film     : {(time.perf_counter() - t0) / 2000 * 1e6:7.1f} µs")
+
+
+def bench_suppression(nb_films: int = 2000, nb_salles: int = 50, nb_jours: int = 365, nb_affichages: int = 20):
+    """Suppression de films et de salles : séances supprimées en cascade, plus de filtrage à l'affichage."""
+    rnd = random.Random(1)
+    films = GestionFilms()
+    salles = GestionSalles()
+    for i in range(nb_films):
+        films.ajouter_film(Film(f"Film {i}", rnd.randint(80, 180), "Drame"))
+    for n in range(1, nb_salles + 1):
+        salles.ajouter_salle(Salle(n, 300))
+    gs = GestionSeances()
+    gs.suivre(films, salles)
+    catalogue = films.lister_films()
+    programme = [(rnd.choice(catalogue), salle, h) for _, salle, h in
+                 programmation.planifier(catalogue[:40], salles.lister_salles(), programmation.lundi_suivant(), nb_jours)]
+    seances = gs.creer_seances(programme, verifier=False)
+    etiquettes = [p for rangee in seances[0].plan for p in rangee]
+    for s in rnd.sample(seances, len(seances) // 2):
+        s.reserver(f"C{rnd.randrange(5000)}", etiquettes[rnd.randrange(len(etiquettes))])
+    print(f"[suppression] {len(seances)} séances, {nb_films} films, {len(gs.index_reservations)} réservations")
+    # avant : les séances des films supprimés restaient, l'affichage les filtrait à chaque fois
+    t0 = time.perf_counter()
+    for _ in range(nb_affichages):
+        [s for s in gs.seances_entre() if films.existe_film(s.film.titre)]
+    t_filtre = (time.perf_counter() - t0) / nb_affichages
+    t0 = time.perf_counter()
+    for _ in range(nb_affichages):
+        gs.seances_entre()
+    t_liste = (time.perf_counter() - t0) / nb_affichages
+    print(f"  liste des séances, filtrée       : {t_filtre * 1e3:10.2f} ms/affichage")
+    print(f"  liste des séances, sans filtre   : {t_liste * 1e3:10.2f} ms/affichage")
+    titres = [f.titre for f in rnd.sample(catalogue, 100)]
+    nb = sum(len(gs.seances_du_film(t)) for t in titres)
+    t0 = time.perf_counter()
+    for t in titres:
+        films.supprimer_film(t)
+    t_films = time.perf_counter() - t0
+    nb_salle = len(gs.seances_de_salle(1))
+    t0 = time.perf_counter()
+    salles.supprimer_salle(1)
+    t_salle = time.perf_counter() - t0
+    assert not any(gs.seances_du_film(t) for t in titres) and not gs.seances_de_salle(1)
+    assert len(gs.seances_entre()) == len(gs.lister_seances()) == len(seances) - nb - nb_salle
+    assert gs.compteurs.total()[0] == len(gs.index_reservations)
+    print(f"  suppression d'un film            : {t_films / len(titres) * 1e3:10.3f} ms ({nb / len(titres):.0f} séances)")
+    print(f"  suppression d'une salle          : {t_salle * 1e3:10.3f} ms ({nb_salle} séances)")
+
+
+@dataclass
+class _ReservationAncienne:
+    """Ancienne réservation (dataclass avec __dict__), gardée par la séance et par l'index global."""
+    client_nom: str
+    place: str
+    seance_id: int
+
+
+def _memoire_par_reservation(remplir) -> float:
+    tracemalloc.start()
+    avant = tracemalloc.take_snapshot()
+    nb, garde = remplir()
+    apres = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del garde
+    return sum(stat.size_diff for stat in apres.compare_to(avant, 'filename')) / nb
+
+
+def bench_memoire_reservations(nb_seances: int = 1000, capacite: int = 300, nb_clients: int = 20000):
+    """Mémoire par réservation (séances pleines, noms reçus comme de nouvelles chaînes) : avant / après."""
+    film, salle = Film("Bench", 120, "Drame"), Salle(1, capacite)
+    etiquettes = [p for rangee in salle.plan_salle.rangees() for p in rangee]
+
+    def ancienne():
+        # séance : place -> réservation ; index : (séance, place) -> réservation et client -> {(séance, place)}
+        par_seance, par_place, par_client = [], {}, {}
+        k = 0
+        for sid in range(nb_seances):
+            reservations = {}
+            for p in etiquettes:
+                # chaînes neuves, comme celles lues dans une requête ou un fichier
+                r = _ReservationAncienne(f"Client {k % nb_clients}", "".join(p), sid)
+                reservations[r.place] = r
+                par_place[(sid, r.place)] = r
+                par_client.setdefault(r.client_nom, set()).add((sid, r.place))
+                k += 1
+            par_seance.append(reservations)
+        return k, (par_seance, par_place, par_client)
+
+    gs = GestionSeances()
+    seances = [gs.creer_seance(film, salle, "2025-12-31 20:00", verifier=False) for _ in range(nb_seances)]
+
+    def nouvelle():
+        k = 0
+        for s in seances:
+            for p in etiquettes:
+                s.reserver(f"Client {k % nb_clients}", "".join(p))
+                k += 1
+        return k, None
+
+    o_anc = _memoire_par_reservation(ancienne)
+    debut = time.perf_counter()
+    o_nouv = _memoire_par_reservation(nouvelle)
+    duree = time.perf_counter() - debut
+    nb = nb_seances * capacite
+    print(f"[memoire_reservations] {nb} réservations ({nb_seances} séances de {capacite} places, {nb_clients} clients)")
+    print(f"  avant : {o_anc:8.1f} octets/réservation")
+    print(f"  après : {o_nouv:8.1f} octets/réservation  (x{o_anc / o_nouv:.1f}, {duree / nb * 1e6:.1f} µs/réservation sous tracemalloc)")
+
+def _lancer(benchs, filtres):
+    for nom, fn in benchs:
+        if filtres and not any(f in nom for f in filtres):
+            continue
+        debut = time.perf_counter()
+        fn()
+        print(f"  ({time.perf_counter() - debut:.2f}s)\n")
+
+
+BENCHMARKS = [
+    ("memoire_seances", bench_memoire_seances),
+    ("memoire_seances_remplies", lambda: bench_memoire_seances(taux_remplissage=0.5)),
+    ("memoire_reservations", bench_memoire_reservations),
+    ("prefetch_affiches", bench_prefetch_affiches),
+    ("cache_affiches", bench_cache_affiches),
+    ("plan_canvas", bench_plan_canvas),
+    ("reservations_client", bench_reservations_client),
+    ("stockage", bench_stockage),
+    ("journal", bench_journal),
+    ("concurrence", bench_concurrence),
+    ("groupes", bench_groupes),
+    ("grandes_salles", bench_grandes_salles),
+    ("retenues", bench_retenues),
+    ("serveur", bench_serveur),
+    ("repartition", bench_repartition),
+    ("import_films", bench_import_films),
+    ("programmation", bench_programmation),
+    ("creneaux", bench_creneaux),
+    ("analyses", bench_analyses),
+    ("compteurs", bench_compteurs),
+    ("vues", bench_vues),
+    ("recherche", bench_recherche),
+    ("suppression", bench_suppression),
+]
+
+
+if __name__ == "__main__":
+    _lancer(BENCHMARKS, sys.argv[1:])
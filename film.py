@@ -3,10 +3,11 @@ Module : film
 Fonction : gestion des films (sans les salles ni les réservations).
 """
 
-from typing import Optional, Dict, List
-import csv
+from typing import Any, Callable, Optional, Dict, List, Tuple, ValuesView
 import os
 
+from vues import paginer
+
 
 class FilmDejaExistantError(Exception):
     """Exception levée si on tente d'ajouter un film déjà existant."""
@@ -24,6 +25,8 @@ class Film:
     Chaque film a un titre, une durée et un genre.
     """
 
+    __slots__ = ('titre', 'duree', 'genre', 'affiche')
+
     def __init__(self, titre: str, duree: int, genre: Optional[str] = None, affiche: Optional[str] = None):
         # Vérifie que la durée est positive
         if duree <= 0:
@@ -48,18 +51,68 @@ class GestionFilms:
 
     def __init__(self):
         self._films: Dict[str, Film] = {}
+        # objets prévenus des modifications (ex: stockage persistant)
+        self._ecouteurs: List[object] = []
+
+    def ajouter_ecouteur(self, ecouteur: object) -> None:
+        """Enregistre un objet prévenu des modifications (méthodes film_ajoute, film_modifie, film_supprime)."""
+        self._ecouteurs.append(ecouteur)
+
+    def _notifier(self, evenement: str, *args) -> None:
+        for e in self._ecouteurs:
+            rappel = getattr(e, evenement, None)
+            if rappel is not None:
+                rappel(*args)
 
     def ajouter_film(self, film: Film) -> None:
         """Ajoute un film au système, lève une exception si le titre existe déjà."""
         if film.titre in self._films:
             raise FilmDejaExistantError(f"Le film '{film.titre}' existe déjà.")
         self._films[film.titre] = film
+        self._notifier('film_ajoute', film)
+
+    def mettre_a_jour_film(self, film: Film) -> Film:
+        """
+        Remplace la durée, le genre et l'affiche du film de même titre, lève une exception s'il n'existe pas.
+        Le film enregistré est modifié sur place (les salles et séances qui le référencent voient la mise à jour).
+        """
+        existant = self.get_film(film.titre)
+        existant.duree = film.duree
+        existant.genre = film.genre
+        existant.affiche = film.affiche
+        self._notifier('film_modifie', existant)
+        return existant
+
+    def fusionner_films(self, films: List[Film], mise_a_jour: bool = True) -> Tuple[int, int, List[int]]:
+        """
+        Ajoute une liste de films en une fois (import de catalogue).
+        Un titre déjà connu met à jour le film existant si `mise_a_jour`, sinon il est refusé.
+        Retourne (nb ajoutés, nb mis à jour, positions dans `films` des films refusés).
+        """
+        connus = self._films
+        ajoutes, mis_a_jour, refuses = 0, 0, []
+        for i, film in enumerate(films):
+            existant = connus.get(film.titre)
+            if existant is None:
+                connus[film.titre] = film
+                ajoutes += 1
+                if self._ecouteurs:
+                    self._notifier('film_ajoute', film)
+            elif mise_a_jour:
+                existant.duree, existant.genre, existant.affiche = film.duree, film.genre, film.affiche
+                mis_a_jour += 1
+                if self._ecouteurs:
+                    self._notifier('film_modifie', existant)
+            else:
+                refuses.append(i)
+        return ajoutes, mis_a_jour, refuses
 
     def supprimer_film(self, titre: str) -> None:
         """Supprime un film par son titre, lève une exception si il n'existe pas."""
         if titre not in self._films:
             raise FilmInexistantError(f"Le film '{titre}' n'existe pas.")
         del self._films[titre]
+        self._notifier('film_supprime', titre)
 
     def get_film(self, titre: str) -> Film:
         """Retourne le film par son titre, lève une exception si il n'existe pas."""
@@ -67,30 +120,38 @@ class GestionFilms:
             raise FilmInexistantError(f"Le film '{titre}' n'existe pas.")
         return self._films[titre]
 
+    def existe_film(self, titre: str) -> bool:
+        """Indique si un film de ce titre est enregistré."""
+        return titre in self._films
+
     def lister_films(self) -> List[Film]:
         """Retourne la liste de tous les films enregistrés."""
         return list(self._films.values())
 
+    def films(self) -> ValuesView[Film]:
+        """
+        Vue en lecture seule (sans copie) des films enregistrés, tenue à jour.
+        Le catalogue ne doit pas être modifié pendant qu'on la parcourt.
+        """
+        return self._films.values()
+
+    def chercher_films(self, filtre: Optional[Callable[[Film], bool]] = None,
+                       cle: Optional[Callable[[Film], Any]] = None, inverse: bool = False,
+                       debut: int = 0, limite: Optional[int] = None) -> List[Film]:
+        """Page de films filtrés et triés (voir vues.paginer), ex: cle=lambda f: f.titre, limite=50."""
+        return paginer(self._films.values(), filtre, cle, inverse, debut, limite)
+
 
 def charger_films_csv(path_csv: str) -> GestionFilms:
     """
     Charge les films depuis un fichier CSV et retourne un objet GestionFilms pré-rempli.
+    Les lignes invalides sont ignorées ; import_films.importer_films donne le détail des rejets.
     """
+    from import_films import importer_films  # import_films dépend de ce module
     gestion = GestionFilms()
     if not os.path.exists(path_csv):
         return gestion
-    with open(path_csv, newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            try:
-                titre = row['titre']
-                duree = int(row['duree'])
-                genre = row.get('genre', None)
-                affiche = row.get('affiche', None)
-                film = Film(titre, duree, genre, affiche)
-                gestion.ajouter_film(film)
-            except Exception:
-                pass  # Ignore les lignes invalides
+    importer_films(path_csv, gestion, mise_a_jour=False)
     return gestion
 
 
@@ -2,12 +2,10 @@ import tkinter as tk
 from tkinter import messagebox, simpledialog
 from film import GestionFilms, FilmInexistantError
 from salle import GestionSalles, SalleInexistanteError
-from reservation import GestionSeances, SallePleineError
+from reservation import GestionSeances, SallePleineError, creer_seances_par_defaut
 import os
-import urllib.request
-import urllib.parse
-import json
-import mimetypes
+import logging
+import sqlite3
 try:
     from PIL import Image, ImageTk
     HAS_PIL = True
@@ -15,6 +13,15 @@ except Exception:
     HAS_PIL = False
 from film import charger_films_csv
 from salle import salles_par_defaut
+from affiches import CacheLRU, PrefetchAffiches, trouver_affiche
+from widgets import ListeVirtuelle, PlanCanvas
+from stockage import StockageSQLite
+from programmation import lundi_suivant, programmer
+from analyses import TableSeances, meilleures_ventes, remplissage
+from recherche import IndexFilms
+from datetime import date
+
+_log = logging.getLogger(__name__)
 
 # Palette "néon futuriste"
 BG_COLOR = "#05080F"           # noir bleuté
@@ -32,31 +39,48 @@ BODY_FONT = ("Open Sans", 11)
 # Boutons
 BUTTON_BG = ELECTRIC_BLUE
 BUTTON_FG = NEON_VIOLET
-DEFAULT_OMDB_KEY = "bb3780f4"
-DEFAULT_TMDB_KEY = "05567543c456f676f3852789a096ce75"
+INTERVALLE_AFFICHES_MS = 200  # fréquence de relève des affiches préchargées
+TAILLE_CACHE_VIGNETTES = 256  # nombre de vignettes décodées gardées en mémoire
+# Hauteur (px) d'une ligne dans les listes virtualisées
+HAUTEUR_RANGEE_FILMS = 400
+HAUTEUR_LIGNE_SEANCE = 44
+HAUTEUR_LIGNE_RESERVATION = 150
+# Base de données (films, salles, séances, réservations) ; CINEMA_DB permet d'en changer
+CHEMIN_DB = os.environ.get('CINEMA_DB') or os.path.join(os.path.dirname(os.path.abspath(__file__)), "cinema.db")
+INTERVALLE_FLUSH_MS = 1000  # écriture périodique des modifications en attente
+COULEUR_RETENUE = "orange"  # place retenue par une caisse le temps de la confirmation
+TAILLE_APERCU = 30  # films / salles listés dans les boîtes de dialogue du gestionnaire
 
 class CinemaApp:
     def __init__(self, root):
         # Initialise l'application graphique et les gestionnaires de films, salles, séances
         self.root = root
         self.root.title("Cinéma - Application Graphique")
-        chemin_csv = os.path.join(os.path.dirname(__file__), "films_init.csv")
-        self.gestion_films = charger_films_csv(chemin_csv)
-        self.gestion_salles = salles_par_defaut()
-        self.gestion_seances = GestionSeances()
-        self.creer_seances_par_defaut()
+        # identifiant de cette caisse, titulaire des places retenues pendant une réservation
+        self._caisse = f"caisse-{os.getpid()}-{id(self)}"
+        self.stockage = StockageSQLite(CHEMIN_DB)
+        if self.stockage.est_vide():
+            # premier lancement : données initiales, puis enregistrement dans la base
+            chemin_csv = os.path.join(os.path.dirname(__file__), "films_init.csv")
+            self.gestion_films = charger_films_csv(chemin_csv)
+            self.gestion_salles = salles_par_defaut()
+            self.gestion_seances = GestionSeances()
+            self.creer_seances_par_defaut()
+            self.stockage.sauver_tout(self.gestion_films, self.gestion_salles, self.gestion_seances)
+        else:
+            self.gestion_films, self.gestion_salles, self.gestion_seances = self.stockage.charger()
+        self.stockage.attacher(self.gestion_films, self.gestion_salles, self.gestion_seances)
+        # supprimer un film ou une salle supprime ses séances
+        self.gestion_seances.suivre(self.gestion_films, self.gestion_salles)
+        # recherche des films par une partie du titre, tenue à jour à chaque ajout / suppression
+        self.index_films = IndexFilms(self.gestion_films)
+        self.root.after(INTERVALLE_FLUSH_MS, self._flush_periodique)
         # Appliquer style global
         self.apply_style()
-        # tenter de récupérer et stocker localement les affiches pour les films existants
-        try:
-            for f in self.gestion_films.lister_films():
-                try:
-                    self._fetch_and_store_affiche(f)
-                except Exception:
-                    pass
-        except Exception:
-            pass
         self.menu_principal()
+        # les affiches sont récupérées en arrière-plan une fois la fenêtre affichée
+        self._prefetch = None
+        self.root.after_idle(self._demarrer_prefetch)
 
     def apply_style(self):
         self.bg_color = BG_COLOR
@@ -66,119 +90,81 @@ class CinemaApp:
         self.root.configure(bg=self.bg_color)
         # stockage des références d'images pour éviter le GC
         self._image_refs = {}
-
-    def _fetch_affiche_online(self, titre: str):
-        """Tente de récupérer l'URL d'affiche depuis OMDb (si clé OMDB_API_KEY) ou TMDb (TMDB_API_KEY)."""
-        omdb_key = os.environ.get('OMDB_API_KEY') or DEFAULT_OMDB_KEY
-        tmdb_key = os.environ.get('TMDB_API_KEY') or DEFAULT_TMDB_KEY
-        title_q = urllib.parse.quote_plus(titre)
-        # OMDb
-        if omdb_key:
-            try:
-                url = f"http://www.omdbapi.com/?t={title_q}&apikey={omdb_key}"
-                with urllib.request.urlopen(url, timeout=10) as resp:
-                    data = json.load(resp)
-                poster = data.get('Poster')
-                if poster and poster != 'N/A':
-                    return poster
-            except Exception:
-                pass
-        # TMDb
-        if tmdb_key:
-            try:
-                url = f"https://api.themoviedb.org/3/search/movie?api_key={tmdb_key}&query={title_q}"
-                with urllib.request.urlopen(url, timeout=10) as resp:
-                    data = json.load(resp)
-                results = data.get('results', [])
-                if results:
-                    poster_path = results[0].get('poster_path')
-                    if poster_path:
-                        return f"https://image.tmdb.org/t/p/w500{poster_path}"
-            except Exception:
-                pass
-        return None
-
-    def _download_image(self, url: str, dest_path: str):
+        # labels d'affiche de la galerie courante, par titre (mis à jour à l'arrivée des affiches)
+        self._vignettes_galerie = {}
+        # vignettes pré-générées sur disque (par titre) et vignettes décodées (par titre et mtime)
+        self._miniatures = {}
+        self._cache_vignettes = CacheLRU(TAILLE_CACHE_VIGNETTES)
+        # plan de salle affiché (mis à jour place par place après une réservation)
+        self._plan_canvas = None
+
+    def _flush_periodique(self):
+        # Écrit régulièrement les modifications en attente dans la base
         try:
-            req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-            with urllib.request.urlopen(req, timeout=20) as resp:
-                data = resp.read()
-                # essayer déterminer extension
-                content_type = resp.headers.get('Content-Type')
-                ext = None
-                if content_type:
-                    ext = mimetypes.guess_extension(content_type.split(';')[0].strip())
-                if not ext:
-                    parsed = urllib.parse.urlparse(url)
-                    root, e = os.path.splitext(parsed.path)
-                    ext = e or '.jpg'
-                if not dest_path.lower().endswith(ext):
-                    dest_path = dest_path + ext
-                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-                with open(dest_path, 'wb') as f:
-                    f.write(data)
-                return dest_path
+            self.stockage.flush()
+        except sqlite3.Error as e:
+            # les modifications restent en attente : nouvel essai au prochain passage
+            _log.warning("Écriture dans la base impossible : %s", e)
+        self.root.after(INTERVALLE_FLUSH_MS, self._flush_periodique)
+
+    def _demarrer_prefetch(self):
+        # Lance le préchargement des affiches pour tous les films existants
+        self._prefetch = PrefetchAffiches()
+        self._prefetch.demander(self.gestion_films.lister_films())
+        self._verifier_affiches()
+
+    def _verifier_affiches(self):
+        # Relève périodiquement les affiches arrivées (depuis le thread Tk)
+        self._prefetch.traiter_resultats(self._affiche_recue)
+        self.root.after(INTERVALLE_AFFICHES_MS, self._verifier_affiches)
+
+    def _affiche_recue(self, film, chemin, miniature):
+        # Met à jour le film et, si la galerie est affichée, la vignette correspondante
+        if not chemin:
+            return
+        film.affiche = chemin
+        if miniature:
+            self._miniatures[film.titre] = miniature
+        lbl = self._vignettes_galerie.get(film.titre)
+        if lbl is None or not lbl.winfo_exists():
+            return
+        try:
+            photo = self._vignette(film)
         except Exception:
+            return
+        if photo is None:
+            return
+        del self._vignettes_galerie[film.titre]
+        lbl.configure(image=photo, text="", width=0, height=0, relief='flat')
+        lbl.image = photo
+        self._image_refs[film.titre] = photo
+
+    def _vignette(self, film):
+        # Retourne la vignette décodée d'un film (cache LRU par titre et date de modification),
+        # ou None si elle n'est pas encore prête. Avec PIL, seules les miniatures pré-générées
+        # par le préchargement sont décodées ici, jamais les affiches pleine taille.
+        chemin = self._miniatures.get(film.titre)
+        if chemin is None:
+            if HAS_PIL:
+                return None
+            chemin = trouver_affiche(film)
+            if chemin is None:
+                return None
+        try:
+            mtime = os.path.getmtime(chemin)
+        except OSError:
             return None
+        cle = (film.titre, mtime)
+        photo = self._cache_vignettes.get(cle)
+        if photo is None:
+            photo = ImageTk.PhotoImage(Image.open(chemin)) if HAS_PIL else tk.PhotoImage(file=chemin)
+            self._cache_vignettes.put(cle, photo)
+        return photo
 
-    def _fetch_and_store_affiche(self, film):
-        # Si affiche déjà trouvée localement, garder
-        existing = self._find_affiche_path(film)
-        if existing:
-            film.affiche = existing
-            return existing
-        # tenter récupération en ligne
-        url = self._fetch_affiche_online(film.titre)
-        if not url:
-            return None
-        # définir chemin local de sauvegarde
-        base_dir = os.path.dirname(__file__)
-        posters_dir = os.path.join(base_dir, 'posters')
-        safe_name = ''.join(c if c.isalnum() else '_' for c in film.titre)
-        dest_base = os.path.join(posters_dir, safe_name)
-        saved = self._download_image(url, dest_base)
-        if saved:
-            film.affiche = saved
-            return saved
-        return None
-
-    def _find_affiche_path(self, film):
-        # Priorité: chemin explicite dans l'objet film
-        base_dir = os.path.dirname(__file__)
-        candidates = []
-        if getattr(film, 'affiche', None):
-            candidates.append(os.path.join(base_dir, film.affiche))
-            candidates.append(film.affiche)
-        # chercher dans dossier posters par titre (espaces remplacés)
-        safe_name = ''.join(c if c.isalnum() else '_' for c in film.titre)
-        posters_dir = os.path.join(base_dir, 'posters')
-        exts = ['.png', '.jpg', '.jpeg', '.gif']
-        for ext in exts:
-            candidates.append(os.path.join(posters_dir, f"{safe_name}{ext}"))
-            candidates.append(os.path.join(posters_dir, f"{film.titre}{ext}"))
-            candidates.append(os.path.join(base_dir, f"{safe_name}{ext}"))
-            candidates.append(os.path.join(base_dir, f"{film.titre}{ext}"))
-        for p in candidates:
-            if p and os.path.exists(p):
-                return p
-        return None
-        
     def creer_seances_par_defaut(self):
         # Crée 5 séances par défaut au lancement
-        films = self.gestion_films.lister_films()
-        salles = self.gestion_salles.lister_salles()
-        horaires = [
-            "2025-12-10 18:00",
-            "2025-12-10 20:00",
-            "2025-12-11 18:00",
-            "2025-12-11 20:00",
-            "2025-12-12 21:00"
-        ]
-        for i in range(min(5, len(films), len(salles))):
-            try:
-                self.gestion_seances.creer_seance(films[i], salles[i], horaires[i])
-            except Exception:
-                pass
+        creer_seances_par_defaut(self.gestion_seances, self.gestion_films.lister_films(),
+                                 self.gestion_salles.lister_salles())
 
     def menu_principal(self):
         # Affiche le menu principal (choix client/gestionnaire)
@@ -220,15 +206,18 @@ class CinemaApp:
         tk.Button(self.root, text="Supprimer une salle", width=30, command=self.supprimer_salle, bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT).pack(pady=5)
         tk.Button(self.root, text="Affecter un film à une salle", width=30, command=self.affecter_film_salle, bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT).pack(pady=5)
         tk.Button(self.root, text="Créer une séance", width=30, command=self.creer_seance, bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT).pack(pady=5)
+        tk.Button(self.root, text="Programmer une semaine", width=30, command=self.programmer_semaine, bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT).pack(pady=5)
+        tk.Button(self.root, text="Statistiques", width=30, command=self.afficher_statistiques, bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT).pack(pady=5)
         tk.Button(self.root, text="Retour", width=30, command=self.menu_principal, bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT).pack(pady=5)
 
     def clear(self):
         # Efface tous les widgets de la fenêtre
+        self._vignettes_galerie = {}
         for widget in self.root.winfo_children():
             widget.destroy()
 
     def afficher_films(self):
-        # Affiche la liste des films à l'affiche
+        # Affiche la liste des films à l'affiche ; seules les rangées visibles sont construites
         self.clear()
         tk.Label(self.root, text="Films à l'affiche", font=SUBTITLE_FONT, bg=self.bg_color, fg=TEXT_LIGHT).pack(pady=10)
         films = self.gestion_films.lister_films()
@@ -237,93 +226,76 @@ class CinemaApp:
             tk.Button(self.root, text="Retour", command=self.menu_client_options, bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT).pack(pady=10)
             return
 
-        # zone de défilement contenant une grille centrée (4 colonnes)
-        container = tk.Frame(self.root, bg=self.bg_color)
-        container.pack(fill='both', expand=True)
-        canvas = tk.Canvas(container, bg=self.bg_color, highlightthickness=0)
-        scrollbar = tk.Scrollbar(container, orient=tk.VERTICAL, command=canvas.yview)
-        canvas.pack(side=tk.LEFT, fill='both', expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill='y')
-
-        # wrapper placé dans le canvas; sa largeur sera ajustée pour correspondre au canvas
-        wrapper = tk.Frame(canvas, bg=self.bg_color)
-        window_id = canvas.create_window((0, 0), window=wrapper, anchor='nw')
-
-        def _on_canvas_config(e):
-            canvas.itemconfig(window_id, width=e.width)
-        canvas.bind('<Configure>', _on_canvas_config)
-        wrapper.bind('<Configure>', lambda e: canvas.configure(scrollregion=canvas.bbox('all')))
-
-        # Activer le défilement avec la molette / pavé tactile lorsque le curseur
-        # survole la zone d'affichage des films. Utilise <MouseWheel> (Windows/Mac)
-        # et <Button-4/5> (Linux) comme fallback.
-        def _on_mousewheel(event):
-            try:
-                # X11: Button-4 (up) / Button-5 (down)
-                if hasattr(event, 'num') and event.num in (4, 5):
-                    delta = -1 if event.num == 4 else 1
-                    canvas.yview_scroll(delta, 'units')
-                else:
-                    # Windows / Mac
-                    delta = int(-1 * (event.delta / 120))
-                    canvas.yview_scroll(delta, 'units')
-            except Exception:
-                pass
-
-        def _bind_scroll(_):
-            canvas.bind_all('<MouseWheel>', _on_mousewheel)
-            canvas.bind_all('<Button-4>', _on_mousewheel)
-            canvas.bind_all('<Button-5>', _on_mousewheel)
-
-        def _unbind_scroll(_):
-            try:
-                canvas.unbind_all('<MouseWheel>')
-                canvas.unbind_all('<Button-4>')
-                canvas.unbind_all('<Button-5>')
-            except Exception:
-                pass
-
-        wrapper.bind('<Enter>', _bind_scroll)
-        wrapper.bind('<Leave>', _unbind_scroll)
-
-        list_frame = tk.Frame(wrapper, bg=self.bg_color)
-        list_frame.pack(anchor='center', pady=10)
-
+        # grille centrée de 4 colonnes, une ligne virtuelle par rangée de films
         cols = 4
-        for idx, f in enumerate(films):
-            row = idx // cols
-            col = idx % cols
-            item = tk.Frame(list_frame, bg=self.bg_color, padx=8, pady=8, relief='flat', bd=0)
-            item.grid(row=row, column=col, padx=12, pady=12)
-            img_path = self._find_affiche_path(f)
-            if img_path:
-                try:
-                    if HAS_PIL:
-                        img = Image.open(img_path)
-                        img.thumbnail((160, 240))
-                        photo = ImageTk.PhotoImage(img)
-                    else:
-                        photo = tk.PhotoImage(file=img_path)
-                    lbl_img = tk.Label(item, image=photo, bg=self.bg_color)
-                    lbl_img.image = photo
-                    self._image_refs[f.titre] = photo
-                    lbl_img.pack(anchor='center')
-                except Exception:
-                    tk.Label(item, text="[Affiche non chargée]", bg=self.bg_color, fg=TEXT_LIGHT, font=BODY_FONT).pack()
-            else:
-                placeholder = tk.Label(item, text="Pas d'affiche", width=20, height=12, bg=self.bg_color, fg=TEXT_LIGHT, relief='ridge')
-                placeholder.pack(anchor='center')
-            tk.Label(item, text=f.titre, bg=self.bg_color, fg=NEON_VIOLET, wraplength=160, justify='center', font=("Orbitron", 11, "bold")).pack(pady=(6,0), anchor='center')
-            if getattr(f, 'genre', None):
-                tk.Label(item, text=f.genre, bg=self.bg_color, fg=TEXT_LIGHT, font=BODY_FONT).pack(anchor='center')
-            tk.Button(item, text="Voir séances", command=lambda film=f: self.afficher_seances(film), bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT).pack(pady=6)
 
-        # for nicer layout, ensure even columns
-        for c in range(cols):
-            list_frame.grid_columnconfigure(c, weight=1)
+        def _creer_rangee(parent):
+            rangee = tk.Frame(parent, bg=self.bg_color)
+            rangee.cellules = []
+            for c in range(cols):
+                # for nicer layout, ensure even columns
+                rangee.grid_columnconfigure(c, weight=1, uniform='films')
+                item = tk.Frame(rangee, bg=self.bg_color, padx=8, pady=8, relief='flat', bd=0)
+                item.grid(row=0, column=c, padx=12, pady=12, sticky='n')
+                cellule = {
+                    'item': item,
+                    'film': None,
+                    'image': tk.Label(item, bg=self.bg_color, fg=TEXT_LIGHT, font=BODY_FONT),
+                    'titre': tk.Label(item, bg=self.bg_color, fg=NEON_VIOLET, wraplength=160, justify='center', font=("Orbitron", 11, "bold")),
+                    'genre': tk.Label(item, bg=self.bg_color, fg=TEXT_LIGHT, font=BODY_FONT),
+                    'bouton': tk.Button(item, text="Voir séances", bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT),
+                }
+                cellule['image'].pack(anchor='center')
+                cellule['titre'].pack(pady=(6,0), anchor='center')
+                cellule['genre'].pack(anchor='center')
+                cellule['bouton'].pack(pady=6)
+                rangee.cellules.append(cellule)
+            return rangee
+
+        def _remplir_rangee(rangee, idx):
+            for c, cellule in enumerate(rangee.cellules):
+                # la cellule est recyclée : elle ne doit plus recevoir l'affiche de son ancien film
+                ancien = cellule['film']
+                if ancien is not None and self._vignettes_galerie.get(ancien.titre) is cellule['image']:
+                    del self._vignettes_galerie[ancien.titre]
+                i = idx * cols + c
+                if i >= len(films):
+                    cellule['film'] = None
+                    cellule['item'].grid_remove()
+                    continue
+                f = films[i]
+                cellule['film'] = f
+                cellule['item'].grid()
+                self._afficher_vignette(cellule['image'], f)
+                cellule['titre'].configure(text=f.titre)
+                cellule['genre'].configure(text=getattr(f, 'genre', None) or "")
+                cellule['bouton'].configure(command=lambda film=f: self.afficher_seances(film))
+
+        nb_rangees = (len(films) + cols - 1) // cols
+        liste = ListeVirtuelle(self.root, nb_rangees, HAUTEUR_RANGEE_FILMS, _creer_rangee, _remplir_rangee, bg=self.bg_color)
+        liste.pack(fill='both', expand=True)
 
         tk.Button(self.root, text="Retour", command=self.menu_client_options, bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT).pack(pady=10)
 
+    def _afficher_vignette(self, lbl, film):
+        # Place la vignette du film dans le label, ou un emplacement vide si elle n'est pas prête
+        try:
+            photo = self._vignette(film)
+        except Exception:
+            photo = False
+        if photo:
+            lbl.configure(image=photo, text="", width=0, height=0, relief='flat')
+            lbl.image = photo
+            self._image_refs[film.titre] = photo
+        elif photo is False:
+            lbl.configure(image="", text="[Affiche non chargée]", width=0, height=0, relief='flat')
+        else:
+            lbl.configure(image="", text="Pas d'affiche", width=20, height=12, relief='ridge')
+            self._vignettes_galerie[film.titre] = lbl
+            # vignette pas encore prête : la demander au préchargement
+            if self._prefetch is not None:
+                self._prefetch.demander([film])
+
     def menu_client_reservations(self):
         # Affiche les réservations d'un client (demande le nom)
         self.clear()
@@ -333,59 +305,57 @@ class CinemaApp:
             tk.Button(self.root, text="Retour", command=self.menu_client_options, bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT).pack(pady=10)
             return
 
-        # Collecter toutes les réservations pour ce client
-        seances = self.gestion_seances.lister_seances()
-        client_res = []  # list of tuples (seance, [places])
-        for s in seances:
-            seats = [r.place for r in s.lister_reservations() if r.client_nom == client_nom]
-            if seats:
-                client_res.append((s, seats))
+        # Réservations de ce client, via l'index global
+        client_res = self.gestion_seances.reservations_du_client(client_nom)  # list of tuples (seance, [places])
 
         if not client_res:
             tk.Label(self.root, text="Aucune séance n'est réservée.", bg=self.bg_color, fg=TEXT_LIGHT, font=BODY_FONT).pack(pady=8)
             tk.Button(self.root, text="Retour", command=self.menu_client_options, bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT).pack(pady=10)
             return
 
-        # zone scrollable
-        container = tk.Frame(self.root, bg=self.bg_color)
-        container.pack(fill='both', expand=True)
-        canvas = tk.Canvas(container, bg=self.bg_color, highlightthickness=0)
-        scrollbar = tk.Scrollbar(container, orient=tk.VERTICAL, command=canvas.yview)
-        canvas.pack(side=tk.LEFT, fill='both', expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill='y')
-        wrapper = tk.Frame(canvas, bg=self.bg_color)
-        win = canvas.create_window((0, 0), window=wrapper, anchor='nw')
-        canvas.bind('<Configure>', lambda e: canvas.itemconfig(win, width=e.width))
-        wrapper.bind('<Configure>', lambda e: canvas.configure(scrollregion=canvas.bbox('all')))
-
-        for (s, seats) in client_res:
-            item = tk.Frame(wrapper, bg=self.bg_color, bd=1, relief='solid', padx=8, pady=8)
+        def _del_cb(seance, seats_list, client=client_nom):
+            if messagebox.askyesno("Confirmation", "Voulez-vous supprimer cette réservation ?"):
+                removed_any = False
+                for p in list(seats_list):
+                    try:
+                        ok = seance.annuler_reservation(client, p)
+                        if ok:
+                            removed_any = True
+                    except Exception:
+                        pass
+                if removed_any:
+                    messagebox.showinfo("Succès", "Réservation supprimée.")
+                else:
+                    messagebox.showerror("Erreur", "Impossible de supprimer la réservation.")
+                # rafraîchir la vue
+                self.menu_client_reservations()
+
+        def _creer_ligne(parent):
+            ligne = tk.Frame(parent, bg=self.bg_color)
+            item = tk.Frame(ligne, bg=self.bg_color, bd=1, relief='solid', padx=8, pady=8)
             item.pack(fill='x', padx=12, pady=8)
+            item.grid_columnconfigure(0, weight=1)
             # Afficher nom, film, horaire, sièges
             tk.Label(item, text=f"Nom: {client_nom}", bg=self.bg_color, fg=TEXT_LIGHT, font=BODY_FONT).grid(row=0, column=0, sticky='w')
-            tk.Label(item, text=f"Film: {s.film.titre}", bg=self.bg_color, fg=NEON_VIOLET, font=SUBTITLE_FONT).grid(row=1, column=0, sticky='w', pady=(4,0))
-            tk.Label(item, text=f"Horaire: {s.horaire}", bg=self.bg_color, fg=TEXT_LIGHT, font=BODY_FONT).grid(row=2, column=0, sticky='w')
-            tk.Label(item, text=f"Sièges: {', '.join(seats)}", bg=self.bg_color, fg=TEXT_LIGHT, font=BODY_FONT).grid(row=3, column=0, sticky='w', pady=(4,0))
-
-            def _del_cb(seance=s, seats_list=seats, client=client_nom):
-                if messagebox.askyesno("Confirmation", "Voulez-vous supprimer cette réservation ?"):
-                    removed_any = False
-                    for p in list(seats_list):
-                        try:
-                            ok = seance.annuler_reservation(client, p)
-                            if ok:
-                                removed_any = True
-                        except Exception:
-                            pass
-                    if removed_any:
-                        messagebox.showinfo("Succès", "Réservation supprimée.")
-                    else:
-                        messagebox.showerror("Erreur", "Impossible de supprimer la réservation.")
-                    # rafraîchir la vue
-                    self.menu_client_reservations()
-
-            btn_del = tk.Button(item, text="🗑️", command=_del_cb, bg=self.bg_color, fg=NEON_VIOLET)
-            btn_del.grid(row=0, column=1, rowspan=4, sticky='e', padx=8)
+            ligne.lbl_film = tk.Label(item, bg=self.bg_color, fg=NEON_VIOLET, font=SUBTITLE_FONT)
+            ligne.lbl_film.grid(row=1, column=0, sticky='w', pady=(4,0))
+            ligne.lbl_horaire = tk.Label(item, bg=self.bg_color, fg=TEXT_LIGHT, font=BODY_FONT)
+            ligne.lbl_horaire.grid(row=2, column=0, sticky='w')
+            ligne.lbl_sieges = tk.Label(item, bg=self.bg_color, fg=TEXT_LIGHT, font=BODY_FONT)
+            ligne.lbl_sieges.grid(row=3, column=0, sticky='w', pady=(4,0))
+            ligne.btn_del = tk.Button(item, text="🗑️", bg=self.bg_color, fg=NEON_VIOLET)
+            ligne.btn_del.grid(row=0, column=1, rowspan=4, sticky='e', padx=8)
+            return ligne
+
+        def _remplir_ligne(ligne, idx):
+            s, seats = client_res[idx]
+            ligne.lbl_film.configure(text=f"Film: {s.film.titre}")
+            ligne.lbl_horaire.configure(text=f"Horaire: {s.horaire}")
+            ligne.lbl_sieges.configure(text=f"Sièges: {', '.join(seats)}")
+            ligne.btn_del.configure(command=lambda seance=s, seats_list=seats: _del_cb(seance, seats_list))
+
+        liste = ListeVirtuelle(self.root, len(client_res), HAUTEUR_LIGNE_RESERVATION, _creer_ligne, _remplir_ligne, bg=self.bg_color)
+        liste.pack(fill='both', expand=True)
 
         tk.Button(self.root, text="Retour", command=self.menu_client_options, bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT).pack(pady=10)
 
@@ -395,14 +365,11 @@ class CinemaApp:
         self.clear()
         title_text = f"Séances - {film.titre}" if film else "Séances"
         tk.Label(self.root, text=title_text, font=SUBTITLE_FONT, bg=self.bg_color, fg=TEXT_LIGHT).pack(pady=10)
-        # On ne garde que les séances dont le film existe encore
-        films_existants = set(f.titre for f in self.gestion_films.lister_films())
-        all_seances = [s for s in self.gestion_seances.lister_seances() if s.film.titre in films_existants]
-
+        # les séances d'un film supprimé disparaissent avec lui (GestionSeances.suivre)
         if film:
-            seances = [s for s in all_seances if s.film.titre == film.titre]
+            seances = self.gestion_seances.seances_du_film(film.titre)
         else:
-            seances = all_seances
+            seances = self.gestion_seances.seances_entre()
 
         if not seances:
             if film:
@@ -414,8 +381,19 @@ class CinemaApp:
                 tk.Label(self.root, text=f"Séances pour {film.titre} :", font=BODY_FONT, bg=self.bg_color, fg=TEXT_LIGHT).pack(pady=5)
             else:
                 tk.Label(self.root, text="Cliquez sur une séance pour voir le plan de salle et réserver :", font=BODY_FONT, bg=self.bg_color, fg=TEXT_LIGHT).pack(pady=5)
-            for s in seances:
-                tk.Button(self.root, text=str(s), wraplength=400, command=lambda seance=s: self.afficher_plan_salle(seance), bg=BUTTON_BG, fg=BUTTON_FG, font=BODY_FONT).pack(pady=2, fill='x')
+            # un bouton par séance visible, recyclé au défilement
+            def _creer_ligne(parent):
+                ligne = tk.Frame(parent, bg=self.bg_color)
+                ligne.bouton = tk.Button(ligne, wraplength=400, bg=BUTTON_BG, fg=BUTTON_FG, font=BODY_FONT)
+                ligne.bouton.pack(pady=2, fill='both', expand=True)
+                return ligne
+
+            def _remplir_ligne(ligne, idx):
+                s = seances[idx]
+                ligne.bouton.configure(text=str(s), command=lambda seance=s: self.afficher_plan_salle(seance))
+
+            liste = ListeVirtuelle(self.root, len(seances), HAUTEUR_LIGNE_SEANCE, _creer_ligne, _remplir_ligne, bg=self.bg_color)
+            liste.pack(fill='both', expand=True)
         tk.Button(self.root, text="Retour", command=self.menu_client_options, bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT).pack(pady=10)
 
     def afficher_plan_salle(self, seance):
@@ -423,23 +401,12 @@ class CinemaApp:
         self.clear()
         tk.Label(self.root, text=f"Plan de la salle {seance.salle.numero} - {seance.film.titre}", font=SUBTITLE_FONT, bg=self.bg_color, fg=NEON_VIOLET).pack(pady=5)
         tk.Label(self.root, text=f"Horaire : {seance.horaire}", font=BODY_FONT, bg=self.bg_color, fg=TEXT_LIGHT).pack(pady=2)
-        plan = seance.plan
-        frame = tk.Frame(self.root, bg=self.bg_color)
-        frame.pack(pady=10)
-        colonnes = max(len(row) for row in plan) if plan else 0
-        # Affichage de la numérotation des colonnes en haut
-        for j in range(colonnes):
-            tk.Label(frame, text=str(j+1), width=4, height=2, font=SUBTITLE_FONT, bg=self.bg_color, fg=NEON_VIOLET).grid(row=0, column=j+1)
-        # Affichage du plan avec lettres à gauche
-        for i, row in enumerate(plan):
-            # Lettre de la rangée à gauche
-            tk.Label(frame, text=chr(65+i), width=4, height=2, font=SUBTITLE_FONT, bg=self.bg_color, fg=NEON_VIOLET).grid(row=i+1, column=0)
-            for j, place in enumerate(row):
-                couleur = "green" if seance.est_place_disponible(place) else "red"
-                etat = tk.NORMAL if seance.est_place_disponible(place) else tk.DISABLED
-                btn = tk.Button(frame, text="", width=4, height=2, bg=couleur, fg=TEXT_LIGHT, state=etat,
-                                command=lambda p=place: self.reserver_place_graphique(seance, p))
-                btn.grid(row=i+1, column=j+1, padx=2, pady=2)
+        # Plan dessiné sur un seul Canvas (numéros de colonnes en haut, lettres à gauche, allées vides)
+        self._plan_canvas = PlanCanvas(self.root, seance.salle.plan_salle.grille(), seance.est_place_disponible,
+                                       lambda p: self.reserver_place_graphique(seance, p),
+                                       bg=self.bg_color, fg_entetes=NEON_VIOLET, police=SUBTITLE_FONT,
+                                       est_retenue=seance.est_place_retenue, couleur_retenue=COULEUR_RETENUE)
+        self._plan_canvas.pack(pady=10)
         # Ajout de la légende du code couleur
         legend_frame = tk.Frame(self.root, bg=self.bg_color)
         legend_frame.pack(pady=5)
@@ -447,25 +414,48 @@ class CinemaApp:
         tk.Label(legend_frame, text=": disponible", font=BODY_FONT, bg=self.bg_color, fg=TEXT_LIGHT).pack(side=tk.LEFT)
         tk.Label(legend_frame, text=" ", width=2, height=1, bg="red").pack(side=tk.LEFT, padx=10)
         tk.Label(legend_frame, text=": réservée", font=BODY_FONT, bg=self.bg_color, fg=TEXT_LIGHT).pack(side=tk.LEFT)
+        tk.Label(legend_frame, text=" ", width=2, height=1, bg=COULEUR_RETENUE).pack(side=tk.LEFT, padx=10)
+        tk.Label(legend_frame, text=": en cours de réservation", font=BODY_FONT, bg=self.bg_color, fg=TEXT_LIGHT).pack(side=tk.LEFT)
         tk.Button(self.root, text="Retour", command=self.afficher_seances, bg=BUTTON_BG, fg=BUTTON_FG, font=SUBTITLE_FONT).pack(pady=10)
 
     def reserver_place_graphique(self, seance, place):
-        # Permet au client de réserver une place précise dans le plan de salle
-        confirm = messagebox.askyesno("Confirmation", f"Voulez-vous réserver la place {place} ?")
-        if not confirm:
-            return
-        client_nom = simpledialog.askstring("Réservation", f"Votre nom pour la place {place} :")
-        if not client_nom:
-            messagebox.showerror("Erreur", "Le nom ne peut pas être vide.")
-            return
+        # Permet au client de réserver une place précise dans le plan de salle.
+        # La place est retenue pour cette caisse pendant la saisie : une autre caisse
+        # ne peut pas la vendre entre le clic et la confirmation.
         try:
-            reservation = seance.reserver(client_nom, place)
-            messagebox.showinfo("Succès", f"Réservation confirmée : {reservation}")
-            self.afficher_plan_salle(seance)
+            seance.retenir(place, self._caisse)
         except SallePleineError as e:
             messagebox.showerror("Erreur", str(e))
-        except Exception as e:
-            messagebox.showerror("Erreur", str(e))
+            self._maj_place_plan(seance, place)
+            return
+        self._maj_place_plan(seance, place)
+        try:
+            confirm = messagebox.askyesno("Confirmation", f"Voulez-vous réserver la place {place} ?")
+            if not confirm:
+                return
+            client_nom = simpledialog.askstring("Réservation", f"Votre nom pour la place {place} :")
+            if not client_nom:
+                messagebox.showerror("Erreur", "Le nom ne peut pas être vide.")
+                return
+            try:
+                reservation = seance.reserver(client_nom, place, titulaire=self._caisse)
+                messagebox.showinfo("Succès", f"Réservation confirmée : {reservation}")
+            except SallePleineError as e:
+                # retenue échue pendant la saisie et place vendue entre-temps
+                messagebox.showerror("Erreur", str(e))
+            except Exception as e:
+                messagebox.showerror("Erreur", str(e))
+        finally:
+            # sans effet si la place vient d'être réservée
+            seance.liberer(place, self._caisse)
+            self._maj_place_plan(seance, place)
+
+    def _maj_place_plan(self, seance, place):
+        # seule la place concernée est redessinée
+        if self._plan_canvas is not None and self._plan_canvas.winfo_exists():
+            self._plan_canvas.maj_place(place)
+        else:
+            self.afficher_plan_salle(seance)
 
     def reserver_depuis_seance(self, seance):
         client_nom = simpledialog.askstring("Réservation", "Votre nom:")
@@ -477,8 +467,9 @@ class CinemaApp:
             messagebox.showerror("Erreur", "Entrée invalide pour le nombre de places : un entier strictement positif est attendu.")
             return
         try:
-            reservation = seance.reserver(client_nom, nb_places)
-            messagebox.showinfo("Succès", f"Réservation confirmée: {reservation}")
+            reservations = seance.reserver_groupe(client_nom, nb_places)
+            places = ", ".join(r.place for r in reservations)
+            messagebox.showinfo("Succès", f"Réservation confirmée: {client_nom} - Places {places} (séance #{seance.id})")
         except SallePleineError as e:
             messagebox.showerror("Erreur", str(e))
         except Exception as e:
@@ -507,8 +498,9 @@ class CinemaApp:
             return
         try:
             seance = self.gestion_seances.get_seance(seance_id)
-            reservation = seance.reserver(client_nom, nb_places)
-            messagebox.showinfo("Succès", f"Réservation confirmée: {reservation}")
+            reservations = seance.reserver_groupe(client_nom, nb_places)
+            places = ", ".join(r.place for r in reservations)
+            messagebox.showinfo("Succès", f"Réservation confirmée: {client_nom} - Places {places} (séance #{seance.id})")
         except SallePleineError as e:
             messagebox.showerror("Erreur", str(e))
         except Exception as e:
@@ -528,12 +520,10 @@ class CinemaApp:
         from film import Film, FilmDejaExistantError
         try:
             film = Film(titre, duree, genre)
-            # tenter de récupérer une affiche en ligne et la stocker localement
-            try:
-                self._fetch_and_store_affiche(film)
-            except Exception:
-                pass
             self.gestion_films.ajouter_film(film)
+            # l'affiche est récupérée en arrière-plan
+            if self._prefetch is not None:
+                self._prefetch.demander([film])
             messagebox.showinfo("Succès", f"Film ajouté: {film}")
         except FilmDejaExistantError:
             messagebox.showerror("Erreur", f"Le film '{titre}' existe déjà.")
@@ -541,14 +531,14 @@ class CinemaApp:
             messagebox.showerror("Erreur", str(e))
 
     def supprimer_film(self):
-        # Supprime un film après affichage de la liste
-        films = self.gestion_films.lister_films()
-        if not films:
+        # Supprime un film cherché par une partie de son titre
+        if not self.gestion_films.films():
             messagebox.showinfo("Info", "Aucun film à supprimer.")
             return
-        films_str = "\n".join(str(f) for f in films)
-        messagebox.showinfo("Films existants", f"Films enregistrés :\n{films_str}")
-        titre = simpledialog.askstring("Supprimer Film", "Titre du film à supprimer:")
+        film = self._choisir_film("Supprimer Film")
+        if film is None:
+            return
+        titre = film.titre
         try:
             self.gestion_films.supprimer_film(titre)
             messagebox.showinfo("Succès", f"Film supprimé: {titre}")
@@ -570,9 +560,16 @@ class CinemaApp:
         except Exception:
             messagebox.showerror("Erreur", "Entrée invalide pour la capacité : un entier strictement positif est attendu.")
             return
+        colonnes = simpledialog.askinteger("Ajouter Salle", "Places par rangée:", initialvalue=12, minvalue=1)
+        if colonnes is None:
+            return
+        allees = simpledialog.askstring("Ajouter Salle", "Allée après les places n° (ex: 4, 10 ; vide si aucune):")
+        if allees is None:
+            return
         from salle import Salle, SalleDejaExistanteError
         try:
-            salle = Salle(numero, capacite)
+            allees = [int(a) for a in allees.replace(',', ' ').split()]
+            salle = Salle(numero, capacite, colonnes, allees)
             self.gestion_salles.ajouter_salle(salle)
             messagebox.showinfo("Succès", f"Salle ajoutée: {salle}")
         except Exception as e:
@@ -580,12 +577,10 @@ class CinemaApp:
 
     def supprimer_salle(self):
         # Supprime une salle après affichage de la liste
-        salles = self.gestion_salles.lister_salles()
-        if not salles:
+        if not self.gestion_salles.salles():
             messagebox.showinfo("Info", "Aucune salle à supprimer.")
             return
-        salles_str = "\n".join(str(s) for s in salles)
-        messagebox.showinfo("Salles existantes", f"Salles enregistrées :\n{salles_str}")
+        messagebox.showinfo("Salles existantes", f"Salles enregistrées :\n{self._apercu_salles()}")
         try:
             numero = simpledialog.askinteger("Supprimer Salle", "Numéro de la salle à supprimer:")
             if numero is None:
@@ -596,29 +591,26 @@ class CinemaApp:
             messagebox.showerror("Erreur", str(e))
 
     def affecter_film_salle(self):
-        # Affecte un film à une salle après affichage des listes
-        films = self.gestion_films.lister_films()
-        salles = self.gestion_salles.lister_salles()
-        if not films:
+        # Affecte un film (cherché par une partie de son titre) à une salle
+        if not self.gestion_films.films():
             messagebox.showinfo("Info", "Aucun film disponible à affecter.")
             return
-        if not salles:
+        if not self.gestion_salles.salles():
             messagebox.showinfo("Info", "Aucune salle disponible pour l'affectation.")
             return
-        films_str = "\n".join(str(f) for f in films)
-        salles_str = "\n".join(str(s) for s in salles)
-        messagebox.showinfo("Films existants", f"Films enregistrés :\n{films_str}")
-        messagebox.showinfo("Salles existantes", f"Salles enregistrées :\n{salles_str}")
+        film = self._choisir_film("Affecter Film")
+        if film is None:
+            return
+        titre = film.titre
+        messagebox.showinfo("Salles existantes", f"Salles enregistrées :\n{self._apercu_salles()}")
         numero = simpledialog.askinteger("Affecter Film", "Numéro de la salle:")
-        titre = simpledialog.askstring("Affecter Film", "Titre du film:")
         try:
-            film = self.gestion_films.get_film(titre)
             try:
                 salle = self.gestion_salles.get_salle(numero)
             except Exception:
                 messagebox.showerror("Erreur", f"La salle {numero} n'existe pas.")
                 return
-            salle.affecter_film(film)
+            self.gestion_salles.affecter_film_a_salle(salle.numero, film)
             messagebox.showinfo("Succès", f"Film '{titre}' affecté à la salle {numero}")
         except FilmInexistantError:
             messagebox.showerror("Erreur", f"Le film '{titre}' n'existe pas.")
@@ -626,20 +618,17 @@ class CinemaApp:
             messagebox.showerror("Erreur", str(e))
 
     def creer_seance(self):
-        # Crée une séance après affichage des films et salles
-        films = self.gestion_films.lister_films()
-        salles = self.gestion_salles.lister_salles()
-        if not films:
+        # Crée une séance : film cherché par une partie de son titre, puis salle et horaire
+        if not self.gestion_films.films():
             messagebox.showinfo("Info", "Aucun film disponible pour créer une séance.")
             return
-        if not salles:
+        if not self.gestion_salles.salles():
             messagebox.showinfo("Info", "Aucune salle disponible pour créer une séance.")
             return
-        films_str = "\n".join(str(f) for f in films)
-        salles_str = "\n".join(str(s) for s in salles)
-        messagebox.showinfo("Films existants", f"Films enregistrés :\n{films_str}")
-        messagebox.showinfo("Salles existantes", f"Salles enregistrées :\n{salles_str}")
-        titre = simpledialog.askstring("Créer Séance", "Titre du film:")
+        film = self._choisir_film("Créer Séance")
+        if film is None:
+            return
+        messagebox.showinfo("Salles existantes", f"Salles enregistrées :\n{self._apercu_salles()}")
         try:
             numero = simpledialog.askinteger("Créer Séance", "Numéro de la salle:")
             if numero is None or numero <= 0:
@@ -649,19 +638,95 @@ class CinemaApp:
             return
         horaire = simpledialog.askstring("Créer Séance", "Horaire (ex: 2025-12-31 20:00):")
         try:
-            film = self.gestion_films.get_film(titre)
             salle = self.gestion_salles.get_salle(numero)
             seance = self.gestion_seances.creer_seance(film, salle, horaire)
             messagebox.showinfo("Succès", f"Séance créée: {seance}")
         except Exception as e:
             messagebox.showerror("Erreur", str(e))
 
+    def _choisir_film(self, titre_fenetre):
+        # Demande une partie du titre (sans accents ni majuscules, fautes de frappe tolérées)
+        # et fait choisir parmi les films trouvés ; None si aucun ou annulé
+        saisie = simpledialog.askstring(titre_fenetre, "Titre du film (ou une partie):")
+        if not saisie:
+            return None
+        if self.gestion_films.existe_film(saisie):
+            return self.gestion_films.get_film(saisie)
+        trouves = self.index_films.chercher(saisie, limite=TAILLE_APERCU)
+        if not trouves:
+            messagebox.showerror("Erreur", f"Aucun film ne correspond à '{saisie}'.")
+            return None
+        if len(trouves) == 1:
+            film = trouves[0]
+            return film if messagebox.askyesno(titre_fenetre, f"Film trouvé : {film}\nLe choisir ?") else None
+        choix = "\n".join(f"{i}. {f}" for i, f in enumerate(trouves, 1))
+        i = simpledialog.askinteger(titre_fenetre, f"Films trouvés :\n{choix}\n\nNuméro du film:",
+                                    minvalue=1, maxvalue=len(trouves))
+        return None if i is None else trouves[i - 1]
+
+    def _apercu_salles(self):
+        salles = self.gestion_salles
+        page = salles.chercher_salles(cle=lambda s: s.numero, limite=TAILLE_APERCU)
+        return self._apercu(page, len(salles.salles()))
+
+    @staticmethod
+    def _apercu(page, total):
+        lignes = "\n".join(str(e) for e in page)
+        if total > len(page):
+            lignes += f"\n... et {total - len(page)} autres"
+        return lignes
+
+    def programmer_semaine(self):
+        # Génère d'un coup les séances de toutes les salles (ouverture, durée des films, nettoyage)
+        films = self.gestion_films.lister_films()
+        salles = self.gestion_salles.lister_salles()
+        if not films or not salles:
+            messagebox.showinfo("Info", "Il faut au moins un film et une salle pour programmer des séances.")
+            return
+        debut = simpledialog.askstring("Programmer", "Premier jour (AAAA-MM-JJ):", initialvalue=lundi_suivant().isoformat())
+        if not debut:
+            return
+        nb_jours = simpledialog.askinteger("Programmer", "Nombre de jours:", initialvalue=7, minvalue=1)
+        if not nb_jours:
+            return
+        try:
+            ignorees = []
+            seances = programmer(self.gestion_seances, films, salles, date.fromisoformat(debut), nb_jours, ignorees=ignorees)
+            message = f"{len(seances)} séances programmées dans {len(salles)} salles."
+            if ignorees:
+                message += f"\n{len(ignorees)} séances non programmées (salle déjà occupée), dont :\n" + "\n".join(
+                    f"- Salle {salle.numero}, {horaire} : {film.titre}" for film, salle, horaire in ignorees[:10])
+            messagebox.showinfo("Succès", message)
+        except Exception as e:
+            messagebox.showerror("Erreur", str(e))
+
+    def afficher_statistiques(self):
+        # Taux de remplissage et meilleures ventes, calculés sur un export en colonnes des séances
+        table = TableSeances.depuis_gestion(self.gestion_seances)
+        if not len(table):
+            messagebox.showinfo("Info", "Aucune séance programmée.")
+            return
+        compteurs = self.gestion_seances.compteurs
+        vendues, offertes = compteurs.total()
+        aujourd_hui = date.today().isoformat()
+        resume = (f"Places vendues : {vendues}/{offertes}\n"
+                  f"Aujourd'hui : {compteurs.ventes('jour', aujourd_hui)} places "
+                  f"({compteurs.remplissage('jour', aujourd_hui):.0%})")
+        top = "\n".join(f"{titre} : {n} places" for titre, n in meilleures_ventes(table, 5))
+        salles = "\n".join(f"Salle {num} : {t:.0%}" for num, t in sorted(remplissage(table, 'salle').items()))
+        creneaux = "\n".join(f"{h}h : {t:.0%}" for h, t in sorted(remplissage(table, 'creneau').items()))
+        messagebox.showinfo("Statistiques", f"{resume}\n\nMeilleures ventes :\n{top}\n\nRemplissage par salle :\n{salles}"
+                                            f"\n\nRemplissage par créneau :\n{creneaux}")
+
 def main():
     # Lance l'application graphique avec une fenêtre élargie
     root = tk.Tk()
     root.geometry("1200x700")  # Largeur x Hauteur
     app = CinemaApp(root)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        app.stockage.fermer()
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,228 @@
+"""
+Module : import_films
+Fonction : import en flux de catalogues de films (CSV) volumineux, avec validation et rapport.
+
+Le fichier est lu et traité par lots : la mémoire utilisée ne dépend pas
+de la taille du fichier (hors films importés). La validation peut être répartie sur
+plusieurs processus ; chaque ligne rejetée est conservée avec la raison du rejet.
+"""
+
+import collections
+import csv
+import gc
+import itertools
+import multiprocessing
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from film import Film, GestionFilms
+
+
+COLONNES_OBLIGATOIRES = ('titre', 'duree')
+TAILLE_LOT = 10_000     # lignes validées (et envoyées à un processus) par lot
+MAX_REJETS = 10_000     # lignes rejetées conservées dans le rapport (les suivantes sont seulement comptées)
+
+# Le ramasse-miettes est global au processus : le premier import qui le suspend note son état,
+# le dernier à se terminer le rétablit (imports concurrents depuis plusieurs threads).
+_verrou_gc = threading.Lock()
+_imports_en_cours = 0
+_gc_actif = True
+
+
+@dataclass
+class LigneRejetee:
+    """Ligne du fichier refusée à l'import, avec la raison du refus."""
+    numero: int  # numéro de ligne dans le fichier (l'en-tête est la ligne 1)
+    valeurs: List[str]
+    raison: str
+
+    def __str__(self) -> str:
+        return f"Ligne {self.numero} : {self.raison}"
+
+
+@dataclass
+class RapportImport:
+    """Bilan d'un import : compteurs, lignes rejetées et débit."""
+    lues: int = 0
+    ajoutees: int = 0
+    mises_a_jour: int = 0
+    nb_rejetees: int = 0
+    rejetees: List[LigneRejetee] = field(default_factory=list)
+    duree: float = 0.0  # secondes
+
+    @property
+    def lignes_par_seconde(self) -> float:
+        return self.lues / self.duree if self.duree > 0 else 0.0
+
+    def ecrire_rejets(self, chemin: str) -> None:
+        """Écrit les lignes rejetées conservées dans un CSV (numéro, raison, valeurs d'origine)."""
+        with open(chemin, 'w', newline='', encoding='utf-8') as f:
+            w = csv.writer(f)
+            w.writerow(['ligne', 'raison', 'valeurs'])
+            for r in self.rejetees:
+                w.writerow([r.numero, r.raison] + r.valeurs)
+
+    def __str__(self) -> str:
+        return (f"{self.lues} lignes lues : {self.ajoutees} ajoutées, {self.mises_a_jour} mises à jour, "
+                f"{self.nb_rejetees} rejetées ({self.lignes_par_seconde:.0f} lignes/s)")
+
+
+def lire_lots(chemin: str, taille_lot: int = TAILLE_LOT) -> Tuple[List[str], Iterator[Tuple[int, List[List[str]]]]]:
+    """
+    Ouvre un CSV et retourne son en-tête (noms de colonnes normalisés) et un générateur de lots
+    (numéro du premier enregistrement du lot, lignes). Lève ValueError si une colonne obligatoire manque.
+    Les enregistrements sont numérotés comme les lignes du fichier (l'en-tête est le n° 1).
+    """
+    f = open(chemin, newline='', encoding='utf-8-sig')
+    lecteur = csv.reader(f)
+    entete = [c.strip().lower() for c in next(lecteur, [])]
+    manquantes = [c for c in COLONNES_OBLIGATOIRES if c not in entete]
+    if manquantes:
+        f.close()
+        raise ValueError(f"Colonnes obligatoires absentes du fichier {chemin} : {', '.join(manquantes)}.")
+
+    def lots():
+        with f:
+            numero = 2
+            while True:
+                lot = list(itertools.islice(lecteur, taille_lot))  # lecture en C, par blocs
+                if not lot:
+                    return
+                yield numero, lot
+                numero += len(lot)
+    return entete, lots()
+
+
+def valider_lot(entete: List[str], numero: int, lot: List[List[str]]) -> Tuple[List[Tuple[int, Film]], List[LigneRejetee]]:
+    """
+    Valide un lot de lignes ; fonction pure (exécutable dans un autre processus).
+    Retourne les films valides (avec leur numéro de ligne) et les lignes rejetées.
+    """
+    i_titre, i_duree = entete.index('titre'), entete.index('duree')
+    i_genre = entete.index('genre') if 'genre' in entete else None
+    i_affiche = entete.index('affiche') if 'affiche' in entete else None
+    nb_colonnes = len(entete)
+    films, rejets = [], []
+    for n, valeurs in enumerate(lot, numero):
+        if len(valeurs) != nb_colonnes:
+            if valeurs:  # lignes vides ignorées
+                rejets.append(LigneRejetee(n, valeurs, f"{len(valeurs)} colonnes au lieu de {nb_colonnes}"))
+            continue
+        titre = valeurs[i_titre].strip()
+        if not titre:
+            rejets.append(LigneRejetee(n, valeurs, "titre vide"))
+            continue
+        try:
+            duree = int(valeurs[i_duree])
+        except ValueError:
+            rejets.append(LigneRejetee(n, valeurs, f"durée non entière : {valeurs[i_duree]!r}"))
+            continue
+        if duree <= 0:
+            rejets.append(LigneRejetee(n, valeurs, f"durée non strictement positive : {duree}"))
+            continue
+        genre = (valeurs[i_genre].strip() or None) if i_genre is not None else None
+        affiche = (valeurs[i_affiche].strip() or None) if i_affiche is not None else None
+        films.append((n, Film(titre, duree, genre, affiche)))
+    return films, rejets
+
+
+def _valider_en_parallele(pool, lots: Iterable[tuple], en_vol: int) -> Iterator[tuple]:
+    # au plus `en_vol` lots en cours de validation : le fichier n'est pas lu plus vite qu'il n'est importé
+    attente = collections.deque()
+    for lot in lots:
+        attente.append(pool.apply_async(valider_lot, lot))
+        if len(attente) >= en_vol:
+            yield attente.popleft().get()
+    while attente:
+        yield attente.popleft().get()
+
+
+def importer_films(chemin: str, gestion: Optional[GestionFilms] = None, mise_a_jour: bool = True,
+                   taille_lot: int = TAILLE_LOT, processus: int = 0,
+                   rappel: Optional[Callable[[RapportImport], None]] = None,
+                   suspendre_gc: bool = False) -> RapportImport:
+    """
+    Importe un catalogue CSV (colonnes titre, duree et éventuellement genre, affiche) dans `gestion`.
+    `mise_a_jour` : un titre déjà connu met à jour le film (sinon la ligne est rejetée).
+    `processus` : nombre de processus de validation (0 : validation dans le processus courant).
+    `rappel(rapport)` est appelé après chaque lot (suivi de progression).
+    `suspendre_gc` : suspend le ramasse-miettes cyclique pendant l'import (gros catalogues en ligne
+    de commande) ; il l'est alors pour tout le processus, à éviter depuis une application en cours.
+    Lève ValueError si le fichier n'a pas les colonnes obligatoires.
+    """
+    gestion = gestion if gestion is not None else GestionFilms()
+    rapport = RapportImport()
+    debut = time.perf_counter()
+    entete, lots = lire_lots(chemin, taille_lot)
+    taches = ((entete, numero, lot) for numero, lot in lots)
+    pool = multiprocessing.Pool(processus) if processus > 0 else None
+    # des millions d'objets sans cycles : le ramasse-miettes cyclique ne ferait que les reparcourir
+    if suspendre_gc:
+        _suspendre_gc()
+    try:
+        # les lots sont importés dans l'ordre du fichier : la dernière occurrence d'un titre l'emporte
+        if pool is not None:
+            valides = _valider_en_parallele(pool, taches, 2 * processus)
+        else:
+            valides = itertools.starmap(valider_lot, taches)
+        for films, rejets in valides:
+            ajoutes, mis_a_jour, refuses = gestion.fusionner_films([f for _, f in films], mise_a_jour)
+            rapport.lues += len(films) + len(rejets)
+            rapport.ajoutees += ajoutes
+            rapport.mises_a_jour += mis_a_jour
+            for r in rejets:
+                _rejeter(rapport, r)
+            for i in refuses:
+                n, f = films[i]
+                _rejeter(rapport, LigneRejetee(n, [f.titre, str(f.duree), f.genre or '', f.affiche or ''],
+                                               f"le film '{f.titre}' existe déjà"))
+            rapport.duree = time.perf_counter() - debut
+            if rappel is not None:
+                rappel(rapport)
+    finally:
+        if suspendre_gc:
+            _retablir_gc()
+        if pool is not None:
+            pool.terminate()
+        lots.close()
+    rapport.duree = time.perf_counter() - debut
+    return rapport
+
+
+def _suspendre_gc() -> None:
+    global _imports_en_cours, _gc_actif
+    with _verrou_gc:
+        if _imports_en_cours == 0:
+            _gc_actif = gc.isenabled()
+            gc.disable()
+        _imports_en_cours += 1
+
+
+def _retablir_gc() -> None:
+    global _imports_en_cours
+    with _verrou_gc:
+        _imports_en_cours -= 1
+        if _imports_en_cours == 0 and _gc_actif:
+            gc.enable()
+
+
+def _rejeter(rapport: RapportImport, ligne: LigneRejetee) -> None:
+    rapport.nb_rejetees += 1
+    if len(rapport.rejetees) < MAX_REJETS:
+        rapport.rejetees.append(ligne)
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        print("Usage : python import_films.py catalogue.csv [processus]")
+        sys.exit(1)
+    r = importer_films(sys.argv[1], processus=int(sys.argv[2]) if len(sys.argv) > 2 else 0,
+                       rappel=lambda r: print(f"  {r.lues} lignes ({r.lignes_par_seconde:.0f}/s)", end='\r'),
+                       suspendre_gc=True)
+    print()
+    print(r)
+    for rejet in r.rejetees[:20]:
+        print(" -", rejet)
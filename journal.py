@@ -0,0 +1,274 @@
+"""
+Module : journal
+Fonction : journal des réservations en ajout seul, avec instantanés périodiques et rejeu.
+
+Chaque réservation, annulation, création ou suppression de séance ajoute une ligne au journal :
+    S <id> <titre> <salle> <horaire>     création de séance
+    D <id>                               suppression de séance (et de ses réservations)
+    R <id> <place> <client>              réservation
+    A <id> <place> <client>              annulation
+(champs séparés par des tabulations). Un instantané (snapshot.json) fige l'état de
+GestionSeances et indique à partir de quel fichier de journal rejouer ; au redémarrage
+on recharge l'instantané puis on rejoue la fin du journal.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import List, Optional
+
+from film import GestionFilms
+from salle import GestionSalles, SalleInexistanteError
+from reservation import GestionSeances, Reservation, SallePleineError, Seance
+from plan_salle import PlaceInexistanteError
+
+
+FICHIER_INSTANTANE = 'snapshot.json'
+FSYNC_TOUS = 100         # fsync toutes les N écritures (0 : jamais, laissé à l'OS)
+INSTANTANE_TOUS = 0      # instantané automatique toutes les N écritures (0 : désactivé)
+
+# erreurs attendues au rejeu d'une entrée (donnée corrompue, place déjà prise ou disparue) : entrée ignorée
+_ERREURS_REJEU = (ValueError, IndexError, SallePleineError, PlaceInexistanteError)
+
+_log = logging.getLogger(__name__)
+
+
+def _echapper(texte: str) -> str:
+    return texte.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+
+def _desechapper(texte: str) -> str:
+    if '\\' not in texte:
+        return texte
+    res, i = [], 0
+    while i < len(texte):
+        c = texte[i]
+        if c == '\\' and i + 1 < len(texte):
+            i += 1
+            c = {'t': '\t', 'n': '\n'}.get(texte[i], texte[i])
+        res.append(c)
+        i += 1
+    return ''.join(res)
+
+
+class JournalReservations:
+    """
+    Journal en ajout seul, branché comme écouteur sur GestionSeances.
+    Les écritures passent par un tampon ; `fsync_tous` règle la fréquence des fsync
+    (compromis durabilité / débit).
+    """
+
+    def __init__(self, dossier: str, fsync_tous: int = FSYNC_TOUS, instantane_tous: int = INSTANTANE_TOUS):
+        self.dossier = dossier
+        self.fsync_tous = fsync_tous
+        self.instantane_tous = instantane_tous
+        os.makedirs(dossier, exist_ok=True)
+        self._verrou = threading.RLock()
+        # un seul instantané à la fois ; jamais pris avec self._verrou ni depuis un écouteur
+        self._verrou_instantane = threading.Lock()
+        self._fil_instantane: Optional[threading.Thread] = None
+        self._gestion: Optional[GestionSeances] = None
+        self._non_synchro = 0
+        self._depuis_instantane = 0
+        generations = self._generations()
+        self._generation = generations[-1] if generations else 1
+        self._fichier = open(self._chemin_journal(self._generation), 'a', encoding='utf-8')
+
+    # --- fichiers ---
+
+    def _chemin_journal(self, generation: int) -> str:
+        return os.path.join(self.dossier, f"journal.{generation:06d}.log")
+
+    def _generations(self) -> List[int]:
+        gens = []
+        for nom in os.listdir(self.dossier):
+            if nom.startswith('journal.') and nom.endswith('.log'):
+                try:
+                    gens.append(int(nom[len('journal.'):-len('.log')]))
+                except ValueError:
+                    pass
+        return sorted(gens)
+
+    # --- écriture ---
+
+    def _ecrire(self, ligne: str) -> None:
+        with self._verrou:
+            self._fichier.write(ligne)
+            self._non_synchro += 1
+            if self.fsync_tous and self._non_synchro >= self.fsync_tous:
+                self.synchroniser()
+            self._depuis_instantane += 1
+            if (self.instantane_tous and self._gestion is not None and self._depuis_instantane >= self.instantane_tous
+                    and self._fil_instantane is None):
+                # appelé comme écouteur, verrou de la séance tenu : l'instantané (qui verrouille
+                # les séances) est pris dans un autre fil, une fois ce verrou relâché
+                self._depuis_instantane = 0
+                self._fil_instantane = threading.Thread(target=self._instantane_auto, daemon=True)
+                self._fil_instantane.start()
+
+    def _instantane_auto(self) -> None:
+        try:
+            self.instantane(self._gestion)
+        finally:
+            with self._verrou:
+                self._fil_instantane = None
+
+    def synchroniser(self) -> None:
+        """Vide le tampon et force l'écriture sur disque (fsync)."""
+        with self._verrou:
+            self._fichier.flush()
+            os.fsync(self._fichier.fileno())
+            self._non_synchro = 0
+
+    def fermer(self) -> None:
+        """Attend l'instantané en cours, synchronise et ferme le journal."""
+        fil = self._fil_instantane
+        if fil is not None:
+            fil.join()
+        with self._verrou:
+            self.synchroniser()
+            self._fichier.close()
+
+    def attacher(self, gestion: GestionSeances) -> None:
+        """Branche le journal sur GestionSeances (et active les instantanés automatiques)."""
+        self._gestion = gestion
+        gestion.ajouter_ecouteur(self)
+
+    # --- écouteurs de GestionSeances ---
+
+    def seance_creee(self, seance: Seance) -> None:
+        self._ecrire(f"S\t{seance.id}\t{_echapper(seance.film.titre)}\t{seance.salle.numero}\t{_echapper(seance.horaire)}\n")
+
+    def seance_supprimee(self, seance: Seance) -> None:
+        self._ecrire(f"D\t{seance.id}\n")
+
+    def reservation_ajoutee(self, seance: Seance, r: Reservation) -> None:
+        self._ecrire(f"R\t{r.seance_id}\t{r.place}\t{_echapper(r.client_nom)}\n")
+
+    def reservation_annulee(self, seance: Seance, r: Reservation) -> None:
+        self._ecrire(f"A\t{r.seance_id}\t{r.place}\t{_echapper(r.client_nom)}\n")
+
+    # --- instantanés ---
+
+    def instantane(self, gestion: GestionSeances) -> None:
+        """
+        Fige l'état de toutes les séances. Le journal passe à une nouvelle génération :
+        l'instantané couvre les générations précédentes, qui sont ensuite supprimées.
+        """
+        with self._verrou_instantane:
+            # 1. nouvelle génération : ce qui suit sera rejoué par-dessus l'instantané
+            with self._verrou:
+                self.synchroniser()
+                self._fichier.close()
+                anciennes = self._generations()
+                self._generation += 1
+                generation = self._generation
+                self._fichier = open(self._chemin_journal(generation), 'a', encoding='utf-8')
+                self._depuis_instantane = 0
+            # 2. état des séances, sans tenir le verrou du journal : une réservation en cours tient
+            # le verrou de sa séance puis celui du journal, l'instantané ne les prend jamais en sens inverse.
+            # Les opérations écrites dans la nouvelle génération pendant ce relevé peuvent y figurer
+            # déjà : leur rejeu est sans effet (place déjà réservée par le même client, séance connue).
+            etat = {
+                'journal': generation,
+                'seances': [
+                    [s.id, s.film.titre, s.salle.numero, s.horaire,
+                     [[r.place, r.client_nom] for r in s.lister_reservations()]]
+                    for s in gestion.lister_seances()
+                ],
+            }
+            chemin = os.path.join(self.dossier, FICHIER_INSTANTANE)
+            with open(chemin + '.part', 'w', encoding='utf-8') as f:
+                json.dump(etat, f, ensure_ascii=False, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(chemin + '.part', chemin)
+            # l'instantané est en place : les anciennes générations ne servent plus
+            for g in anciennes:
+                if g < generation:
+                    os.remove(self._chemin_journal(g))
+
+
+def restaurer(dossier: str, films: GestionFilms, salles: GestionSalles,
+              ignorees: Optional[List[str]] = None) -> GestionSeances:
+    """
+    Reconstruit GestionSeances : chargement de l'instantané puis rejeu du journal.
+    Les séances dont le film ou la salle n'existe plus sont ignorées, ainsi que leurs réservations.
+    Les entrées du journal et les réservations de l'instantané illisibles ou impossibles à rejouer
+    sont ignorées : chacune est ajoutée à `ignorees` ("fichier:ligne : raison", ou
+    "snapshot.json:séance : raison") et leur nombre est signalé par le module logging.
+    Toute autre erreur (bogue) est propagée.
+    """
+    if ignorees is None:
+        ignorees = []
+    deja_ignorees = len(ignorees)
+    gestion = GestionSeances()
+    seances = {}  # id -> séance restaurée
+    premiere_generation = 1
+    chemin = os.path.join(dossier, FICHIER_INSTANTANE)
+    if os.path.exists(chemin):
+        with open(chemin, encoding='utf-8') as f:
+            etat = json.load(f)
+        premiere_generation = etat['journal']
+        for sid, titre, numero, horaire, reservations in etat['seances']:
+            seance = _restaurer_seance(gestion, seances, films, salles, sid, titre, numero, horaire)
+            if seance is None:
+                continue
+            for place, client in reservations:
+                try:
+                    seance.reserver(client, place)
+                except _ERREURS_REJEU as e:
+                    ignorees.append(f"{FICHIER_INSTANTANE}:{sid} : {e}")
+    if not os.path.isdir(dossier):
+        return gestion
+    for nom in sorted(os.listdir(dossier)):
+        if not (nom.startswith('journal.') and nom.endswith('.log')):
+            continue
+        try:
+            generation = int(nom[len('journal.'):-len('.log')])
+        except ValueError:
+            continue
+        if generation < premiere_generation:
+            continue
+        with open(os.path.join(dossier, nom), encoding='utf-8') as f:
+            for num, ligne in enumerate(f, 1):
+                if not ligne.endswith('\n'):
+                    break  # dernière ligne incomplète (arrêt brutal pendant l'écriture)
+                champs = ligne[:-1].split('\t')
+                try:
+                    if champs[0] == 'R':
+                        seance = seances.get(int(champs[1]))
+                        client = _desechapper(champs[3])
+                        # déjà dans l'instantané (écrite pendant qu'il était pris) : rien à rejouer
+                        if seance is not None and seance.client_de(champs[2]) != client:
+                            seance.reserver(client, champs[2])
+                    elif champs[0] == 'A':
+                        seance = seances.get(int(champs[1]))
+                        if seance is not None:
+                            seance.annuler_reservation(_desechapper(champs[3]), champs[2])
+                    elif champs[0] == 'D':
+                        if seances.pop(int(champs[1]), None) is not None:
+                            gestion.supprimer_seance(int(champs[1]))
+                    elif champs[0] == 'S':
+                        _restaurer_seance(gestion, seances, films, salles, int(champs[1]),
+                                          _desechapper(champs[2]), int(champs[3]), _desechapper(champs[4]))
+                    else:
+                        raise ValueError(f"type d'entrée inconnu {champs[0]!r}")
+                except _ERREURS_REJEU as e:
+                    ignorees.append(f"{nom}:{num} : {e}")
+    if len(ignorees) > deja_ignorees:
+        _log.warning("%d entrées du journal %s ignorées (première : %s)",
+                     len(ignorees) - deja_ignorees, dossier, ignorees[deja_ignorees])
+    return gestion
+
+
+def _restaurer_seance(gestion, seances, films, salles, sid, titre, numero, horaire) -> Optional[Seance]:
+    if sid in seances or not films.existe_film(titre):
+        return None
+    try:
+        salle = salles.get_salle(numero)
+        seances[sid] = gestion.creer_seance(films.get_film(titre), salle, horaire, seance_id=sid, verifier=False)
+    except (SalleInexistanteError, ValueError):
+        return None  # salle supprimée ou horaire illisible
+    return seances[sid]
@@ -0,0 +1,230 @@
+"""
+Module : plan_salle
+Fonction : géométrie compacte d'une salle (places indexées par rangée et colonne).
+
+Les rangées sont étiquetées A..Z, puis AA, AB.. AZ, BA.. (comme les colonnes d'un tableur),
+les places par leur numéro de colonne : 'A1', 'B7', 'AC12'.
+Une disposition peut comporter des allées (entre deux colonnes) et des emplacements
+sans siège ; les places restent indexées de 0 à capacite-1, rangée par rangée.
+"""
+
+import string
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Tuple
+
+
+COLONNES_PAR_DEFAUT = 12  # nombre de colonnes par défaut
+CAPACITE_MAX = 1 << 20    # places par salle au plus (une place se code avec son n° de séance sur 64 bits)
+PLANS_PARTAGES = 256      # plans (capacité, disposition) gardés en cache, chaque salle gardant aussi le sien
+
+
+class PlaceInexistanteError(Exception):
+    """Exception levée si une étiquette ne correspond à aucune place de la salle."""
+    pass
+
+
+def etiquette_rangee(i: int) -> str:
+    """Étiquette de la rangée d'indice i : 0 -> 'A', 25 -> 'Z', 26 -> 'AA', 27 -> 'AB'..."""
+    lettres = ""
+    i += 1
+    while i:
+        i, reste = divmod(i - 1, 26)
+        lettres = string.ascii_uppercase[reste] + lettres
+    return lettres
+
+
+def indice_rangee(lettres: str) -> int:
+    """Indice d'une étiquette de rangée ('A' -> 0, 'AA' -> 26), lève ValueError si invalide."""
+    if not lettres or any(c not in string.ascii_uppercase for c in lettres):
+        raise ValueError(f"Rangée invalide : {lettres!r}.")
+    i = 0
+    for c in lettres:
+        i = i * 26 + ord(c) - 64
+    return i - 1
+
+
+# étiquettes des rangées A..ZZ précalculées (les étiquettes plus longues sont calculées)
+_ETIQUETTES = [etiquette_rangee(i) for i in range(26 * 27)]
+_INDICES = {e: i for i, e in enumerate(_ETIQUETTES)}
+
+
+def _decouper(place: str) -> Tuple[int, int]:
+    # 'AB12' -> (indice de rangée, indice de colonne), ValueError si l'étiquette est mal formée
+    if not isinstance(place, str):
+        raise ValueError(place)
+    lettres = place.rstrip(string.digits)
+    numero = place[len(lettres):]
+    if not numero:
+        raise ValueError(place)
+    i = _INDICES.get(lettres)
+    return (i if i is not None else indice_rangee(lettres)), int(numero) - 1
+
+
+@dataclass(frozen=True)
+class Disposition:
+    """
+    Disposition des places d'une salle, immuable (donc partageable entre salles) :
+    `colonnes` places par rangée, une allée après chaque colonne dont le numéro est
+    dans `allees`, et des emplacements sans siège (`absentes`, ex: {'A1', 'A12'}).
+    Le nombre de rangées découle de la capacité de la salle.
+    """
+    colonnes: int = COLONNES_PAR_DEFAUT
+    allees: Tuple[int, ...] = ()
+    absentes: FrozenSet[str] = frozenset()
+
+    def __post_init__(self):
+        if self.colonnes <= 0:
+            raise ValueError("Le nombre de colonnes doit être strictement positif.")
+        if any(not 1 <= a < self.colonnes for a in self.allees):
+            raise ValueError(f"Allées invalides : {self.allees} (entre 1 et {self.colonnes - 1}).")
+        for place in self.absentes:
+            try:
+                _, j = _decouper(place)
+            except ValueError:
+                raise ValueError(f"Emplacement invalide : {place!r}.")
+            if not 0 <= j < self.colonnes:
+                raise ValueError(f"Emplacement invalide : {place!r}.")
+
+
+DISPOSITION_PAR_DEFAUT = Disposition()
+
+
+class PlanSalle:
+    """
+    Décrit la disposition des places d'une salle : capacité, rangées, colonnes, allées.
+    Aucune étiquette n'est stockée : 'B7' <-> index est calculé à la demande,
+    ce qui permet d'indexer un bytearray d'occupation par place.
+    Sans emplacement vide, l'index vaut rangée * colonnes + colonne ; sinon le début
+    de chaque rangée et la colonne de chaque place sont gardés dans deux tableaux compacts.
+    """
+
+    def __init__(self, capacite: int, colonnes: int = COLONNES_PAR_DEFAUT,
+                 allees: Tuple[int, ...] = (), absentes: FrozenSet[str] = frozenset()):
+        if not 0 < capacite <= CAPACITE_MAX:
+            raise ValueError(f"La capacité d'une salle doit être comprise entre 1 et {CAPACITE_MAX}.")
+        self.capacite = capacite
+        self.colonnes = colonnes
+        self.allees = tuple(sorted(set(allees)))
+        # début de chaque rangée (+ capacité) et colonne de chaque place ; None si salle régulière
+        self._debuts: Optional[array] = None
+        self._colonnes_places: Optional[array] = None
+        vides = {_decouper(p) for p in absentes}
+        if not vides:
+            self.lignes = max(1, capacite // colonnes + (1 if capacite % colonnes else 0))
+        else:
+            debuts, cols = array('I'), array('H')
+            i = 0
+            while len(cols) < capacite:
+                debuts.append(len(cols))
+                for j in range(colonnes):
+                    if (i, j) not in vides and len(cols) < capacite:
+                        cols.append(j)
+                i += 1
+            debuts.append(capacite)
+            self.lignes = i
+            self._debuts, self._colonnes_places = debuts, cols
+        # places adjacentes (sans allée ni emplacement vide entre elles), par rangée
+        self._segments: List[Tuple[Tuple[int, int], ...]] = [self._calculer_segments(i) for i in range(self.lignes)]
+
+    def _calculer_segments(self, i: int) -> Tuple[Tuple[int, int], ...]:
+        debut, fin = self.bornes_rangee(i)
+        coupures = set(self.allees)
+        segments, d = [], debut
+        for idx in range(debut + 1, fin):
+            j_prec, j = self._colonne(idx - 1), self._colonne(idx)
+            if j != j_prec + 1 or j in coupures:
+                segments.append((d, idx))
+                d = idx
+        if d < fin:
+            segments.append((d, fin))
+        return tuple(segments)
+
+    def _colonne(self, idx: int) -> int:
+        if self._colonnes_places is None:
+            return idx % self.colonnes
+        return self._colonnes_places[idx]
+
+    def index(self, place: str) -> int:
+        """Retourne l'index (0..capacite-1) d'une place à partir de son étiquette."""
+        return self._localiser(place)[2]
+
+    def _localiser(self, place: str) -> Tuple[int, int, int]:
+        # (rangée, colonne, index) d'une étiquette ; chemin court pour une salle régulière
+        try:
+            i, j = _decouper(place)
+        except ValueError:
+            raise PlaceInexistanteError(f"La place {place} n'existe pas.")
+        if 0 <= j < self.colonnes:
+            if self._debuts is None:
+                idx = i * self.colonnes + j
+                if idx < self.capacite:
+                    return i, j, idx
+            elif i < self.lignes:
+                debut, fin = self._debuts[i], self._debuts[i + 1]
+                idx = bisect_left(self._colonnes_places, j, debut, fin)
+                if idx < fin and self._colonnes_places[idx] == j:
+                    return i, j, idx
+        raise PlaceInexistanteError(f"La place {place} n'existe pas.")
+
+    def rangee_de(self, idx: int) -> int:
+        """Retourne l'indice de la rangée de la place d'index donné."""
+        if self._debuts is None:
+            return idx // self.colonnes
+        return bisect_right(self._debuts, idx) - 1
+
+    def etiquette(self, idx: int) -> str:
+        """Retourne l'étiquette (ex: 'B7') de la place d'index donné."""
+        if self._debuts is None:
+            i, j = divmod(idx, self.colonnes)
+        else:
+            i, j = self.rangee_de(idx), self._colonnes_places[idx]
+        return f"{_ETIQUETTES[i] if i < len(_ETIQUETTES) else etiquette_rangee(i)}{j + 1}"
+
+    def bornes_rangee(self, i: int) -> Tuple[int, int]:
+        """Retourne les index [début, fin[ des places de la rangée i."""
+        if self._debuts is None:
+            debut = i * self.colonnes
+            return debut, min(debut + self.colonnes, self.capacite)
+        return self._debuts[i], self._debuts[i + 1]
+
+    def segments(self, i: int) -> Tuple[Tuple[int, int], ...]:
+        """Index [début, fin[ des blocs de places côte à côte de la rangée i (coupés par les allées)."""
+        return self._segments[i]
+
+    def rangees(self) -> List[List[str]]:
+        """
+        Génère le plan sous forme de liste de listes d'étiquettes.
+        Calculé à chaque appel, destiné à l'affichage uniquement.
+        """
+        plan = []
+        for i in range(self.lignes):
+            debut, fin = self.bornes_rangee(i)
+            plan.append([self.etiquette(idx) for idx in range(debut, fin)])
+        return plan
+
+    def grille(self) -> List[List[Optional[str]]]:
+        """
+        Plan pour l'affichage, une case par colonne : None pour un emplacement sans siège
+        ou une allée (une case vide est insérée après chaque colonne d'allée).
+        """
+        grille = []
+        for i in range(self.lignes):
+            debut, fin = self.bornes_rangee(i)
+            cases: List[Optional[str]] = [None] * self.colonnes
+            for idx in range(debut, fin):
+                cases[self._colonne(idx)] = self.etiquette(idx)
+            for a in reversed(self.allees):
+                cases.insert(a, None)
+            while cases and cases[-1] is None:
+                cases.pop()
+            grille.append(cases)
+        return grille
+
+
+@lru_cache(maxsize=PLANS_PARTAGES)
+def plan_pour(capacite: int, disposition: Disposition = DISPOSITION_PAR_DEFAUT) -> PlanSalle:
+    """Retourne un PlanSalle partagé pour une capacité et une disposition (immuable, donc partageable)."""
+    return PlanSalle(capacite, disposition.colonnes, disposition.allees, disposition.absentes)
@@ -0,0 +1,98 @@
+"""
+Module : programmation
+Fonction : génération en masse du programme des séances (toutes les salles, plusieurs jours).
+
+Pour chaque salle et chaque jour, les séances s'enchaînent de l'ouverture à la fermeture :
+début arrondi, durée du film (Film.duree), puis temps de nettoyage avant la suivante.
+Une salle ne projette jamais deux séances en même temps. Les calculs se font en minutes
+depuis minuit (entiers) : aucun objet datetime n'est créé par séance.
+"""
+
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+from film import Film
+from salle import Salle
+from reservation import GestionSeances, Seance
+
+
+OUVERTURE = "10:00"
+FERMETURE = "23:30"   # heure limite de fin des séances
+NETTOYAGE = 15        # minutes entre la fin d'une séance et le début de la suivante
+ARRONDI = 5           # les séances commencent sur un multiple de ARRONDI minutes
+
+_HEURES = [f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60)]  # minute du jour -> "HH:MM"
+
+
+def _minutes(heure: str) -> int:
+    """Convertit "HH:MM" en minutes depuis minuit, lève ValueError si invalide."""
+    try:
+        h, m = heure.split(':')
+        minutes = int(h) * 60 + int(m)
+    except ValueError:
+        raise ValueError(f"Heure invalide : {heure!r} (format HH:MM attendu).")
+    if not 0 <= minutes < 24 * 60 or not 0 <= int(m) < 60:
+        raise ValueError(f"Heure invalide : {heure!r} (format HH:MM attendu).")
+    return minutes
+
+
+def planifier(films: List[Film], salles: List[Salle], debut: date, nb_jours: int = 7,
+              ouverture: str = OUVERTURE, fermeture: str = FERMETURE,
+              nettoyage: int = NETTOYAGE, arrondi: int = ARRONDI) -> List[Tuple[Film, Salle, str]]:
+    """
+    Calcule le programme (film, salle, horaire) de `nb_jours` jours à partir de `debut`.
+    Une salle à laquelle un film est affecté ne projette que ce film ; les autres projettent
+    un film par jour, pris à tour de rôle dans `films` (décalé d'une salle à l'autre).
+    """
+    if not films and any(s.film is None for s in salles):
+        raise ValueError("Aucun film à programmer.")
+    if arrondi <= 0 or nettoyage < 0:
+        raise ValueError("L'arrondi doit être strictement positif et le nettoyage positif.")
+    ouv, ferm = _minutes(ouverture), _minutes(fermeture)
+    if ferm <= ouv:
+        raise ValueError("La fermeture doit être postérieure à l'ouverture.")
+    programme = []
+    for j in range(nb_jours):
+        jour = (debut + timedelta(days=j)).isoformat()
+        for i, salle in enumerate(salles):
+            film = salle.film if salle.film is not None else films[(i + j) % len(films)]
+            curseur = ouv
+            while True:
+                depart = -(-curseur // arrondi) * arrondi  # arrondi au multiple supérieur
+                if depart + film.duree > ferm:
+                    break
+                programme.append((film, salle, f"{jour} {_HEURES[depart]}"))
+                curseur = depart + film.duree + nettoyage
+    return programme
+
+
+def programmer(gestion: GestionSeances, films: List[Film], salles: List[Salle], debut: date,
+               nb_jours: int = 7, ouverture: str = OUVERTURE, fermeture: str = FERMETURE,
+               nettoyage: int = NETTOYAGE, arrondi: int = ARRONDI,
+               ignorees: Optional[List[Tuple[Film, Salle, str]]] = None) -> List[Seance]:
+    """
+    Génère le programme (voir `planifier`) et crée toutes les séances d'un coup.
+    Les séances qui chevaucheraient une séance déjà programmée ne sont pas créées :
+    elles sont ajoutées (film, salle, horaire) à la liste `ignorees` si elle est donnée.
+    """
+    programme = planifier(films, salles, debut, nb_jours, ouverture, fermeture, nettoyage, arrondi)
+    return gestion.creer_seances(programme, ignorees=ignorees if ignorees is not None else [])
+
+
+def lundi_suivant(aujourd_hui: Optional[date] = None) -> date:
+    """Retourne la date du prochain lundi (début de semaine de programmation par défaut)."""
+    aujourd_hui = aujourd_hui or date.today()
+    return aujourd_hui + timedelta(days=7 - aujourd_hui.weekday())
+
+
+if __name__ == "__main__":
+    from film import charger_films_csv
+    from salle import salles_par_defaut
+    import os
+
+    films = charger_films_csv(os.path.join(os.path.dirname(os.path.abspath(__file__)), "films_init.csv"))
+    gs = GestionSeances()
+    seances = programmer(gs, films.lister_films(), salles_par_defaut().lister_salles(), lundi_suivant())
+    print(f"{len(seances)} séances programmées")
+    for s in gs.seances_de_salle(1)[:6]:
+        print(" -", s)
@@ -0,0 +1,424 @@
+"""
+Module : recherche
+Fonction : recherche de films par mots du titre (préfixe, fautes de frappe) et filtres genre / durée.
+
+L'index est tenu à jour en écoutant le gestionnaire de films (film_ajoute, film_modifie,
+film_supprime). Les titres sont normalisés (minuscules, sans accents ni ponctuation)
+puis découpés en mots :
+  - mot -> films qui le contiennent ;
+  - vocabulaire trié : les mots commençant par un préfixe forment une tranche contiguë
+    (trouvée par dichotomie), ce qui joue le rôle d'un arbre de préfixes sans un nœud par lettre ;
+  - trigramme -> mots du vocabulaire, pour retrouver un mot mal orthographié ;
+  - genre et tranche de durée -> films, pour partir des films filtrés quand ils sont peu nombreux.
+Le dernier mot saisi est traité comme un préfixe (saisie en cours), les autres comme des mots entiers.
+"""
+
+import heapq
+import itertools
+import math
+import sys
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from film import Film, GestionFilms
+
+
+SEUIL_APPROCHE = 0.5     # similarité minimale (coefficient de Dice sur les trigrammes) d'un mot approché
+MOTS_APPROCHES = 5       # mots du vocabulaire retenus au plus pour un mot mal orthographié
+PREFIXES_MAX = 64        # au-delà, un mot incomplet au milieu de la requête n'est pas développé en préfixe
+TRIGRAMMES_FREQUENTS = 2000  # un trigramme partagé par plus de mots est ignoré s'il en reste de plus rares
+TRANCHE_DUREE = 10       # minutes par tranche de l'index des durées
+FILMS_MOT_FREQUENT = 1000  # un mot présent dans plus de films (le, de, the...) est parcouru après les autres
+COUT_VERIFICATION = 30   # coût (relatif à un test d'appartenance fait en C) de la vérification d'un film en Python
+
+
+_PONCTUATION_ASCII = {c: ' ' for c in range(128) if not chr(c).isalnum()}
+
+
+def normaliser(texte: str) -> str:
+    """Minuscules, sans accents, la ponctuation remplacée par des espaces : "L'Été !" -> "l ete "."""
+    if texte.isascii():
+        return texte.lower().translate(_PONCTUATION_ASCII)
+    decompose = unicodedata.normalize('NFKD', texte.casefold())
+    return ''.join(c if c.isalnum() else ' ' for c in decompose if not unicodedata.combining(c))
+
+
+def mots_de(texte: str) -> List[str]:
+    """Mots normalisés d'un texte."""
+    return normaliser(texte).split()
+
+
+def _trigrammes(mot: str) -> Set[str]:
+    # entouré d'espaces pour que le début et la fin du mot comptent
+    mot = f" {mot} "
+    return {mot[i:i + 3] for i in range(len(mot) - 2)}
+
+
+class IndexFilms:
+    """
+    Index de recherche des films d'un gestionnaire, tenu à jour comme écouteur.
+    Les films sont désignés en interne par un numéro (réutilisé après suppression).
+    """
+
+    def __init__(self, gestion: Optional[GestionFilms] = None):
+        self._films: List[Optional[Film]] = []
+        self._mots: List[Tuple[str, ...]] = []      # mots du titre, par numéro de film
+        self._genres: List[str] = []                # genre normalisé, par numéro de film
+        self._tranches: List[int] = []              # tranche de durée, par numéro de film
+        self._numeros: Dict[str, int] = {}          # titre -> numéro
+        self._libres: List[int] = []
+        self._par_mot: Dict[str, Set[int]] = {}
+        self._par_titre: Dict[Tuple[str, ...], List[int]] = {}  # titre normalisé complet -> numéros
+        self._par_genre: Dict[str, Set[int]] = {}
+        self._par_tranche: Dict[int, Set[int]] = {}
+        self._par_trigramme: Dict[str, Set[str]] = {}
+        self._vocabulaire: List[str] = []
+        self._nb_occurrences = 0                    # nombre total de (mot, film) indexés
+        self._en_attente: Set[str] = set()          # mots nouveaux, pas encore insérés dans le vocabulaire trié
+        if gestion is not None:
+            for film in gestion.films():
+                self.film_ajoute(film)
+            gestion.ajouter_ecouteur(self)
+
+    def __len__(self) -> int:
+        return len(self._numeros)
+
+    # --- écouteur du gestionnaire de films ---
+
+    def film_ajoute(self, film: Film) -> None:
+        if film.titre in self._numeros:
+            self.film_modifie(film)
+            return
+        mots = tuple(self._interner(m) for m in dict.fromkeys(mots_de(film.titre)))
+        genre = normaliser(film.genre or '').strip()
+        tranche = film.duree // TRANCHE_DUREE
+        if self._libres:
+            n = self._libres.pop()
+            self._films[n], self._mots[n], self._genres[n], self._tranches[n] = film, mots, genre, tranche
+        else:
+            n = len(self._films)
+            self._films.append(film)
+            self._mots.append(mots)
+            self._genres.append(genre)
+            self._tranches.append(tranche)
+        self._numeros[film.titre] = n
+        for m in mots:
+            self._par_mot[m].add(n)
+        self._nb_occurrences += len(mots)
+        self._par_titre.setdefault(mots, []).append(n)
+        self._par_genre.setdefault(genre, set()).add(n)
+        self._par_tranche.setdefault(tranche, set()).add(n)
+
+    def film_modifie(self, film: Film) -> None:
+        # le titre ne change pas : seuls le genre, la durée et l'objet peuvent changer
+        n = self._numeros.get(film.titre)
+        if n is None:
+            self.film_ajoute(film)
+            return
+        self._films[n] = film
+        genre = normaliser(film.genre or '').strip()
+        if genre != self._genres[n]:
+            self._retirer_de(self._par_genre, self._genres[n], n)
+            self._par_genre.setdefault(genre, set()).add(n)
+            self._genres[n] = genre
+        tranche = film.duree // TRANCHE_DUREE
+        if tranche != self._tranches[n]:
+            self._retirer_de(self._par_tranche, self._tranches[n], n)
+            self._par_tranche.setdefault(tranche, set()).add(n)
+            self._tranches[n] = tranche
+
+    def film_supprime(self, titre: str) -> None:
+        n = self._numeros.pop(titre, None)
+        if n is None:
+            return
+        mots = self._mots[n]
+        self._nb_occurrences -= len(mots)
+        for m in mots:
+            self._retirer_de(self._par_mot, m, n)
+            if m not in self._par_mot:
+                self._oublier_mot(m)
+        homonymes = self._par_titre[mots]
+        homonymes.remove(n)
+        if not homonymes:
+            del self._par_titre[mots]
+        self._retirer_de(self._par_genre, self._genres[n], n)
+        self._retirer_de(self._par_tranche, self._tranches[n], n)
+        self._films[n], self._mots[n], self._genres[n] = None, (), ''
+        self._libres.append(n)
+
+    # --- vocabulaire ---
+
+    def _interner(self, mot: str) -> str:
+        # un seul objet str par mot, partagé par tous les titres ; crée le mot au besoin
+        mot = sys.intern(mot)
+        if mot not in self._par_mot:
+            self._par_mot[mot] = set()
+            self._en_attente.add(mot)
+            for g in _trigrammes(mot):
+                self._par_trigramme.setdefault(g, set()).add(mot)
+        return mot
+
+    def _oublier_mot(self, mot: str) -> None:
+        if mot in self._en_attente:
+            self._en_attente.discard(mot)
+        else:
+            i = bisect_left(self._vocabulaire, mot)
+            if i < len(self._vocabulaire) and self._vocabulaire[i] == mot:
+                del self._vocabulaire[i]
+        for g in _trigrammes(mot):
+            mots = self._par_trigramme[g]
+            mots.discard(mot)
+            if not mots:
+                del self._par_trigramme[g]
+
+    @staticmethod
+    def _retirer_de(index: Dict, cle, n: int) -> None:
+        numeros = index[cle]
+        numeros.discard(n)
+        if not numeros:
+            del index[cle]
+
+    def _vocabulaire_trie(self) -> List[str]:
+        # les mots nouveaux sont insérés à la première recherche qui suit (tri complet après un import)
+        if self._en_attente:
+            if len(self._en_attente) < 1000:
+                for mot in self._en_attente:
+                    insort(self._vocabulaire, mot)
+            else:
+                self._vocabulaire = sorted(self._par_mot)
+            self._en_attente.clear()
+        return self._vocabulaire
+
+    def _bornes_prefixe(self, debut: str) -> Tuple[int, int]:
+        # tranche [i, j) du vocabulaire trié des mots commençant par `debut` (non vide), par dichotomie
+        vocabulaire = self._vocabulaire_trie()
+        i = bisect_left(vocabulaire, debut)
+        return i, bisect_left(vocabulaire, debut[:-1] + chr(ord(debut[-1]) + 1), i)
+
+    def _prefixes(self, debut: str) -> Iterator[str]:
+        """Mots du vocabulaire commençant par `debut`, dans l'ordre alphabétique (le mot exact en premier)."""
+        i, j = self._bornes_prefixe(debut)
+        vocabulaire = self._vocabulaire
+        for k in range(i, j):
+            yield vocabulaire[k]
+
+    def _prolongements(self, debut: str) -> Iterator[str]:
+        # ordre de parcours des mots commençant par `debut` : le mot exact, puis les autres par ordre
+        # alphabétique, les plus fréquents (mots vides) en dernier car les plus coûteux à intersecter
+        frequents = []
+        for mot in self._prefixes(debut):
+            if mot != debut and len(self._par_mot[mot]) > FILMS_MOT_FREQUENT:
+                frequents.append(mot)
+            else:
+                yield mot
+        yield from frequents
+
+    def mots_approches(self, mot: str, nombre: int = MOTS_APPROCHES) -> List[str]:
+        """
+        Mots du vocabulaire les plus proches de `mot` (trigrammes communs), du plus proche au moins proche.
+        Les trigrammes trop fréquents sont ignorés s'il en reste d'autres, pour borner le nombre de candidats.
+        """
+        grammes = _trigrammes(mot)
+        listes = [self._par_trigramme[g] for g in grammes if g in self._par_trigramme]
+        rares = [l for l in listes if len(l) <= TRIGRAMMES_FREQUENTS]
+        communs: Counter = Counter()
+        for l in rares or listes:
+            communs.update(l)
+        if rares and len(rares) < len(listes):
+            # un candidat n'a été compté que sur les trigrammes rares : on complète par les fréquents
+            frequents = [l for l in listes if len(l) > TRIGRAMMES_FREQUENTS]
+            for c in communs:
+                communs[c] += sum(1 for l in frequents if c in l)
+        taille = len(grammes)
+        # un mot qui a k trigrammes en commun en a au moins k : sa note ne dépasse pas 2k / (taille + k),
+        # d'où un nombre minimal de trigrammes communs pour atteindre le seuil
+        minimum = math.ceil(SEUIL_APPROCHE * taille / (2 - SEUIL_APPROCHE) - 1e-9)
+        candidats = [(c, k) for c, k in communs.items() if k >= minimum]
+        meilleurs: List[Tuple[float, str]] = []
+        # par nombre de trigrammes communs décroissant, jusqu'à ce que la note ne puisse plus entrer parmi les meilleurs
+        for c, k in sorted(candidats, key=itemgetter(1), reverse=True):
+            borne = 2 * k / (taille + k)
+            if borne < SEUIL_APPROCHE or (len(meilleurs) == nombre and borne < meilleurs[0][0]):
+                break
+            note = (2 * k / (taille + len(c)), c)
+            if len(meilleurs) < nombre:
+                heapq.heappush(meilleurs, note)
+            elif note > meilleurs[0]:
+                heapq.heapreplace(meilleurs, note)
+        return [c for note, c in sorted(meilleurs, reverse=True) if note >= SEUIL_APPROCHE]
+
+    # --- recherche ---
+
+    def chercher(self, texte: str = "", genre: Optional[str] = None, duree_min: Optional[int] = None,
+                 duree_max: Optional[int] = None, limite: Optional[int] = 20, approche: bool = True) -> List[Film]:
+        """
+        Films dont le titre contient les mots de `texte` (le dernier peut être incomplet),
+        du genre donné (sans tenir compte des accents ni de la casse) et d'une durée comprise
+        entre `duree_min` et `duree_max` minutes (bornes incluses).
+        Un mot absent du catalogue est remplacé par les mots les plus proches si `approche`.
+        Les titres identiques à la requête viennent en premier, puis ceux qui contiennent le dernier
+        mot entier, puis les autres (dans l'ordre alphabétique du mot qui prolonge le dernier mot,
+        les mots très fréquents comme "le" ou "the" en dernier) ; au plus `limite` films (tous si None).
+        """
+        if limite is not None and limite < 0:
+            raise ValueError("La limite doit être positive.")
+        if limite == 0:
+            return []
+        filtre = self._filtre(genre, duree_min, duree_max)
+        restreints = self._restreints(genre, duree_min, duree_max)
+        mots = mots_de(texte)
+        if not mots:
+            numeros = self._numeros.values() if restreints is None else itertools.chain.from_iterable(restreints)
+            return self._premiers(numeros, filtre, limite)
+        *entiers, dernier = mots
+        ensembles = sorted((self._films_du_mot(m, approche) for m in entiers), key=len)
+        if ensembles and not ensembles[0]:
+            return []
+        requete = tuple(dict.fromkeys(mots))
+        prolongements: Iterable[str] = self._prolongements(dernier)
+        # Plan le moins coûteux : parcourir les films des mots qui prolongent le dernier mot (intersectés
+        # en C avec le plus petit ensemble), ou vérifier un à un les films du plus petit ensemble ou du filtre.
+        sources = [(len(ensembles[0]), ensembles[:1])] if ensembles else []
+        if restreints is not None:
+            sources.append((sum(map(len, restreints)), restreints))
+        if sources:
+            taille, petits = min(sources, key=lambda source: source[0])
+            if not taille:
+                return []
+            if self._cout_prolongements(dernier, ensembles, restreints, limite) > COUT_VERIFICATION * taille:
+                resultats = self._verifier(itertools.chain.from_iterable(petits), ensembles, dernier, requete,
+                                           filtre, limite)
+                if resultats or not approche:
+                    return resultats
+                prolongements = ()
+        resultats: List[Film] = []
+        vus: Set[int] = set()
+        if (self._parcourir([], self._par_titre.get(requete, ()), [], filtre, limite, resultats, vus)
+                or self._parcourir(prolongements, None, ensembles, filtre, limite, resultats, vus)):
+            return resultats
+        if not resultats and approche:
+            self._parcourir(self.mots_approches(dernier), None, ensembles, filtre, limite, resultats, vus)
+        return resultats
+
+    def _cout_prolongements(self, dernier: str, ensembles: List[Set[int]],
+                            restreints: Optional[List[Set[int]]], limite: Optional[int]) -> float:
+        # Coût estimé du parcours des films des mots qui prolongent `dernier` (en unités d'un test
+        # d'appartenance fait en C) : chaque film est intersecté avec le plus petit ensemble, puis les
+        # films retenus sont vérifiés en Python jusqu'à remplir la page, selon la part des films filtrés.
+        nb_films = len(self._numeros) or 1
+        i, j = self._bornes_prefixe(dernier)
+        exact = self._par_mot.get(dernier, ())
+        moyenne = self._nb_occurrences / (len(self._par_mot) or 1)
+        volume = len(exact) + (j - i - (1 if exact else 0)) * moyenne
+        part = len(ensembles[0]) / nb_films if ensembles else 1.0
+        attendus = float('inf')
+        if limite is not None:
+            filtres = sum(map(len, restreints)) if restreints is not None else nb_films
+            attendus = limite * nb_films / max(filtres, 1)
+        return (volume if ensembles else 0) + COUT_VERIFICATION * min(volume * part, attendus)
+
+    def _parcourir(self, mots: Iterable[str], numeros: Optional[Iterable[int]], ensembles: List[Set[int]],
+                   filtre: Optional[Callable[[int], bool]], limite: Optional[int],
+                   resultats: List[Film], vus: Set[int]) -> bool:
+        # Ajoute aux résultats les films de `numeros` puis ceux des `mots` (dans l'ordre) présents dans
+        # tous les ensembles et acceptés par le filtre, chacun une fois ; True dès que la page est complète.
+        premier, autres = (ensembles[0], ensembles[1:]) if ensembles else (None, ())
+        for numeros in itertools.chain([] if numeros is None else [numeros], (self._par_mot[m] for m in mots)):
+            if premier is not None:
+                numeros = premier.intersection(numeros)  # en C, en parcourant le plus petit des deux
+            for n in numeros:
+                if n in vus:
+                    continue
+                vus.add(n)
+                if all(n in e for e in autres) and (filtre is None or filtre(n)):
+                    resultats.append(self._films[n])
+                    if limite is not None and len(resultats) >= limite:
+                        return True
+        return False
+
+    def _verifier(self, numeros: Iterable[int], ensembles: List[Set[int]], dernier: str,
+                  requete: Tuple[str, ...], filtre: Optional[Callable[[int], bool]],
+                  limite: Optional[int]) -> List[Film]:
+        # Vérifie un à un des films peu nombreux, classés dans l'ordre de chercher (titre identique,
+        # dernier mot entier, puis premier mot qui le prolonge dans l'ordre de _prolongements)
+        trouves = []
+        for n in numeros:
+            if not all(n in e for e in ensembles) or (filtre is not None and not filtre(n)):
+                continue
+            mots = self._mots[n]
+            if mots == requete:
+                trouves.append((0, '', n))
+            elif dernier in mots:
+                trouves.append((1, dernier, n))
+            else:
+                prolonges = [(len(self._par_mot[m]) > FILMS_MOT_FREQUENT, m) for m in mots if m.startswith(dernier)]
+                if prolonges:
+                    trouves.append((2, min(prolonges), n))
+        trouves.sort(key=lambda t: t[:2])
+        return [self._films[n] for _, _, n in trouves[:limite]]
+
+    def _films_du_mot(self, mot: str, approche: bool) -> Set[int]:
+        # mot entier de la requête : le mot exact, sinon les mots qui le prolongent (s'ils sont peu nombreux),
+        # sinon les mots approchés
+        if mot in self._par_mot:
+            return self._par_mot[mot]
+        prolongements = []
+        for m in self._prefixes(mot):
+            prolongements.append(m)
+            if len(prolongements) > PREFIXES_MAX:
+                break
+        if not prolongements and approche:
+            prolongements = self.mots_approches(mot)
+        numeros: Set[int] = set()
+        for m in prolongements:
+            numeros.update(self._par_mot[m])
+        return numeros
+
+    def _premiers(self, numeros: Iterable[int], filtre: Optional[Callable[[int], bool]],
+                  limite: Optional[int]) -> List[Film]:
+        resultats = []
+        for n in numeros:
+            if filtre is None or filtre(n):
+                resultats.append(self._films[n])
+                if limite is not None and len(resultats) >= limite:
+                    break
+        return resultats
+
+    def _restreints(self, genre: Optional[str], duree_min: Optional[int],
+                    duree_max: Optional[int]) -> Optional[List[Set[int]]]:
+        # Ensembles de l'index dont la réunion contient tous les films acceptés par le filtre : ceux du genre,
+        # ou ceux des tranches de durée couvrant l'intervalle (bornes vérifiées par le filtre), au plus petit.
+        # None sans filtre.
+        choix = []
+        if genre is not None:
+            numeros = self._par_genre.get(normaliser(genre).strip())
+            choix.append([numeros] if numeros else [])
+        if duree_min is not None or duree_max is not None:
+            bas = (duree_min or 0) // TRANCHE_DUREE
+            haut = duree_max // TRANCHE_DUREE if duree_max is not None else None
+            choix.append([e for t, e in self._par_tranche.items() if t >= bas and (haut is None or t <= haut)])
+        return min(choix, key=lambda ensembles: sum(map(len, ensembles))) if choix else None
+
+    def _filtre(self, genre: Optional[str], duree_min: Optional[int],
+                duree_max: Optional[int]) -> Optional[Callable[[int], bool]]:
+        # filtre sur le numéro d'un film (genre comparé sous forme normalisée)
+        if genre is None and duree_min is None and duree_max is None:
+            return None
+        genre = None if genre is None else normaliser(genre).strip()
+        bas = duree_min if duree_min is not None else 0
+        haut = duree_max if duree_max is not None else float('inf')
+        genres, films = self._genres, self._films
+        return lambda n: (genre is None or genres[n] == genre) and bas <= films[n].duree <= haut
+
+
+if __name__ == "__main__":
+    import os
+    from film import charger_films_csv
+
+    films = charger_films_csv(os.path.join(os.path.dirname(os.path.abspath(__file__)), "films_init.csv"))
+    index = IndexFilms(films)
+    for requete in ("in", "the l", "matrx", "gladiatr"):
+        print(requete, "->", [f.titre for f in index.chercher(requete, limite=5)])
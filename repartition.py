@@ -0,0 +1,306 @@
+"""
+Module : repartition
+Fonction : service de réservation réparti sur plusieurs processus, partitionné par salle.
+
+Chaque processus « shard » charge les films et les salles, mais seulement les séances
+(et réservations) des salles dont il est propriétaire : salle n -> shard n % N.
+Un routeur HTTP reçoit les requêtes de serveur.py et les transmet au shard concerné
+sur une connexion locale (TCP 127.0.0.1, trames binaires numérotées, plusieurs
+requêtes en vol par connexion). Les recherches qui ne visent pas une salle sont
+envoyées à tous les shards et leurs résultats fusionnés par horaire.
+
+Les shards écrivent dans la même base SQLite (mode WAL) : chacun ne modifie que
+les réservations de ses propres séances.
+Lancement : python3 repartition.py [--shards N] [--port 8080]
+"""
+
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sqlite3
+import struct
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit, urlunsplit
+
+from serveur import (CHEMIN_DB, HOTE, INTERVALLE_FLUSH, PORT, ServeurHTTP, ServiceCinema,
+                     _arreter_sur_sigterm, encoder_json, ouvrir_donnees)
+from stockage import StockageSQLite
+
+
+NB_SHARDS = os.cpu_count() or 1
+DELAI_SHARD = 10.0  # secondes d'attente au plus de la réponse d'un shard
+# trames entre routeur et shards
+_REQUETE = struct.Struct('!II')   # n° de requête, longueur de "MÉTHODE chemin\ncorps"
+_REPONSE = struct.Struct('!IHI')  # n° de requête, statut HTTP, longueur du corps JSON
+
+_log = logging.getLogger(__name__)
+
+
+def shard_de_salle(numero: int, nb_shards: int) -> int:
+    """Indice du shard propriétaire des séances d'une salle."""
+    return numero % nb_shards
+
+
+# --- processus shard ---
+
+def _processus_shard(indice: int, nb_shards: int, chemin_db: str, canal) -> None:
+    try:
+        asyncio.run(_servir_shard(indice, nb_shards, chemin_db, canal))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _servir_shard(indice: int, nb_shards: int, chemin_db: str, canal) -> None:
+    stockage = StockageSQLite(chemin_db)
+    try:
+        numeros = {n for n in stockage.numeros_salles() if shard_de_salle(n, nb_shards) == indice}
+        films, salles, seances = stockage.charger(numeros)
+        stockage.attacher(films, salles, seances)
+        seances.suivre(films, salles)
+        service = ServiceCinema(films, salles, seances)
+        serveur = await asyncio.start_server(_connexion_shard(service), '127.0.0.1', 0)
+        canal.send(serveur.sockets[0].getsockname()[1])
+        canal.close()
+        arret = asyncio.Event()
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, arret.set)
+        except (NotImplementedError, AttributeError):
+            pass  # Windows : arrêt par terminate() sans écriture finale
+        while not arret.is_set():
+            try:
+                await asyncio.wait_for(arret.wait(), INTERVALLE_FLUSH)
+            except asyncio.TimeoutError:
+                try:
+                    stockage.flush()
+                except sqlite3.Error as e:
+                    # base partagée par les shards : les modifications restent en attente
+                    _log.warning("Shard %d : écriture dans la base impossible : %s", indice, e)
+        serveur.close()
+    finally:
+        stockage.fermer()
+
+
+def _connexion_shard(service: ServiceCinema):
+    """Traitement d'une connexion du routeur : une réponse par requête, même en cas d'erreur."""
+
+    async def connexion(lecteur: asyncio.StreamReader, ecrivain: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                num, longueur = _REQUETE.unpack(await lecteur.readexactly(_REQUETE.size))
+                tete, _, corps = (await lecteur.readexactly(longueur)).partition(b'\n')
+                try:
+                    methode, chemin = tete.decode('utf-8').split(' ', 1)
+                    statut, objet = service.traiter(methode, chemin, corps)
+                    reponse = encoder_json(objet)
+                except Exception as e:
+                    # une requête en échec ne doit pas couper le lien (partagé par toutes les requêtes)
+                    statut, reponse = HTTPStatus.INTERNAL_SERVER_ERROR, encoder_json({'erreur': f"Erreur interne : {e}"})
+                ecrivain.write(_REPONSE.pack(num, statut, len(reponse)) + reponse)
+                await ecrivain.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass  # routeur déconnecté, ou arrêt du shard
+        finally:
+            ecrivain.close()
+
+    return connexion
+
+
+def lancer_shards(nb_shards: int, chemin_db: str) -> Tuple[List[multiprocessing.Process], List[int]]:
+    """Démarre les processus shards ; retourne les processus et leurs ports locaux."""
+    processus, ports = [], []
+    for i in range(nb_shards):
+        parent, enfant = multiprocessing.Pipe(duplex=False)
+        p = multiprocessing.Process(target=_processus_shard, args=(i, nb_shards, chemin_db, enfant), daemon=True)
+        p.start()
+        enfant.close()
+        processus.append(p)
+        ports.append(parent.recv())
+    return processus, ports
+
+
+# --- routeur ---
+
+class ConnexionShard:
+    """
+    Connexion vers un shard, partagée par toutes les requêtes du routeur :
+    chaque requête porte un numéro et attend la réponse portant le même numéro.
+    Si le lien est rompu, la requête suivante le rouvre (une tentative) ou échoue aussitôt
+    (ConnectionError) ; une réponse qui tarde plus de `delai` secondes lève asyncio.TimeoutError.
+    """
+
+    def __init__(self, port: int, delai: float = DELAI_SHARD):
+        self.port = port
+        self.delai = delai
+        self._compteur = itertools.count()
+        self._en_vol: Dict[int, asyncio.Future] = {}
+        self._ecrivain: Optional[asyncio.StreamWriter] = None
+        self._lecture: Optional[asyncio.Task] = None
+        self._verrou = asyncio.Lock()  # une seule reconnexion à la fois
+
+    async def ouvrir(self) -> None:
+        lecteur, self._ecrivain = await asyncio.open_connection('127.0.0.1', self.port)
+        self._lecture = asyncio.ensure_future(self._lire(lecteur))
+
+    async def _reconnecter(self) -> None:
+        async with self._verrou:
+            if self._lecture is not None and not self._lecture.done():
+                return  # rouverte entre-temps par une autre requête
+            if self._ecrivain is not None:
+                self._ecrivain.close()
+            try:
+                await self.ouvrir()
+            except OSError as e:
+                raise ConnectionError(f"Shard injoignable (port {self.port}) : {e}")
+
+    async def requete(self, methode: str, chemin: str, corps: bytes) -> Tuple[int, bytes]:
+        if self._lecture is None or self._lecture.done():
+            await self._reconnecter()
+        num = next(self._compteur) & 0xFFFFFFFF
+        futur = asyncio.get_running_loop().create_future()
+        self._en_vol[num] = futur
+        try:
+            charge = f"{methode} {chemin}\n".encode('utf-8') + corps
+            self._ecrivain.write(_REQUETE.pack(num, len(charge)) + charge)
+            await self._ecrivain.drain()
+            return await asyncio.wait_for(futur, self.delai)
+        finally:
+            self._en_vol.pop(num, None)
+
+    async def _lire(self, lecteur: asyncio.StreamReader) -> None:
+        erreur = "connexion fermée"
+        try:
+            while True:
+                num, statut, longueur = _REPONSE.unpack(await lecteur.readexactly(_REPONSE.size))
+                corps = await lecteur.readexactly(longueur)
+                futur = self._en_vol.pop(num, None)
+                if futur is not None and not futur.done():
+                    futur.set_result((statut, corps))
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            erreur = str(e) or type(e).__name__
+        finally:
+            # lien rompu : les requêtes en vol échouent, les suivantes rouvriront la connexion
+            for futur in self._en_vol.values():
+                if not futur.done():
+                    futur.set_exception(ConnectionError(f"Shard injoignable : {erreur}"))
+            self._en_vol.clear()
+
+    async def fermer(self) -> None:
+        if self._ecrivain is not None:
+            self._ecrivain.close()
+        if self._lecture is not None:
+            self._lecture.cancel()
+
+
+class RouteurHTTP(ServeurHTTP):
+    """
+    Serveur HTTP frontal : transmet chaque requête au shard propriétaire de la salle.
+    `salle_par_seance` (id de séance -> numéro de salle) est lu une fois au démarrage :
+    le service ne crée pas de séances.
+    """
+
+    def __init__(self, shards: List[ConnexionShard], salle_par_seance: Dict[int, int],
+                 hote: str = HOTE, port: int = PORT):
+        super().__init__(None, hote, port)
+        self.shards = shards
+        self.salle_par_seance = salle_par_seance
+        self._tour = itertools.cycle(shards)
+
+    async def _traiter(self, methode: str, chemin: str, corps: bytes) -> Tuple[int, bytes]:
+        url = urlsplit(chemin)
+        parties = [unquote(p) for p in url.path.strip('/').split('/') if p]
+        try:
+            if len(parties) >= 2 and parties[0] == 'seances':
+                numero = self.salle_par_seance.get(int(parties[1])) if parties[1].isdigit() else None
+                if numero is None:
+                    return HTTPStatus.NOT_FOUND, encoder_json({'erreur': f"La séance #{parties[1]} n'existe pas."})
+                return await self._shard(numero).requete(methode, chemin, corps)
+            if parties == ['seances'] and methode == 'GET':
+                salle = parse_qs(url.query).get('salle', [''])[-1]
+                if salle.isdigit():
+                    return await self._shard(int(salle)).requete(methode, chemin, corps)
+                return await self._diffuser(methode, chemin, corps)
+            # films (identiques dans tous les shards) et routes inconnues : un shard à tour de rôle
+            return await next(self._tour).requete(methode, chemin, corps)
+        except ConnectionError as e:
+            return HTTPStatus.SERVICE_UNAVAILABLE, encoder_json({'erreur': str(e)})
+        except asyncio.TimeoutError:
+            return HTTPStatus.GATEWAY_TIMEOUT, encoder_json({'erreur': "Le shard n'a pas répondu à temps."})
+
+    def _shard(self, numero_salle: int) -> ConnexionShard:
+        return self.shards[shard_de_salle(numero_salle, len(self.shards))]
+
+    async def _diffuser(self, methode: str, chemin: str, corps: bytes) -> Tuple[int, bytes]:
+        # recherche envoyée à tous les shards, résultats (déjà triés) fusionnés par horaire ;
+        # chaque shard renvoie le début de ses résultats, la page est découpée après la fusion
+        url = urlsplit(chemin)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        decalage = params.pop('decalage', '0')
+        limite = params.pop('limite', None)
+        if not decalage.isdigit() or (limite is not None and not limite.isdigit()):
+            return HTTPStatus.BAD_REQUEST, encoder_json({'erreur': "Pagination : entiers positifs attendus."})
+        decalage = int(decalage)
+        fin = None if limite is None else decalage + int(limite)
+        if fin is not None:
+            params['limite'] = str(fin)
+        chemin = urlunsplit(url._replace(query=urlencode(params)))
+        reponses = await asyncio.gather(*[s.requete(methode, chemin, corps) for s in self.shards])
+        for statut, reponse in reponses:
+            if statut != HTTPStatus.OK:
+                return statut, reponse
+        listes = [json.loads(reponse) for _, reponse in reponses]
+        fusion = heapq.merge(*listes, key=lambda s: (s['horaire'], s['id']))
+        return HTTPStatus.OK, encoder_json(list(itertools.islice(fusion, decalage, fin)))
+
+
+async def servir(nb_shards: int = NB_SHARDS, hote: str = HOTE, port: int = PORT, chemin_db: str = CHEMIN_DB) -> None:
+    stockage = StockageSQLite(chemin_db)
+    try:
+        if stockage.est_vide():
+            ouvrir_donnees(stockage)  # données initiales, enregistrées avant le démarrage des shards
+        salle_par_seance = stockage.salles_des_seances()
+    finally:
+        stockage.fermer()
+    processus, ports = lancer_shards(nb_shards, chemin_db)
+    shards = [ConnexionShard(p) for p in ports]
+    try:
+        for s in shards:
+            await s.ouvrir()
+        routeur = RouteurHTTP(shards, salle_par_seance, hote, port)
+        await routeur.demarrer()
+        _arreter_sur_sigterm()
+        print(f"Service cinéma réparti sur {nb_shards} processus : http://{routeur.hote}:{routeur.port}/")
+        try:
+            await routeur.servir_indefiniment()
+        finally:
+            await routeur.arreter()
+    finally:
+        for s in shards:
+            await s.fermer()
+        for p in processus:
+            p.terminate()  # SIGTERM : chaque shard écrit ses modifications en attente
+        for p in processus:
+            p.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service de réservation réparti sur plusieurs processus (par salle).")
+    parser.add_argument('--shards', type=int, default=NB_SHARDS, help="nombre de processus (par défaut : nombre de cœurs)")
+    parser.add_argument('--hote', default=HOTE)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--db', default=CHEMIN_DB, help="base SQLite (par défaut : CINEMA_DB ou cinema.db)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(servir(max(1, args.shards), args.hote, args.port, args.db))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,28 @@ Module : reservation
 Responsable : Personne 2
 Fonction : gestion des séances et des réservations.
 """
-from typing import List, Dict
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Tuple, ValuesView
+from array import array
+from collections import Counter
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass
-import string
+from datetime import datetime, timedelta
+import bisect
+import re
+import sys
+import threading
+import time
 
 from film import Film, FilmInexistantError
 from salle import Salle
+from plan_salle import CAPACITE_MAX, PlanSalle, PlaceInexistanteError
+from retenues import DUREE_RETENUE, ECHEANCIER, Echeancier
+from vues import paginer
+
+
+RANGEE_IDEALE = 0.6  # position préférée dans la salle pour les groupes (0 = premier rang, 1 = dernier)
+PARTITIONS = 16  # partitions (par id de séance, chacune son verrou) de l'index des réservations et des compteurs
+_A_RECALCULER = 0xFFFF  # marque d'une rangée dont la plus longue suite de places libres a changé
 
 
 class SallePleineError(Exception):
@@ -16,11 +32,101 @@ class SallePleineError(Exception):
     pass
 
 
+class CreneauOccupeError(Exception):
+    """Exception levée si une séance chevauche une autre séance de la même salle."""
+    pass
+
+
+# seul format accepté : les index par horaire et par jour comparent et découpent les chaînes
+_HORAIRE = re.compile(r"(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d)", re.ASCII)
+
+
+def lire_horaire(horaire: str) -> datetime:
+    """
+    Convertit un horaire "AAAA-MM-JJ HH:MM" en datetime, lève ValueError si invalide.
+    Toute autre écriture (date seule, 'T', secondes, fuseau, chiffres non complétés) est refusée.
+    """
+    m = _HORAIRE.fullmatch(horaire) if isinstance(horaire, str) else None
+    try:
+        if m is None:
+            raise ValueError(horaire)
+        return datetime(*map(int, m.groups()))
+    except ValueError:
+        raise ValueError(f"Horaire invalide : {horaire!r} (format AAAA-MM-JJ HH:MM attendu).")
+
+
+def _en_minutes(d: datetime) -> int:
+    # minutes écoulées depuis le 01/01/0001 : entier comparable, sans objet datetime à stocker
+    return d.toordinal() * 1440 + d.hour * 60 + d.minute
+
+
+class IndexCreneaux:
+    """
+    Créneaux occupés d'une salle, triés par début : trois listes parallèles (début, fin, id
+    de séance) en minutes. Recherche par dichotomie ; comme les séances d'une salle ne se
+    chevauchent pas, seuls les créneaux commençant moins d'une durée maximale avant la
+    période demandée sont examinés.
+    """
+
+    def __init__(self):
+        self._debuts: List[int] = []
+        self._fins: List[int] = []
+        self._ids: List[int] = []
+        self._duree_max = 0
+
+    def ajouter(self, debut: int, fin: int, seance_id: int) -> None:
+        i = bisect.bisect_right(self._debuts, debut)
+        self._debuts.insert(i, debut)
+        self._fins.insert(i, fin)
+        self._ids.insert(i, seance_id)
+        self._duree_max = max(self._duree_max, fin - debut)
+
+    def retirer(self, debut: int, seance_id: int) -> None:
+        i = bisect.bisect_left(self._debuts, debut)
+        while i < len(self._debuts) and self._debuts[i] == debut:
+            if self._ids[i] == seance_id:
+                del self._debuts[i], self._fins[i], self._ids[i]
+                return
+            i += 1
+
+    def changer_fin(self, debut: int, seance_id: int, fin: int) -> bool:
+        """Change la fin d'un créneau (durée du film modifiée) ; True si elle a changé."""
+        i = bisect.bisect_left(self._debuts, debut)
+        while i < len(self._debuts) and self._debuts[i] == debut:
+            if self._ids[i] == seance_id:
+                if self._fins[i] == fin:
+                    return False
+                self._fins[i] = fin
+                self._duree_max = max(self._duree_max, fin - debut)
+                return True
+            i += 1
+        return False
+
+    def recalculer_duree_max(self) -> None:
+        """Recalcule la durée maximale après des créneaux raccourcis (borne plus serrée pour `conflit`)."""
+        self._duree_max = max((f - d for d, f in zip(self._debuts, self._fins)), default=0)
+
+    def conflit(self, debut: int, fin: int) -> Optional[int]:
+        """Retourne l'id d'une séance occupant une partie de [debut, fin[, ou None."""
+        k = bisect.bisect_left(self._debuts, fin) - 1
+        while k >= 0 and self._debuts[k] + self._duree_max > debut:
+            if self._fins[k] > debut:
+                return self._ids[k]
+            k -= 1
+        return None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
 @dataclass
 class Reservation:
     """
     Représente une réservation pour une séance, pour une place précise.
+    Les séances ne gardent pas ces objets (seulement le numéro du client par place) :
+    ils sont construits à la demande.
     """
+    __slots__ = ('client_nom', 'place', 'seance_id')
     client_nom: str
     place: str  # ex: H12
     seance_id: int
@@ -29,79 +135,529 @@ class Reservation:
         return f"Réservation: {self.client_nom} - Place {self.place} (séance #{self.seance_id})"
 
 
+class RegistreClients:
+    """
+    Noms des clients, internés et numérotés à partir de 1 (0 : aucun client) :
+    une place réservée ne garde que le numéro de son client, pas une chaîne.
+    """
+
+    def __init__(self):
+        self._noms: List[str] = ['']
+        self._numeros: Dict[str, int] = {}
+        self._verrou = threading.Lock()
+
+    def numero(self, nom: str) -> int:
+        """Numéro du client `nom`, attribué à sa première réservation."""
+        n = self._numeros.get(nom)
+        if n is None:
+            with self._verrou:
+                n = self._numeros.get(nom)
+                if n is None:
+                    nom = sys.intern(nom)
+                    n = self._numeros[nom] = len(self._noms)
+                    self._noms.append(nom)
+        return n
+
+    def chercher(self, nom: str) -> int:
+        """Numéro du client `nom`, 0 s'il n'a jamais réservé."""
+        return self._numeros.get(nom, 0)
+
+    def nom(self, numero: int) -> str:
+        return self._noms[numero]
+
+    def __len__(self) -> int:
+        return len(self._numeros)
+
+
+# registre unique, partagé par toutes les séances
+CLIENTS = RegistreClients()
+
+
+class IndexReservations:
+    """
+    Index global des réservations, tenu à jour à chaque réservation/annulation :
+    numéro du client -> places réservées, codées chacune en un entier
+    (id de séance * CAPACITE_MAX + index de la place) dans un tableau compact.
+    Une annulation ajoute la place aux places retirées du client (O(1), sans parcourir
+    ses réservations) ; les deux tableaux sont compactés quand les retraits dépassent
+    la moitié des places, soit un coût amorti constant par annulation.
+    L'index est partagé par toutes les séances et mis à jour sous le verrou de la séance :
+    il est découpé en PARTITIONS par id de séance, chacune avec son verrou, pour que les ventes
+    de séances différentes ne s'attendent pas.
+    """
+
+    def __init__(self):
+        self._par_client: List[Dict[int, array]] = [{} for _ in range(PARTITIONS)]
+        # places annulées pas encore ôtées de _par_client
+        self._retirees: List[Dict[int, array]] = [{} for _ in range(PARTITIONS)]
+        self._nb = [0] * PARTITIONS
+        self._verrous = [threading.Lock() for _ in range(PARTITIONS)]
+
+    def ajouter(self, client: int, seance_id: int, idx: int) -> None:
+        """Indexe une nouvelle réservation."""
+        p = seance_id % PARTITIONS
+        with self._verrous[p]:
+            par_client = self._par_client[p]
+            places = par_client.get(client)
+            if places is None:
+                places = par_client[client] = array('Q')
+            places.append(seance_id * CAPACITE_MAX + idx)
+            self._nb[p] += 1
+
+    def retirer(self, client: int, seance_id: int, idx: int) -> None:
+        """Retire une réservation de l'index (elle doit y figurer)."""
+        p = seance_id % PARTITIONS
+        with self._verrous[p]:
+            par_client, par_client_retirees = self._par_client[p], self._retirees[p]
+            places = par_client.get(client)
+            if places is None:
+                return
+            retirees = par_client_retirees.get(client)
+            if retirees is None:
+                retirees = par_client_retirees[client] = array('Q')
+            retirees.append(seance_id * CAPACITE_MAX + idx)
+            self._nb[p] -= 1
+            if len(retirees) == len(places):
+                del par_client[client], par_client_retirees[client]
+            elif len(retirees) > 8 and 2 * len(retirees) > len(places):
+                par_client[client] = array('Q', _sans(places, retirees))
+                del par_client_retirees[client]
+
+    def places_du_client(self, client: int) -> List[Tuple[int, int]]:
+        """Retourne les (id de séance, index de place) réservés par un client, triés."""
+        cles: List[int] = []
+        for p, verrou in enumerate(self._verrous):
+            with verrou:
+                places = self._par_client[p].get(client)
+                if places is None:
+                    continue
+                retirees = self._retirees[p].get(client)
+                cles.extend(_sans(places, retirees) if retirees else places)
+        return [divmod(cle, CAPACITE_MAX) for cle in sorted(cles)]
+
+    def __len__(self) -> int:
+        return sum(self._nb)
+
+
+def _sans(places: Iterable[int], retirees: Iterable[int]) -> List[int]:
+    # places moins les places retirées (multiensembles : une place peut être réservée à nouveau)
+    restantes = Counter(retirees)
+    resultat = []
+    for cle in places:
+        if restantes.get(cle):
+            restantes[cle] -= 1
+        else:
+            resultat.append(cle)
+    return resultat
+
+
+AXES_COMPTEURS = ('film', 'salle', 'jour')
+
+
+class CompteursVentes:
+    """
+    Compteurs de places vendues et offertes par film (titre), par salle (numéro) et par jour
+    ("AAAA-MM-JJ"), tenus à jour à chaque création de séance, réservation et annulation :
+    les lectures ne parcourent ni les séances ni les réservations.
+    Comme l'index des réservations, les compteurs sont découpés en PARTITIONS par id de séance ;
+    une lecture additionne les partitions.
+    """
+
+    def __init__(self):
+        # par partition : axe -> clé -> [places vendues, places offertes]
+        self._compteurs: List[Dict[str, Dict[object, List[int]]]] = [
+            {axe: {} for axe in AXES_COMPTEURS} for _ in range(PARTITIONS)]
+        self._par_axe = {axe: [c[axe] for c in self._compteurs] for axe in AXES_COMPTEURS}  # axe -> partitions
+        self._totaux = [[0, 0] for _ in range(PARTITIONS)]
+        self._verrous = [threading.Lock() for _ in range(PARTITIONS)]  # les séances sont vendues en parallèle
+
+    def _lignes(self, p: int, s: "Seance") -> Tuple[List[int], ...]:
+        c = self._compteurs[p]
+        return (self._totaux[p],
+                c['film'].setdefault(s.film.titre, [0, 0]),
+                c['salle'].setdefault(s.salle.numero, [0, 0]),
+                c['jour'].setdefault(s.horaire[:10], [0, 0]))
+
+    def ajouter_seance(self, s: "Seance") -> None:
+        """Compte les places offertes (et déjà vendues) d'une nouvelle séance."""
+        vendues = s.places_vendues()
+        p = s.id % PARTITIONS
+        with self._verrous[p]:
+            for ligne in self._lignes(p, s):
+                ligne[0] += vendues
+                ligne[1] += s.salle.capacite
+
+    def retirer_seance(self, s: "Seance") -> None:
+        """Retire les places offertes et vendues d'une séance supprimée (une clé sans séance disparaît)."""
+        vendues = s.places_vendues()
+        p = s.id % PARTITIONS
+        c = self._compteurs[p]
+        with self._verrous[p]:
+            for ligne in self._lignes(p, s):
+                ligne[0] -= vendues
+                ligne[1] -= s.salle.capacite
+            for axe, cle in (('film', s.film.titre), ('salle', s.salle.numero), ('jour', s.horaire[:10])):
+                if not c[axe][cle][1]:
+                    del c[axe][cle]
+
+    def compter(self, s: "Seance", nb_places: int) -> None:
+        """Ajoute `nb_places` places vendues (négatif pour une annulation) à la séance `s`."""
+        p = s.id % PARTITIONS
+        with self._verrous[p]:
+            for ligne in self._lignes(p, s):
+                ligne[0] += nb_places
+
+    def _ligne(self, axe: str, cle) -> Tuple[int, int]:
+        partitions = self._par_axe.get(axe)
+        if partitions is None:
+            raise ValueError(f"Axe inconnu : {axe!r} (attendu : {', '.join(AXES_COMPTEURS)}).")
+        vendues = offertes = 0
+        for c in partitions:
+            if cle in c:
+                ligne = c[cle]
+                vendues += ligne[0]
+                offertes += ligne[1]
+        return vendues, offertes
+
+    def ventes(self, axe: str, cle) -> int:
+        """Places vendues pour un film, une salle ou un jour (0 si aucune séance)."""
+        return self._ligne(axe, cle)[0]
+
+    def remplissage(self, axe: str, cle) -> float:
+        """Taux de remplissage (0 à 1) d'un film, d'une salle ou d'un jour (0 si aucune séance)."""
+        vendues, offertes = self._ligne(axe, cle)
+        return vendues / offertes if offertes else 0.0
+
+    def total(self) -> Tuple[int, int]:
+        """Retourne (places vendues, places offertes) toutes séances confondues."""
+        with _tous(self._verrous):
+            return sum(t[0] for t in self._totaux), sum(t[1] for t in self._totaux)
+
+    def instantane(self, axe: str) -> Dict[object, Tuple[int, int]]:
+        """Copie cohérente des compteurs d'un axe : clé -> (places vendues, places offertes)."""
+        if axe not in AXES_COMPTEURS:
+            raise ValueError(f"Axe inconnu : {axe!r} (attendu : {', '.join(AXES_COMPTEURS)}).")
+        copie: Dict[object, Tuple[int, int]] = {}
+        with _tous(self._verrous):
+            for c in self._par_axe[axe]:
+                for cle, (v, o) in c.items():
+                    v0, o0 = copie.get(cle, (0, 0))
+                    copie[cle] = (v0 + v, o0 + o)
+        return copie
+
+
+@contextmanager
+def _tous(verrous: List[threading.Lock]) -> Iterator[None]:
+    # prend tous les verrous, toujours dans le même ordre : lecture cohérente de toutes les partitions
+    with ExitStack() as pile:
+        for verrou in verrous:
+            pile.enter_context(verrou)
+        yield
+
+
 class Seance:
     """
     Représente une séance : un film projeté dans une salle à un horaire donné.
     Gère le plan de la salle et les réservations individuelles par place.
+    Les réservations et annulations sont protégées par un verrou propre à la séance :
+    plusieurs caisses peuvent vendre en parallèle sans double réservation.
+    Une place peut aussi être retenue temporairement par une caisse (voir `retenir`).
     """
 
-    def __init__(self, seance_id: int, film: Film, salle: Salle, horaire: str):
+    __slots__ = ('id', 'film', 'salle', 'horaire', '_gestion', '_clients', '_plan_salle', '_occupation',
+                 '_nb_reservees', '_verrou', '_suites', '_retenues')
+
+    def __init__(self, seance_id: int, film: Film, salle: Salle, horaire: str,
+                 gestion: Optional["GestionSeances"] = None):
         self.id = seance_id
         self.film = film
         self.salle = salle
         self.horaire = horaire
-        self._reservations: List[Reservation] = []
-        self._places_reservees = set()  # set de places réservées, ex: {'A1', 'B2'}
-        self.plan = self._generer_plan_salle()
-
-    def _generer_plan_salle(self):
-        """
-        Génère le plan de la salle sous forme de liste de listes, chaque place est identifiée par une lettre et un numéro.
-        """
-        nb_places = self.salle.capacite
-        colonnes = 12  # nombre de colonnes par défaut
-        lignes = max(1, nb_places // colonnes + (1 if nb_places % colonnes else 0))
-        alphabet = string.ascii_uppercase
-        plan = []
-        cpt = 0
-        for i in range(lignes):
-            row = []
-            for j in range(colonnes):
-                if cpt < nb_places:
-                    row.append(f"{alphabet[i]}{j+1}")
-                    cpt += 1
-            plan.append(row)
-        return plan
+        # gestionnaire prévenu des réservations/annulations (index global), optionnel
+        self._gestion = gestion
+        # numéro (RegistreClients) du client de chaque place, 0 si non vendue ; créé à la première réservation
+        self._clients: Optional[array] = None
+        self._plan_salle: PlanSalle = salle.plan_salle  # partagé par toutes les séances de la salle
+        # un octet par place (0 = libre, 1 = réservée ou retenue), dans l'ordre du plan
+        self._occupation = bytearray(salle.capacite)
+        self._nb_reservees = 0
+        self._verrou = threading.Lock()
+        # plus longue suite de places libres par rangée, créée à la première recherche de groupe
+        self._suites: Optional[array] = None
+        # places retenues : index -> (échéance time.monotonic, titulaire), créé à la première retenue
+        self._retenues: Optional[Dict[int, Tuple[float, str]]] = None
+
+    @property
+    def debut(self) -> datetime:
+        """Début de la séance (horaire converti en datetime)."""
+        return lire_horaire(self.horaire)
+
+    @property
+    def fin(self) -> datetime:
+        """Fin de la séance : début + durée du film."""
+        return self.debut + timedelta(minutes=self.film.duree)
+
+    @property
+    def plan(self) -> List[List[str]]:
+        """
+        Plan de la salle sous forme de liste de listes, chaque place est identifiée par une lettre et un numéro.
+        Généré à la demande (non stocké) pour ne pas garder une chaîne par place et par séance.
+        """
+        return self._plan_salle.rangees()
 
     def places_disponibles(self) -> int:
         """Retourne le nombre de places encore disponibles pour la séance."""
-        return self.salle.capacite - len(self._places_reservees)
+        return self.salle.capacite - self._nb_reservees - (len(self._retenues) if self._retenues else 0)
+
+    def places_vendues(self) -> int:
+        """Retourne le nombre de places réservées (hors places seulement retenues)."""
+        return self._nb_reservees
+
+    def occupation(self) -> bytes:
+        """
+        Copie de l'occupation des places, un octet par place dans l'ordre du plan
+        (1 = réservée, 0 = libre ; les places seulement retenues comptent comme libres).
+        """
+        with self._verrou:
+            occupation = bytearray(self._occupation)
+            for idx in (self._retenues or ()):
+                occupation[idx] = 0
+        return bytes(occupation)
 
     def est_place_disponible(self, place: str) -> bool:
-        """Vérifie si une place donnée est disponible."""
-        return place not in self._places_reservees
-
-    def reserver(self, client_nom: str, place: str) -> Reservation:
-        """Réserve une place précise pour un client, lève une exception si la place est déjà prise."""
-        if not self.est_place_disponible(place):
-            raise SallePleineError(f"La place {place} n'est pas disponible.")
-        self._places_reservees.add(place)
-        r = Reservation(client_nom, place, self.id)
-        self._reservations.append(r)
+        """Vérifie si une place donnée est disponible (False si la place n'existe pas ou est retenue)."""
+        try:
+            idx = self._plan_salle.index(place)
+        except PlaceInexistanteError:
+            return False
+        if self._occupation[idx] and self._retenues:
+            # une retenue échue que l'échéancier n'a pas encore libérée ne bloque plus la place
+            retenue = self._retenues.get(idx)
+            return retenue is not None and retenue[0] <= time.monotonic()
+        return not self._occupation[idx]
+
+    def est_place_retenue(self, place: str) -> bool:
+        """Indique si une place est actuellement retenue (et pas encore réservée)."""
+        if not self._retenues:
+            return False
+        try:
+            retenue = self._retenues.get(self._plan_salle.index(place))
+        except PlaceInexistanteError:
+            return False
+        return retenue is not None and retenue[0] > time.monotonic()
+
+    def retenir(self, place: str, titulaire: str, duree: float = DUREE_RETENUE,
+                echeancier: Optional[Echeancier] = None) -> float:
+        """
+        Retient une place pour `titulaire` pendant `duree` secondes : elle n'est plus
+        disponible pour les autres caisses et sera libérée automatiquement si elle n'est
+        pas réservée d'ici là. Retenir à nouveau sa propre place prolonge la retenue.
+        Retourne l'échéance (horloge time.monotonic).
+        """
+        idx = self._plan_salle.index(place)
+        maintenant = time.monotonic()
+        echeance = maintenant + duree
+        with self._verrou:
+            self._liberer_si_echue(idx, maintenant)
+            if self._occupation[idx]:
+                retenue = self._retenues.get(idx) if self._retenues else None
+                if retenue is None or retenue[1] != titulaire:
+                    raise SallePleineError(f"La place {place} n'est pas disponible.")
+            else:
+                self._occuper(idx)
+            if self._retenues is None:
+                self._retenues = {}
+            self._retenues[idx] = (echeance, titulaire)
+        (ECHEANCIER if echeancier is None else echeancier).planifier(echeance, self, idx)
+        return echeance
+
+    def liberer(self, place: str, titulaire: str) -> bool:
+        """Libère une place retenue par `titulaire` sans la réserver. Retourne True si libérée."""
+        idx = self._plan_salle.index(place)
+        with self._verrou:
+            retenue = self._retenues.get(idx) if self._retenues else None
+            if retenue is None or retenue[1] != titulaire:
+                return False
+            self._liberer_retenue(idx)
+            return True
+
+    def _expirer_retenue(self, idx: int, echeance: float) -> bool:
+        # Appelé par l'échéancier : ne libère que si la retenue n'a été ni confirmée ni prolongée
+        with self._verrou:
+            retenue = self._retenues.get(idx) if self._retenues else None
+            if retenue is None or retenue[0] != echeance:
+                return False
+            self._liberer_retenue(idx)
+            return True
+
+    def _liberer_retenues_echues(self, maintenant: float) -> None:
+        # Appelé avec le verrou : les retenues échues sont libérées sans attendre l'échéancier
+        if self._retenues:
+            for idx in [i for i, (echeance, _) in self._retenues.items() if echeance <= maintenant]:
+                self._liberer_retenue(idx)
+
+    def _liberer_si_echue(self, idx: int, maintenant: float) -> None:
+        # Même chose pour une seule place
+        if self._retenues:
+            retenue = self._retenues.get(idx)
+            if retenue is not None and retenue[0] <= maintenant:
+                self._liberer_retenue(idx)
+
+    def _liberer_retenue(self, idx: int) -> None:
+        del self._retenues[idx]
+        self._occupation[idx] = 0
+        if self._suites is not None:
+            self._suites[self._plan_salle.rangee_de(idx)] = _A_RECALCULER
+
+    def _occuper(self, idx: int) -> None:
+        self._occupation[idx] = 1
+        if self._suites is not None:
+            self._suites[self._plan_salle.rangee_de(idx)] = _A_RECALCULER
+
+    def reserver(self, client_nom: str, place: str, titulaire: Optional[str] = None) -> Reservation:
+        """
+        Réserve une place précise pour un client, lève une exception si la place est déjà prise.
+        Une place retenue ne peut être réservée que par son `titulaire`.
+        """
+        idx = self._plan_salle.index(place)
+        with self._verrou:
+            self._liberer_si_echue(idx, time.monotonic())
+            if self._occupation[idx]:
+                retenue = self._retenues.get(idx) if self._retenues else None
+                if retenue is None or titulaire is None or retenue[1] != titulaire:
+                    raise SallePleineError(f"La place {place} n'est pas disponible.")
+                # la retenue est confirmée : son échéance restera sans effet
+                del self._retenues[idx]
+            return self._reserver_index(client_nom, idx)
+
+    def reserver_places(self, client_nom: str, places: Iterable[str]) -> List[Reservation]:
+        """
+        Réserve plusieurs places d'un coup : soit toutes sont réservées, soit aucune
+        (SallePleineError si l'une d'elles est déjà prise).
+        """
+        places = list(places)
+        indices = [self._plan_salle.index(p) for p in places]
+        if len(set(indices)) != len(indices):
+            raise ValueError("Une même place est demandée plusieurs fois.")
+        with self._verrou:
+            self._liberer_retenues_echues(time.monotonic())
+            prises = [p for p, idx in zip(places, indices) if self._occupation[idx]]
+            if prises:
+                raise SallePleineError(f"Places non disponibles : {', '.join(prises)}.")
+            return [self._reserver_index(client_nom, idx) for idx in indices]
+
+    def reserver_groupe(self, client_nom: str, nb_places: int) -> List[Reservation]:
+        """
+        Réserve `nb_places` places côte à côte dans une même rangée, choisies au mieux :
+        rangée la plus proche de RANGEE_IDEALE, puis bloc le plus centré.
+        Lève SallePleineError si aucune rangée n'a assez de places libres contiguës.
+        """
+        if nb_places <= 0:
+            raise ValueError("Le nombre de places doit être un entier strictement positif.")
+        with self._verrou:
+            self._liberer_retenues_echues(time.monotonic())
+            debut = self._meilleur_bloc(nb_places)
+            if debut is None:
+                raise SallePleineError(f"Aucun bloc de {nb_places} places contiguës n'est disponible.")
+            return [self._reserver_index(client_nom, idx) for idx in range(debut, debut + nb_places)]
+
+    def _suite_max(self, i: int) -> int:
+        # Plus longue suite de places libres de la rangée i (recalculée si la rangée a changé)
+        if self._suites[i] == _A_RECALCULER:
+            self._suites[i] = max((len(suite) for debut, fin in self._plan_salle.segments(i)
+                                   for suite in self._occupation[debut:fin].split(b'\x01')), default=0)
+        return self._suites[i]
+
+    def _meilleur_bloc(self, n: int) -> Optional[int]:
+        # Index de la première place du meilleur bloc de n places libres, ou None
+        plan = self._plan_salle
+        if self._suites is None:
+            self._suites = array('H', [_A_RECALCULER]) * plan.lignes
+        ideale = round((plan.lignes - 1) * RANGEE_IDEALE)
+        # rangées par distance croissante à la rangée idéale
+        ordre = sorted(range(plan.lignes), key=lambda i: (abs(i - ideale), -i))
+        for i in ordre:
+            if self._suite_max(i) < n:
+                continue  # rangée écartée sans la parcourir
+            debut, fin = plan.bornes_rangee(i)
+            centre = (debut + fin) / 2
+            meilleur, ecart_min = None, None
+            # les blocs ne traversent pas les allées : chaque segment de la rangée est découpé à part
+            for debut, fin in plan.segments(i):
+                pos = debut
+                for suite in self._occupation[debut:fin].split(b'\x01'):
+                    if len(suite) >= n:
+                        # départ le plus centré possible dans cette suite
+                        d = min(max(pos, round(centre - n / 2)), pos + len(suite) - n)
+                        ecart = abs(d + n / 2 - centre)
+                        if ecart_min is None or ecart < ecart_min:
+                            meilleur, ecart_min = d, ecart
+                    pos += len(suite) + 1
+            return meilleur
+        return None
+
+    def _reserver_index(self, client_nom: str, idx: int) -> Reservation:
+        # Appelé avec le verrou de la séance, la place étant libre (ou retenue par le demandeur)
+        client = CLIENTS.numero(client_nom)
+        if self._clients is None:
+            self._clients = array('I', [0]) * self.salle.capacite
+        self._occuper(idx)
+        self._nb_reservees += 1
+        self._clients[idx] = client
+        # étiquette canonique ('A1' même si la place a été demandée en 'A01')
+        r = Reservation(CLIENTS.nom(client), self._plan_salle.etiquette(idx), self.id)
+        if self._gestion is not None:
+            self._gestion._sur_reservation(self, r, client, idx)
         return r
 
     def lister_reservations(self) -> List[Reservation]:
-        """Retourne la liste des réservations pour cette séance."""
-        return list(self._reservations)
+        """Retourne la liste des réservations pour cette séance (dans l'ordre du plan)."""
+        with self._verrou:
+            return list(self.reservations())
+
+    def reservations(self) -> Iterator[Reservation]:
+        """
+        Parcourt les réservations de la séance dans l'ordre du plan, sans copie :
+        chaque Reservation est construite à la volée. À parcourir quand aucune caisse
+        ne vend en parallèle ; sinon utiliser lister_reservations.
+        """
+        if self._clients is None:
+            return
+        etiquette, nom = self._plan_salle.etiquette, CLIENTS.nom
+        for idx, client in enumerate(self._clients):
+            if client:
+                yield Reservation(nom(client), etiquette(idx), self.id)
+
+    def client_de(self, place: str) -> Optional[str]:
+        """Nom du client qui a réservé la place, None si elle n'est pas vendue (ou n'existe pas)."""
+        try:
+            idx = self._plan_salle.index(place)
+        except PlaceInexistanteError:
+            return None
+        client = self._clients[idx] if self._clients is not None else 0
+        return CLIENTS.nom(client) if client else None
 
     def annuler_reservation(self, client_nom: str, place: str) -> bool:
         """Annule la réservation pour le client et la place donnée. Retourne True si annulée."""
-        # Trouver la réservation correspondante
-        to_remove = None
-        for r in self._reservations:
-            if r.client_nom == client_nom and r.place == place:
-                to_remove = r
-                break
-        if to_remove:
-            try:
-                self._reservations.remove(to_remove)
-            except ValueError:
-                pass
+        try:
+            idx = self._plan_salle.index(place)
+        except PlaceInexistanteError:
+            return False
+        client = CLIENTS.chercher(client_nom)
+        with self._verrou:
+            if not client or self._clients is None or self._clients[idx] != client:
+                return False
+            self._clients[idx] = 0
+            r = Reservation(CLIENTS.nom(client), self._plan_salle.etiquette(idx), self.id)
             # libérer la place
-            if place in self._places_reservees:
-                self._places_reservees.remove(place)
+            if self._occupation[idx]:
+                self._occupation[idx] = 0
+                self._nb_reservees -= 1
+                if self._suites is not None:
+                    self._suites[self._plan_salle.rangee_de(idx)] = _A_RECALCULER
+            if self._gestion is not None:
+                self._gestion._sur_annulation(self, r, client, idx)
             return True
-        return False
 
     def __str__(self) -> str:
         # Affiche les infos principales de la séance
@@ -114,19 +670,242 @@ class Seance:
 class GestionSeances:
     """
     Gère l'ensemble des séances du cinéma.
+    Maintient des index secondaires (par film, par salle, par horaire) pour que
+    les recherches ne parcourent que les séances concernées.
     """
 
     def __init__(self):
         self._seances: Dict[int, Seance] = {}
         self._next_id = 1
+        # index secondaires : titre -> {id: séance}, numéro de salle -> {id: séance}
+        self._par_film: Dict[str, Dict[int, Seance]] = {}
+        self._par_salle: Dict[int, Dict[int, Seance]] = {}
+        # liste triée de (horaire, id) ; les horaires "AAAA-MM-JJ HH:MM" se trient comme des chaînes
+        self._par_horaire: List[Tuple[str, int]] = []
+        # créneaux occupés par salle (début et fin en minutes, fin = début + durée du film)
+        self._creneaux: Dict[int, IndexCreneaux] = {}
+        # index global des réservations (par client et par place)
+        self.index_reservations = IndexReservations()
+        # places vendues / offertes par film, salle et jour
+        self.compteurs = CompteursVentes()
+        # protège la création de séances et les index secondaires
+        self._verrou = threading.RLock()
+        # objets prévenus des modifications (ex: stockage persistant)
+        self._ecouteurs: List[object] = []
+
+    def ajouter_ecouteur(self, ecouteur: object) -> None:
+        """
+        Enregistre un objet prévenu des modifications
+        (méthodes seance_creee, seance_supprimee, reservation_ajoutee, reservation_annulee).
+        Les réservations d'une séance supprimée disparaissent avec elle (pas de reservation_annulee).
+        """
+        self._ecouteurs.append(ecouteur)
+
+    def suivre(self, films, salles) -> None:
+        """
+        Écoute les gestionnaires de films et de salles : supprimer un film ou une salle
+        supprime ses séances (voir supprimer_seances_du_film, supprimer_seances_de_salle)
+        et désaffecte le film des salles qui le projetaient ; changer la durée d'un film
+        déplace la fin de ses créneaux.
+        """
+        films.ajouter_ecouteur(self)
+        films.ajouter_ecouteur(salles)
+        salles.ajouter_ecouteur(self)
+
+    def _notifier(self, evenement: str, *args) -> None:
+        for e in self._ecouteurs:
+            rappel = getattr(e, evenement, None)
+            if rappel is not None:
+                rappel(*args)
+
+    def creer_seance(self, film: Film, salle: Salle, horaire: str, seance_id: Optional[int] = None,
+                     verifier: bool = True) -> Seance:
+        """
+        Crée une nouvelle séance avec un film, une salle et un horaire ("AAAA-MM-JJ HH:MM").
+        Lève CreneauOccupeError si la salle est déjà occupée pendant la séance.
+        `seance_id` permet de restaurer une séance existante (rechargement depuis le stockage) ;
+        `verifier=False` la recharge telle quelle, même si elle chevauche une autre séance.
+        """
+        debut = _en_minutes(lire_horaire(horaire))
+        with self._verrou:
+            if seance_id is None:
+                seance_id = self._next_id
+            elif seance_id in self._seances:
+                raise KeyError(f"La séance #{seance_id} existe déjà.")
+            if verifier:
+                self._verifier_creneau(salle, debut, debut + film.duree)
+            s = Seance(seance_id, film, salle, horaire, gestion=self)
+            self._seances[seance_id] = s
+            self._indexer(s)
+            self._next_id = max(self._next_id, seance_id + 1)
+            self._notifier('seance_creee', s)
+        return s
+
+    def creer_seances(self, programme: Iterable[Tuple[Film, Salle, str]], verifier: bool = True,
+                      ignorees: Optional[List[Tuple[Film, Salle, str]]] = None) -> List[Seance]:
+        """
+        Crée en une fois une liste de séances (film, salle, horaire), par exemple un programme
+        généré : l'index par horaire n'est trié qu'une fois au lieu d'une insertion par séance.
+        Tout ou rien : CreneauOccupeError si une séance en chevauche une autre (existante ou de la liste).
+        Si une liste `ignorees` est donnée, les séances en conflit n'y sont qu'ajoutées et les autres sont créées.
+        """
+        programme = [(film, salle, horaire, _en_minutes(lire_horaire(horaire))) for film, salle, horaire in programme]
+        creees = []
+        with self._verrou:
+            if verifier:
+                # séances de la liste triées par salle puis début : chacune ne peut chevaucher que la précédente
+                precedente = None
+                ecartees = set()
+                for i in sorted(range(len(programme)), key=lambda i: (programme[i][1].numero, programme[i][3])):
+                    film, salle, horaire, debut = programme[i]
+                    try:
+                        if precedente is not None and precedente[1].numero == salle.numero and precedente[3] + precedente[0].duree > debut:
+                            raise CreneauOccupeError(
+                                f"La salle {salle.numero} est programmée deux fois : {precedente[2]} et {horaire}.")
+                        self._verifier_creneau(salle, debut, debut + film.duree)
+                    except CreneauOccupeError:
+                        if ignorees is None:
+                            raise
+                        ecartees.add(i)
+                        continue
+                    precedente = programme[i]
+                if ecartees:
+                    ignorees.extend(programme[i][:3] for i in sorted(ecartees))
+                    programme = [e for i, e in enumerate(programme) if i not in ecartees]
+            for film, salle, horaire, debut in programme:
+                s = Seance(self._next_id, film, salle, horaire, gestion=self)
+                self._next_id += 1
+                self._seances[s.id] = s
+                self._par_film.setdefault(film.titre, {})[s.id] = s
+                self._par_salle.setdefault(salle.numero, {})[s.id] = s
+                self._par_horaire.append((horaire, s.id))
+                self._creneaux.setdefault(salle.numero, IndexCreneaux()).ajouter(debut, debut + film.duree, s.id)
+                self.compteurs.ajouter_seance(s)
+                creees.append(s)
+            self._par_horaire.sort()
+            for s in creees:
+                self._notifier('seance_creee', s)
+        return creees
+
+    def _indexer(self, s: Seance) -> None:
+        self._par_film.setdefault(s.film.titre, {})[s.id] = s
+        self._par_salle.setdefault(s.salle.numero, {})[s.id] = s
+        bisect.insort(self._par_horaire, (s.horaire, s.id))
+        debut = _en_minutes(lire_horaire(s.horaire))
+        self._creneaux.setdefault(s.salle.numero, IndexCreneaux()).ajouter(debut, debut + s.film.duree, s.id)
+        self.compteurs.ajouter_seance(s)
 
-    def creer_seance(self, film: Film, salle: Salle, horaire: str) -> Seance:
-        """Crée une nouvelle séance avec un film, une salle et un horaire."""
-        s = Seance(self._next_id, film, salle, horaire)
-        self._seances[self._next_id] = s
-        self._next_id += 1
+    def supprimer_seance(self, seance_id: int) -> Seance:
+        """Supprime une séance et ses réservations, lève une exception si elle n'existe pas."""
+        with self._verrou:
+            if seance_id not in self._seances:
+                raise KeyError(f"La séance #{seance_id} n'existe pas.")
+            s = self._seances[seance_id]
+            self._retirer([s])
         return s
 
+    def supprimer_seances_du_film(self, titre: str) -> List[Seance]:
+        """Supprime les séances d'un film (et leurs réservations) ; retourne les séances supprimées."""
+        with self._verrou:
+            seances = list(self._par_film.get(titre, {}).values())
+            self._retirer(seances)
+        return seances
+
+    def supprimer_seances_de_salle(self, numero: int) -> List[Seance]:
+        """Supprime les séances d'une salle (et leurs réservations) ; retourne les séances supprimées."""
+        with self._verrou:
+            seances = list(self._par_salle.get(numero, {}).values())
+            self._retirer(seances)
+        return seances
+
+    def _retirer(self, seances: List[Seance]) -> None:
+        # Appelé avec le verrou : retire les séances de tous les index, en O(nombre de séances retirées)
+        # (sauf l'index par horaire, refait en un seul passage si beaucoup de séances partent)
+        for s in seances:
+            with s._verrou:
+                # détachée : une caisse qui la tiendrait encore ne met plus à jour les index
+                s._gestion = None
+                if s._clients is not None:
+                    for idx, client in enumerate(s._clients):
+                        if client:
+                            self.index_reservations.retirer(client, s.id, idx)
+            del self._seances[s.id]
+            for index, cle in ((self._par_film, s.film.titre), (self._par_salle, s.salle.numero)):
+                par_id = index[cle]
+                del par_id[s.id]
+                if not par_id:
+                    del index[cle]
+            creneaux = self._creneaux[s.salle.numero]
+            creneaux.retirer(_en_minutes(lire_horaire(s.horaire)), s.id)
+            if not creneaux:
+                del self._creneaux[s.salle.numero]
+            self.compteurs.retirer_seance(s)
+        if len(seances) > 64:
+            retirees = {s.id for s in seances}
+            self._par_horaire = [e for e in self._par_horaire if e[1] not in retirees]
+        else:
+            for s in seances:
+                i = bisect.bisect_left(self._par_horaire, (s.horaire, s.id))
+                del self._par_horaire[i]
+        for s in seances:
+            self._notifier('seance_supprimee', s)
+
+    # --- écouteurs des gestionnaires de films et de salles (voir suivre) ---
+
+    def film_modifie(self, film: Film) -> None:
+        # la durée a pu changer (modifiée sur place) : fin des créneaux de ses séances
+        with self._verrou:
+            modifies = {}
+            for s in self._par_film.get(film.titre, {}).values():
+                index = self._creneaux[s.salle.numero]
+                debut = _en_minutes(lire_horaire(s.horaire))
+                if index.changer_fin(debut, s.id, debut + s.film.duree):
+                    modifies[s.salle.numero] = index
+            for index in modifies.values():
+                index.recalculer_duree_max()
+
+    def film_supprime(self, titre: str) -> None:
+        self.supprimer_seances_du_film(titre)
+
+    def salle_supprimee(self, numero: int) -> None:
+        self.supprimer_seances_de_salle(numero)
+
+    def _verifier_creneau(self, salle: Salle, debut: int, fin: int) -> None:
+        index = self._creneaux.get(salle.numero)
+        sid = index.conflit(debut, fin) if index is not None else None
+        if sid is not None:
+            autre = self._seances[sid]
+            raise CreneauOccupeError(
+                f"La salle {salle.numero} est déjà occupée par la séance #{sid} "
+                f"({autre.film.titre}, {autre.horaire} - {autre.fin:%H:%M}).")
+
+    def est_salle_libre(self, salle: Salle, debut: str, fin: str) -> bool:
+        """Indique si aucune séance n'occupe la salle entre `debut` et `fin` ("AAAA-MM-JJ HH:MM")."""
+        return bool(self.salles_libres([salle], debut, fin))
+
+    def salles_libres(self, salles: Iterable[Salle], debut: str, fin: str) -> List[Salle]:
+        """Retourne les salles (parmi `salles`) sans aucune séance entre `debut` et `fin`."""
+        d, f = _en_minutes(lire_horaire(debut)), _en_minutes(lire_horaire(fin))
+        with self._verrou:
+            libres = []
+            for salle in salles:
+                index = self._creneaux.get(salle.numero)
+                if index is None or index.conflit(d, f) is None:
+                    libres.append(salle)
+            return libres
+
+    def _sur_reservation(self, seance: Seance, r: Reservation, client: int, idx: int) -> None:
+        # Appelé par Seance.reserver
+        self.index_reservations.ajouter(client, seance.id, idx)
+        self.compteurs.compter(seance, 1)
+        self._notifier('reservation_ajoutee', seance, r)
+
+    def _sur_annulation(self, seance: Seance, r: Reservation, client: int, idx: int) -> None:
+        # Appelé par Seance.annuler_reservation
+        self.index_reservations.retirer(client, seance.id, idx)
+        self.compteurs.compter(seance, -1)
+        self._notifier('reservation_annulee', seance, r)
+
     def get_seance(self, seance_id: int) -> Seance:
         """Retourne la séance par son identifiant, lève une exception si elle n'existe pas."""
         if seance_id not in self._seances:
@@ -135,7 +914,84 @@ class GestionSeances:
 
     def lister_seances(self) -> List[Seance]:
         """Retourne la liste de toutes les séances enregistrées."""
-        return list(self._seances.values())
+        with self._verrou:
+            return list(self._seances.values())
+
+    def seances(self) -> ValuesView[Seance]:
+        """
+        Vue en lecture seule (sans copie) des séances, par ordre de création.
+        Aucune séance ne doit être créée pendant qu'on la parcourt ; sinon utiliser lister_seances.
+        """
+        return self._seances.values()
+
+    def chercher_seances(self, filtre: Optional[Callable[[Seance], bool]] = None,
+                         cle: Optional[Callable[[Seance], Any]] = None, inverse: bool = False,
+                         debut: int = 0, limite: Optional[int] = None,
+                         film: Optional[str] = None, salle: Optional[int] = None) -> List[Seance]:
+        """
+        Page de séances filtrées et triées (voir vues.paginer).
+        `film` (titre) ou `salle` (numéro) restreignent d'abord la recherche grâce aux index.
+        """
+        with self._verrou:
+            if film is not None:
+                candidates = self._par_film.get(film, {}).values()
+                if salle is not None:
+                    candidates = [s for s in candidates if s.salle.numero == salle]
+            elif salle is not None:
+                candidates = self._par_salle.get(salle, {}).values()
+            else:
+                candidates = self._seances.values()
+            return paginer(candidates, filtre, cle, inverse, debut, limite)
+
+    def reservations_du_client(self, client_nom: str) -> List[Tuple[Seance, List[str]]]:
+        """Retourne les séances réservées par un client avec ses places, sans parcourir toutes les séances."""
+        client = CLIENTS.chercher(client_nom)
+        if not client:
+            return []
+        resultat: Dict[int, Tuple[Seance, List[str]]] = {}
+        for seance_id, idx in self.index_reservations.places_du_client(client):
+            seance = self._seances.get(seance_id)
+            if seance is not None:
+                resultat.setdefault(seance_id, (seance, []))[1].append(seance.salle.plan_salle.etiquette(idx))
+        return list(resultat.values())
+
+    def seances_du_film(self, titre: str) -> List[Seance]:
+        """Retourne les séances d'un film (par ordre de création)."""
+        with self._verrou:
+            return list(self._par_film.get(titre, {}).values())
+
+    def seances_de_salle(self, numero: int) -> List[Seance]:
+        """Retourne les séances programmées dans une salle (par ordre de création)."""
+        with self._verrou:
+            return list(self._par_salle.get(numero, {}).values())
+
+    def seances_entre(self, debut: Optional[str] = None, fin: Optional[str] = None) -> List[Seance]:
+        """
+        Retourne les séances dont l'horaire est dans [debut, fin[, triées par horaire.
+        Les bornes sont au format "AAAA-MM-JJ HH:MM" ; None signifie pas de borne.
+        """
+        with self._verrou:
+            i = 0 if debut is None else bisect.bisect_left(self._par_horaire, (debut,))
+            j = len(self._par_horaire) if fin is None else bisect.bisect_left(self._par_horaire, (fin,))
+            return [self._seances[sid] for _, sid in self._par_horaire[i:j]]
+
+
+def creer_seances_par_defaut(gestion: GestionSeances, films: List[Film], salles: List[Salle]) -> None:
+    """
+    Crée 5 séances par défaut (premier lancement) : le i-ème film dans la i-ème salle.
+    """
+    horaires = [
+        "2025-12-10 18:00",
+        "2025-12-10 20:00",
+        "2025-12-11 18:00",
+        "2025-12-11 20:00",
+        "2025-12-12 21:00"
+    ]
+    for i in range(min(5, len(films), len(salles))):
+        try:
+            gestion.creer_seance(films[i], salles[i], horaires[i])
+        except Exception:
+            pass
 
 
 # petit test rapide
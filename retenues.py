@@ -0,0 +1,80 @@
+"""
+Module : retenues
+Fonction : échéancier unique des places retenues temporairement (toutes séances confondues).
+
+Une place retenue est bloquée pour les autres caisses le temps que le client confirme ;
+sans confirmation, elle est libérée automatiquement à son échéance. Toutes les
+échéances sont rangées dans un même tas (pas un minuteur par place) : retenir une
+place coûte O(log n), et un seul thread se réveille à la prochaine échéance.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import List, Optional, Tuple
+
+
+DUREE_RETENUE = 120.0  # secondes pendant lesquelles une place reste retenue
+
+
+class Echeancier:
+    """
+    Tas d'échéances (instant, n°, séance, index de place).
+    Les entrées devenues inutiles (place confirmée, libérée ou retenue à nouveau)
+    ne sont pas retirées du tas : à l'échéance, la séance vérifie que la retenue
+    correspond toujours (même instant) avant de libérer la place.
+    """
+
+    def __init__(self, automatique: bool = True):
+        self._tas: List[Tuple[float, int, object, int]] = []
+        self._compteur = itertools.count()  # départage les échéances identiques
+        self._condition = threading.Condition()
+        # si vrai, un thread démarré à la première retenue libère les places à échéance
+        self.automatique = automatique
+        self._thread: Optional[threading.Thread] = None
+
+    def planifier(self, echeance: float, seance, idx: int) -> None:
+        """Enregistre l'échéance (horloge time.monotonic) de la retenue d'une place."""
+        with self._condition:
+            heapq.heappush(self._tas, (echeance, next(self._compteur), seance, idx))
+            if self.automatique and self._thread is None:
+                self._thread = threading.Thread(target=self._boucle, daemon=True)
+                self._thread.start()
+            # réveille le thread seulement si cette échéance devient la plus proche
+            if self._tas[0][0] == echeance:
+                self._condition.notify()
+
+    def expirer(self, maintenant: Optional[float] = None) -> int:
+        """Libère les places dont la retenue est échue ; retourne le nombre de places libérées."""
+        if maintenant is None:
+            maintenant = time.monotonic()
+        echues = []
+        with self._condition:
+            while self._tas and self._tas[0][0] <= maintenant:
+                echues.append(heapq.heappop(self._tas))
+        # hors du verrou de l'échéancier : la séance prend son propre verrou
+        return sum(1 for echeance, _, seance, idx in echues if seance._expirer_retenue(idx, echeance))
+
+    def prochaine_echeance(self) -> Optional[float]:
+        """Retourne l'instant de la prochaine échéance, ou None si le tas est vide."""
+        with self._condition:
+            return self._tas[0][0] if self._tas else None
+
+    def _boucle(self) -> None:
+        while True:
+            with self._condition:
+                while not self._tas:
+                    self._condition.wait()
+                attente = self._tas[0][0] - time.monotonic()
+                if attente > 0:
+                    self._condition.wait(attente)
+                    continue
+            self.expirer()
+
+    def __len__(self) -> int:
+        return len(self._tas)
+
+
+# échéancier partagé par toutes les séances
+ECHEANCIER = Echeancier()
@@ -6,7 +6,7 @@ Fonction : gestion des salles et affectation de films à des salles.
 
 import os
 import sys
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, ValuesView
 
 # Assure que le répertoire du fichier est dans sys.path
 # pour que l'import "from film import ..." fonctionne,
@@ -14,6 +14,8 @@ from typing import Dict, List, Optional
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from film import Film, GestionFilms
+from plan_salle import CAPACITE_MAX, COLONNES_PAR_DEFAUT, Disposition, PlanSalle, plan_pour
+from vues import paginer
 
 
 class SalleDejaExistanteError(Exception):
@@ -30,16 +32,32 @@ class Salle:
     """
     Représente une salle de cinéma pouvant projeter un film.
     Chaque salle a un numéro, une capacité et peut être associée à un film.
+    La disposition des places (colonnes, allées, emplacements sans siège) est fixée à la création ;
+    le plan correspondant est calculé à la première demande et partagé par toutes les séances.
     """
 
-    def __init__(self, numero: int, capacite: int):
+    __slots__ = ('numero', 'capacite', 'disposition', 'film', '_plan')
+
+    def __init__(self, numero: int, capacite: int, colonnes: int = COLONNES_PAR_DEFAUT,
+                 allees: Iterable[int] = (), absentes: Iterable[str] = ()):
         # Vérifie que la capacité est positive
         if capacite <= 0:
             raise ValueError("La capacité d'une salle doit être strictement positive.")
+        if capacite > CAPACITE_MAX:
+            raise ValueError(f"La capacité d'une salle ne peut pas dépasser {CAPACITE_MAX} places.")
 
         self.numero = numero
         self.capacite = capacite
+        self.disposition = Disposition(colonnes, tuple(sorted(set(allees))), frozenset(absentes))
         self.film: Optional[Film] = None  # film actuellement projeté dans la salle
+        self._plan: Optional[PlanSalle] = None
+
+    @property
+    def plan_salle(self) -> PlanSalle:
+        """Plan des places de la salle (immuable, partagé avec les salles de même disposition)."""
+        if self._plan is None:
+            self._plan = plan_pour(self.capacite, self.disposition)
+        return self._plan
 
     def affecter_film(self, film: Film) -> None:
         """Associe un film à la salle."""
@@ -61,18 +79,32 @@ class GestionSalles:
 
     def __init__(self):
         self._salles: Dict[int, Salle] = {}
+        # objets prévenus des modifications (ex: stockage persistant)
+        self._ecouteurs: List[object] = []
+
+    def ajouter_ecouteur(self, ecouteur: object) -> None:
+        """Enregistre un objet prévenu des modifications (salle_ajoutee, salle_supprimee, film_affecte)."""
+        self._ecouteurs.append(ecouteur)
+
+    def _notifier(self, evenement: str, *args) -> None:
+        for e in self._ecouteurs:
+            rappel = getattr(e, evenement, None)
+            if rappel is not None:
+                rappel(*args)
 
     def ajouter_salle(self, salle: Salle) -> None:
         """Ajoute une salle au système, lève une exception si le numéro existe déjà."""
         if salle.numero in self._salles:
             raise SalleDejaExistanteError(f"La salle {salle.numero} existe déjà.")
         self._salles[salle.numero] = salle
+        self._notifier('salle_ajoutee', salle)
 
     def supprimer_salle(self, numero: int) -> None:
         """Supprime une salle par son numéro, lève une exception si elle n'existe pas."""
         if numero not in self._salles:
             raise SalleInexistanteError(f"La salle {numero} n'existe pas.")
         del self._salles[numero]
+        self._notifier('salle_supprimee', numero)
 
     def get_salle(self, numero: int) -> Salle:
         """Retourne la salle par son numéro, lève une exception si elle n'existe pas."""
@@ -84,10 +116,31 @@ class GestionSalles:
         """Retourne la liste de toutes les salles enregistrées."""
         return list(self._salles.values())
 
+    def salles(self) -> ValuesView[Salle]:
+        """
+        Vue en lecture seule (sans copie) des salles enregistrées, tenue à jour.
+        Les salles ne doivent pas être ajoutées ou supprimées pendant qu'on la parcourt.
+        """
+        return self._salles.values()
+
+    def chercher_salles(self, filtre: Optional[Callable[[Salle], bool]] = None,
+                        cle: Optional[Callable[[Salle], Any]] = None, inverse: bool = False,
+                        debut: int = 0, limite: Optional[int] = None) -> List[Salle]:
+        """Page de salles filtrées et triées (voir vues.paginer), ex: filtre=lambda s: s.capacite >= 200."""
+        return paginer(self._salles.values(), filtre, cle, inverse, debut, limite)
+
     def affecter_film_a_salle(self, numero_salle: int, film: Film) -> None:
         """Associe un film à une salle donnée par son numéro."""
         salle = self.get_salle(numero_salle)
         salle.affecter_film(film)
+        self._notifier('film_affecte', salle)
+
+    def film_supprime(self, titre: str) -> None:
+        """Écouteur de GestionFilms : les salles qui projetaient le film supprimé n'ont plus de film."""
+        for salle in self._salles.values():
+            if salle.film is not None and salle.film.titre == titre:
+                salle.film = None
+                self._notifier('film_affecte', salle)
 
 
 def salles_par_defaut() -> GestionSalles:
@@ -0,0 +1,336 @@
+"""
+Module : serveur
+Fonction : service HTTP/JSON sans interface graphique (bornes, site web) autour des gestionnaires.
+
+Routes :
+    GET  /films?genre=                     liste des films
+    GET  /films?q=&genre=&duree_min=&duree_max=  recherche par mots du titre (préfixe, fautes tolérées)
+    GET  /seances?film=&salle=&debut=&fin=  recherche de séances (triées par horaire)
+    Les listes acceptent une pagination : decalage= (éléments sautés) et limite= (taille de la page).
+    GET  /seances/<id>                     séance et plan de salle (une chaîne "0"/"1" par rangée)
+    POST /seances/<id>/reservations        {"client": ..., "places": [...]} ou {"client": ..., "nombre": n}
+
+Serveur asyncio mono-thread (bibliothèque standard uniquement) : les opérations sur les
+gestionnaires sont courtes et s'exécutent directement dans la boucle, sans verrou disputé.
+Lancement : python3 serveur.py [--hote 127.0.0.1] [--port 8080]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import sqlite3
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from film import Film, FilmInexistantError, GestionFilms, charger_films_csv
+from salle import GestionSalles, SalleInexistanteError, salles_par_defaut
+from reservation import GestionSeances, SallePleineError, Seance, creer_seances_par_defaut
+from plan_salle import PlaceInexistanteError, etiquette_rangee
+from stockage import StockageSQLite
+from recherche import IndexFilms
+
+
+HOTE = '127.0.0.1'
+PORT = 8080
+TAILLE_MAX_CORPS = 64 * 1024  # octets acceptés pour le corps d'une requête
+INTERVALLE_FLUSH = 1.0        # secondes entre deux écritures des modifications en attente
+CHEMIN_DB = os.environ.get('CINEMA_DB') or os.path.join(os.path.dirname(os.path.abspath(__file__)), "cinema.db")
+
+_log = logging.getLogger(__name__)
+
+
+class ErreurRequete(Exception):
+    """Exception levée pour une requête invalide ; porte le code HTTP à renvoyer."""
+
+    def __init__(self, statut: int, message: str):
+        super().__init__(message)
+        self.statut = statut
+
+
+def _film_json(film) -> dict:
+    return {'titre': film.titre, 'duree': film.duree, 'genre': film.genre}
+
+
+def _seance_json(s: Seance) -> dict:
+    return {'id': s.id, 'film': s.film.titre, 'salle': s.salle.numero, 'horaire': s.horaire,
+            'places_disponibles': s.places_disponibles(), 'capacite': s.salle.capacite}
+
+
+class ServiceCinema:
+    """
+    Traduit les requêtes HTTP en appels aux gestionnaires et les réponses en JSON.
+    Indépendant du transport : `traiter(methode, chemin, corps)` -> (statut, objet JSON).
+    """
+
+    def __init__(self, films: GestionFilms, salles: GestionSalles, seances: GestionSeances):
+        self.films = films
+        self.recherche = IndexFilms(films)
+        self.salles = salles
+        self.seances = seances
+
+    def traiter(self, methode: str, chemin: str, corps: bytes) -> Tuple[int, object]:
+        try:
+            url = urlsplit(chemin)
+            parties = [unquote(p) for p in url.path.strip('/').split('/') if p]
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if parties == ['films'] and methode == 'GET' and ('q' in params or 'duree_min' in params
+                                                             or 'duree_max' in params):
+                return HTTPStatus.OK, [_film_json(f) for f in self._chercher_films(params)]
+            if parties == ['films'] and methode == 'GET':
+                genre = params.get('genre')
+                films = self.films.chercher_films(None if genre is None else (lambda f: f.genre == genre),
+                                                  debut=self._decalage(params), limite=self._limite(params))
+                return HTTPStatus.OK, [_film_json(f) for f in films]
+            if parties == ['seances'] and methode == 'GET':
+                return HTTPStatus.OK, [_seance_json(s) for s in self._chercher_seances(params)]
+            if len(parties) == 2 and parties[0] == 'seances' and methode == 'GET':
+                return HTTPStatus.OK, self._seance_et_plan(self._seance(parties[1]))
+            if len(parties) == 3 and parties[0] == 'seances' and parties[2] == 'reservations':
+                if methode != 'POST':
+                    raise ErreurRequete(HTTPStatus.METHOD_NOT_ALLOWED, "Méthode non autorisée.")
+                return HTTPStatus.CREATED, self._reserver(self._seance(parties[1]), corps)
+            raise ErreurRequete(HTTPStatus.NOT_FOUND, f"Aucune ressource {url.path}.")
+        except ErreurRequete as e:
+            return e.statut, {'erreur': str(e)}
+        except SallePleineError as e:
+            return HTTPStatus.CONFLICT, {'erreur': str(e)}
+        except (KeyError, FilmInexistantError, SalleInexistanteError) as e:
+            return HTTPStatus.NOT_FOUND, {'erreur': str(e).strip("'\"")}
+        except (ValueError, PlaceInexistanteError) as e:
+            return HTTPStatus.BAD_REQUEST, {'erreur': str(e)}
+        except Exception as e:
+            # bogue : une réponse 500 plutôt qu'une connexion coupée
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'erreur': f"Erreur interne : {e}"}
+
+    def _seance(self, texte: str) -> Seance:
+        if not texte.isdigit():
+            raise ErreurRequete(HTTPStatus.NOT_FOUND, f"La séance #{texte} n'existe pas.")
+        return self.seances.get_seance(int(texte))
+
+    def _chercher_seances(self, params: Dict[str, str]) -> List[Seance]:
+        # l'index le plus sélectif d'abord, puis filtrage du reste
+        decalage, limite = self._decalage(params), self._limite(params)
+        if 'film' not in params and 'salle' not in params:
+            fin = None if limite is None else decalage + limite
+            return self.seances.seances_entre(params.get('debut'), params.get('fin'))[decalage:fin]
+        debut, fin = params.get('debut'), params.get('fin')
+        return self.seances.chercher_seances(
+            lambda s: (debut is None or s.horaire >= debut) and (fin is None or s.horaire < fin),
+            cle=lambda s: (s.horaire, s.id), debut=decalage, limite=limite,
+            film=params.get('film'), salle=self._entier(params, 'salle') if 'salle' in params else None)
+
+    def _chercher_films(self, params: Dict[str, str]) -> List[Film]:
+        decalage, limite = self._decalage(params), self._limite(params)
+        films = self.recherche.chercher(
+            params.get('q', ''), params.get('genre'),
+            self._entier(params, 'duree_min') if 'duree_min' in params else None,
+            self._entier(params, 'duree_max') if 'duree_max' in params else None,
+            limite=None if limite is None else decalage + limite)
+        return films[decalage:]
+
+    @classmethod
+    def _decalage(cls, params: Dict[str, str]) -> int:
+        decalage = cls._entier(params, 'decalage') if 'decalage' in params else 0
+        if decalage < 0:
+            raise ErreurRequete(HTTPStatus.BAD_REQUEST, "Paramètre 'decalage' : entier positif attendu.")
+        return decalage
+
+    @classmethod
+    def _limite(cls, params: Dict[str, str]) -> Optional[int]:
+        limite = cls._entier(params, 'limite') if 'limite' in params else None
+        if limite is not None and limite < 0:
+            raise ErreurRequete(HTTPStatus.BAD_REQUEST, "Paramètre 'limite' : entier positif attendu.")
+        return limite
+
+    @staticmethod
+    def _entier(params: Dict[str, str], cle: str) -> int:
+        try:
+            return int(params[cle])
+        except ValueError:
+            raise ErreurRequete(HTTPStatus.BAD_REQUEST, f"Paramètre '{cle}' : entier attendu.")
+
+    @staticmethod
+    def _seance_et_plan(s: Seance) -> dict:
+        resultat = _seance_json(s)
+        rangees = s.plan
+        resultat['plan'] = {
+            # une rangée peut être vide (tous ses emplacements sans siège) : lettre tirée de son indice
+            'rangees': [etiquette_rangee(i) for i in range(len(rangees))],
+            'occupation': [''.join('0' if s.est_place_disponible(p) else '1' for p in r) for r in rangees],
+        }
+        return resultat
+
+    @staticmethod
+    def _reserver(s: Seance, corps: bytes) -> dict:
+        try:
+            demande = json.loads(corps or b'{}')
+        except ValueError:
+            raise ErreurRequete(HTTPStatus.BAD_REQUEST, "Corps JSON invalide.")
+        client = demande.get('client') if isinstance(demande, dict) else None
+        if not isinstance(client, str) or not client.strip():
+            raise ErreurRequete(HTTPStatus.BAD_REQUEST, "Le nom du client est obligatoire.")
+        if 'places' in demande:
+            places = demande['places']
+            if not isinstance(places, list) or not places or not all(isinstance(p, str) for p in places):
+                raise ErreurRequete(HTTPStatus.BAD_REQUEST, "'places' : liste d'étiquettes attendue.")
+            reservations = s.reserver_places(client, places)
+        else:
+            nombre = demande.get('nombre', 1)
+            if not isinstance(nombre, int) or isinstance(nombre, bool):
+                raise ErreurRequete(HTTPStatus.BAD_REQUEST, "'nombre' : entier attendu.")
+            reservations = s.reserver_groupe(client, nombre)
+        return {'seance': s.id, 'client': client, 'places': [r.place for r in reservations]}
+
+
+def encoder_json(objet: object) -> bytes:
+    return json.dumps(objet, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class ServeurHTTP:
+    """
+    Serveur HTTP/1.1 minimal sur asyncio.start_server (connexions persistantes).
+    `_traiter` (surchargeable) produit le statut et le corps JSON déjà encodé de chaque réponse.
+    """
+
+    def __init__(self, service: Optional[ServiceCinema], hote: str = HOTE, port: int = PORT):
+        self.service = service
+        self.hote = hote
+        self.port = port
+        self._serveur: Optional[asyncio.AbstractServer] = None
+
+    async def demarrer(self) -> None:
+        self._serveur = await asyncio.start_server(self._connexion, self.hote, self.port)
+        # port effectif (utile si port=0 : choisi par le système)
+        self.port = self._serveur.sockets[0].getsockname()[1]
+
+    async def servir_indefiniment(self) -> None:
+        await self._serveur.serve_forever()
+
+    async def arreter(self) -> None:
+        if self._serveur is not None:
+            self._serveur.close()
+            await self._serveur.wait_closed()
+
+    async def _connexion(self, lecteur: asyncio.StreamReader, ecrivain: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                ligne = await lecteur.readline()
+                if not ligne:
+                    break
+                try:
+                    methode, chemin, version = ligne.decode('latin-1').split()
+                except ValueError:
+                    await self._repondre(ecrivain, HTTPStatus.BAD_REQUEST, encoder_json({'erreur': "Requête invalide."}), False)
+                    break
+                entetes = {}
+                while True:
+                    ligne = await lecteur.readline()
+                    if ligne in (b'\r\n', b'\n', b''):
+                        break
+                    nom, _, valeur = ligne.decode('latin-1').partition(':')
+                    entetes[nom.strip().lower()] = valeur.strip()
+                connexion = entetes.get('connection', '').lower()
+                garder = connexion != 'close' if version == 'HTTP/1.1' else connexion == 'keep-alive'
+                longueur = entetes.get('content-length', '0')
+                if not longueur.isdigit():
+                    await self._repondre(ecrivain, HTTPStatus.BAD_REQUEST,
+                                         encoder_json({'erreur': "Content-Length invalide."}), False)
+                    break
+                longueur = int(longueur)
+                if longueur > TAILLE_MAX_CORPS:
+                    await self._repondre(ecrivain, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                         encoder_json({'erreur': "Corps de requête trop volumineux."}), False)
+                    break
+                corps = await lecteur.readexactly(longueur) if longueur else b''
+                statut, reponse = await self._traiter(methode, chemin, corps)
+                await self._repondre(ecrivain, statut, reponse, garder)
+                if not garder:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            ecrivain.close()
+
+    async def _traiter(self, methode: str, chemin: str, corps: bytes) -> Tuple[int, bytes]:
+        statut, objet = self.service.traiter(methode, chemin, corps)
+        return statut, encoder_json(objet)
+
+    @staticmethod
+    async def _repondre(ecrivain: asyncio.StreamWriter, statut: int, corps: bytes, garder: bool) -> None:
+        statut = HTTPStatus(statut)
+        entete = (f"HTTP/1.1 {statut.value} {statut.phrase}\r\n"
+                  f"Content-Type: application/json; charset=utf-8\r\n"
+                  f"Content-Length: {len(corps)}\r\n"
+                  f"Connection: {'keep-alive' if garder else 'close'}\r\n\r\n")
+        ecrivain.write(entete.encode('latin-1') + corps)
+        await ecrivain.drain()
+
+
+def ouvrir_donnees(stockage: StockageSQLite) -> Tuple[GestionFilms, GestionSalles, GestionSeances]:
+    """Charge les gestionnaires depuis la base, ou les données initiales si elle est vide (comme gui.py)."""
+    if stockage.est_vide():
+        films = charger_films_csv(os.path.join(os.path.dirname(os.path.abspath(__file__)), "films_init.csv"))
+        salles = salles_par_defaut()
+        seances = GestionSeances()
+        creer_seances_par_defaut(seances, films.lister_films(), salles.lister_salles())
+        stockage.sauver_tout(films, salles, seances)
+    else:
+        films, salles, seances = stockage.charger()
+    stockage.attacher(films, salles, seances)
+    seances.suivre(films, salles)
+    return films, salles, seances
+
+
+async def _flush_periodique(stockage: StockageSQLite) -> None:
+    while True:
+        await asyncio.sleep(INTERVALLE_FLUSH)
+        try:
+            stockage.flush()
+        except sqlite3.Error as e:
+            # les modifications restent en attente : nouvel essai au prochain passage
+            _log.warning("Écriture dans la base impossible : %s", e)
+
+
+def _arreter_sur_sigterm() -> None:
+    # SIGTERM annule la tâche principale : les blocs finally écrivent les modifications en attente
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except (NotImplementedError, AttributeError):
+        pass  # Windows
+
+
+async def servir(hote: str = HOTE, port: int = PORT, chemin_db: str = CHEMIN_DB) -> None:
+    stockage = StockageSQLite(chemin_db)
+    try:
+        serveur = ServeurHTTP(ServiceCinema(*ouvrir_donnees(stockage)), hote, port)
+        await serveur.demarrer()
+        _arreter_sur_sigterm()
+        print(f"Service cinéma sur http://{serveur.hote}:{serveur.port}/")
+        flush = asyncio.ensure_future(_flush_periodique(stockage))
+        try:
+            await serveur.servir_indefiniment()
+        finally:
+            flush.cancel()
+            await serveur.arreter()
+    finally:
+        stockage.fermer()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service HTTP/JSON de réservation (sans interface graphique).")
+    parser.add_argument('--hote', default=HOTE)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--db', default=CHEMIN_DB, help="base SQLite (par défaut : CINEMA_DB ou cinema.db)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(servir(args.hote, args.port, args.db))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+if __name__ == "__main__":
+    main()
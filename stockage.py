@@ -0,0 +1,286 @@
+"""
+Module : stockage
+Fonction : persistance des films, salles, séances et réservations dans une base SQLite.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from film import Film, GestionFilms
+from salle import Salle, GestionSalles
+from plan_salle import DISPOSITION_PAR_DEFAUT
+from reservation import GestionSeances, Reservation, Seance
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS films (
+    titre TEXT PRIMARY KEY,
+    duree INTEGER NOT NULL,
+    genre TEXT,
+    affiche TEXT
+);
+CREATE TABLE IF NOT EXISTS salles (
+    numero INTEGER PRIMARY KEY,
+    capacite INTEGER NOT NULL,
+    film_titre TEXT,
+    disposition TEXT
+);
+CREATE TABLE IF NOT EXISTS seances (
+    id INTEGER PRIMARY KEY,
+    film_titre TEXT NOT NULL,
+    salle_numero INTEGER NOT NULL,
+    horaire TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reservations (
+    seance_id INTEGER NOT NULL,
+    place TEXT NOT NULL,
+    client_nom TEXT NOT NULL,
+    PRIMARY KEY (seance_id, place)
+);
+CREATE INDEX IF NOT EXISTS reservations_client ON reservations (client_nom);
+CREATE INDEX IF NOT EXISTS seances_salle ON seances (salle_numero);
+"""
+
+# Requêtes paramétrées : sqlite3 garde les instructions préparées en cache
+SQL_FILM = "INSERT OR REPLACE INTO films (titre, duree, genre, affiche) VALUES (?, ?, ?, ?)"
+SQL_FILM_SUPPR = "DELETE FROM films WHERE titre = ?"
+SQL_SALLE = "INSERT OR REPLACE INTO salles (numero, capacite, film_titre, disposition) VALUES (?, ?, ?, ?)"
+SQL_SALLE_SUPPR = "DELETE FROM salles WHERE numero = ?"
+SQL_SEANCE = "INSERT OR REPLACE INTO seances (id, film_titre, salle_numero, horaire) VALUES (?, ?, ?, ?)"
+SQL_SEANCE_SUPPR = "DELETE FROM seances WHERE id = ?"
+SQL_RESERVATIONS_SEANCE_SUPPR = "DELETE FROM reservations WHERE seance_id = ?"
+SQL_RESERVATION = "INSERT OR REPLACE INTO reservations (seance_id, place, client_nom) VALUES (?, ?, ?)"
+SQL_RESERVATION_SUPPR = "DELETE FROM reservations WHERE seance_id = ? AND place = ?"
+
+TAILLE_LOT = 500     # écritures regroupées dans une même transaction
+DELAI_MAX_LOT = 1.0  # secondes avant qu'un lot incomplet soit écrit
+
+_log = logging.getLogger(__name__)
+
+
+def _ligne_salle(salle: Salle) -> tuple:
+    # disposition en JSON, NULL pour la disposition par défaut
+    d = salle.disposition
+    disposition = None if d == DISPOSITION_PAR_DEFAUT else json.dumps(
+        {'colonnes': d.colonnes, 'allees': list(d.allees), 'absentes': sorted(d.absentes)})
+    return salle.numero, salle.capacite, salle.film.titre if salle.film else None, disposition
+
+
+class StockageSQLite:
+    """
+    Stockage SQLite (mode WAL) branché sur les gestionnaires via leurs écouteurs.
+    Les écritures sont mises en file et appliquées par lots (executemany dans une
+    seule transaction) par un thread d'écriture, dès que le lot est plein ou au plus tard
+    `delai_max` secondes après sa première écriture ; `flush` force l'écriture du lot en cours.
+    Les écouteurs ne font que mettre en file : aucun accès à la base sous le verrou d'une séance.
+    """
+
+    def __init__(self, chemin: str, taille_lot: int = TAILLE_LOT, delai_max: float = DELAI_MAX_LOT):
+        self.chemin = chemin
+        self.taille_lot = taille_lot
+        self.delai_max = delai_max
+        self._conn = sqlite3.connect(chemin, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        colonnes = {nom for _, nom, *_ in self._conn.execute("PRAGMA table_info(salles)")}
+        if 'disposition' not in colonnes:  # base créée avant les dispositions de salle
+            self._conn.execute("ALTER TABLE salles ADD COLUMN disposition TEXT")
+        self._verrou = threading.RLock()  # connexion SQLite
+        self._file = threading.Condition(threading.Lock())  # protège _en_attente et _debut_lot
+        self._en_attente: List[Tuple[str, tuple]] = []
+        self._debut_lot: Optional[float] = None
+        self._fil: Optional[threading.Thread] = None  # thread d'écriture, démarré à la première écriture
+        self._ferme = False
+
+    # --- écritures groupées ---
+
+    def _ecrire(self, sql: str, params: tuple) -> None:
+        with self._file:
+            if not self._en_attente:
+                self._debut_lot = time.monotonic()
+                self._file.notify()
+            self._en_attente.append((sql, params))
+            if len(self._en_attente) == self.taille_lot:
+                self._file.notify()
+            if self._fil is None:
+                self._fil = threading.Thread(target=self._ecrire_en_fond, daemon=True)
+                self._fil.start()
+
+    def _ecrire_en_fond(self) -> None:
+        while True:
+            with self._file:
+                while not self._ferme:
+                    if not self._en_attente:
+                        self._file.wait()
+                        continue
+                    reste = self._debut_lot + self.delai_max - time.monotonic()
+                    if reste <= 0 or len(self._en_attente) >= self.taille_lot:
+                        break
+                    self._file.wait(reste)
+                if self._ferme:
+                    return
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                # le lot reste en attente : nouvel essai après delai_max
+                _log.warning("Écriture dans la base %s impossible : %s", self.chemin, e)
+                with self._file:
+                    self._debut_lot = time.monotonic()
+
+    def flush(self) -> None:
+        """
+        Écrit toutes les modifications en attente dans une seule transaction.
+        En cas d'échec, elles restent en attente et l'exception (sqlite3.Error) est propagée.
+        """
+        with self._verrou:
+            with self._file:
+                if not self._en_attente:
+                    return
+                lot, self._en_attente = self._en_attente, []
+            try:
+                with self._conn:
+                    # regroupe les requêtes identiques consécutives en un seul executemany
+                    i = 0
+                    while i < len(lot):
+                        sql = lot[i][0]
+                        j = i
+                        while j < len(lot) and lot[j][0] == sql:
+                            j += 1
+                        self._conn.executemany(sql, [params for _, params in lot[i:j]])
+                        i = j
+            except Exception:
+                # transaction annulée (ex: base verrouillée) : le lot sera réécrit au prochain flush
+                with self._file:
+                    self._en_attente[:0] = lot
+                raise
+
+    def fermer(self) -> None:
+        """Arrête le thread d'écriture, écrit les modifications en attente et ferme la base."""
+        with self._file:
+            self._ferme = True
+            self._file.notify()
+        if self._fil is not None:
+            self._fil.join()
+        self.flush()
+        self._conn.close()
+
+    # --- écouteurs des gestionnaires ---
+
+    def film_ajoute(self, film: Film) -> None:
+        self._ecrire(SQL_FILM, (film.titre, film.duree, film.genre, film.affiche))
+
+    film_modifie = film_ajoute
+
+    def film_supprime(self, titre: str) -> None:
+        self._ecrire(SQL_FILM_SUPPR, (titre,))
+
+    def salle_ajoutee(self, salle: Salle) -> None:
+        self._ecrire(SQL_SALLE, _ligne_salle(salle))
+
+    film_affecte = salle_ajoutee
+
+    def salle_supprimee(self, numero: int) -> None:
+        self._ecrire(SQL_SALLE_SUPPR, (numero,))
+
+    def seance_creee(self, seance: Seance) -> None:
+        self._ecrire(SQL_SEANCE, (seance.id, seance.film.titre, seance.salle.numero, seance.horaire))
+
+    def seance_supprimee(self, seance: Seance) -> None:
+        self._ecrire(SQL_RESERVATIONS_SEANCE_SUPPR, (seance.id,))
+        self._ecrire(SQL_SEANCE_SUPPR, (seance.id,))
+
+    def reservation_ajoutee(self, seance: Seance, r: Reservation) -> None:
+        self._ecrire(SQL_RESERVATION, (r.seance_id, r.place, r.client_nom))
+
+    def reservation_annulee(self, seance: Seance, r: Reservation) -> None:
+        self._ecrire(SQL_RESERVATION_SUPPR, (r.seance_id, r.place))
+
+    # --- chargement / sauvegarde complète ---
+
+    def est_vide(self) -> bool:
+        """Indique si la base ne contient encore aucun film ni aucune salle."""
+        with self._verrou:
+            cur = self._conn.execute("SELECT EXISTS(SELECT 1 FROM films) OR EXISTS(SELECT 1 FROM salles)")
+            return not cur.fetchone()[0]
+
+    def numeros_salles(self) -> List[int]:
+        """Retourne les numéros des salles enregistrées."""
+        with self._verrou:
+            return [n for n, in self._conn.execute("SELECT numero FROM salles ORDER BY numero")]
+
+    def salles_des_seances(self) -> Dict[int, int]:
+        """Retourne, pour chaque séance enregistrée, le numéro de sa salle."""
+        with self._verrou:
+            self.flush()
+            return dict(self._conn.execute("SELECT id, salle_numero FROM seances"))
+
+    def attacher(self, films: GestionFilms, salles: GestionSalles, seances: GestionSeances) -> None:
+        """Branche le stockage sur les gestionnaires : chaque modification sera persistée."""
+        films.ajouter_ecouteur(self)
+        salles.ajouter_ecouteur(self)
+        seances.ajouter_ecouteur(self)
+
+    def sauver_tout(self, films: GestionFilms, salles: GestionSalles, seances: GestionSeances) -> None:
+        """Écrit l'état complet des gestionnaires (première initialisation de la base)."""
+        with self._verrou:
+            self.flush()
+            with self._conn:
+                self._conn.executemany(SQL_FILM, ((f.titre, f.duree, f.genre, f.affiche) for f in films.films()))
+                self._conn.executemany(SQL_SALLE, (_ligne_salle(s) for s in salles.salles()))
+                self._conn.executemany(SQL_SEANCE, [(s.id, s.film.titre, s.salle.numero, s.horaire)
+                                                    for s in seances.lister_seances()])
+                self._conn.executemany(SQL_RESERVATION, [(r.seance_id, r.place, r.client_nom)
+                                                         for s in seances.lister_seances()
+                                                         for r in s.lister_reservations()])
+
+    def charger(self, numeros_salles: Optional[Set[int]] = None) -> Tuple[GestionFilms, GestionSalles, GestionSeances]:
+        """
+        Reconstruit les gestionnaires à partir de la base.
+        Les séances dont le film ou la salle n'existe plus ne sont pas rechargées.
+        `numeros_salles` limite les séances (et leurs réservations) rechargées à ces salles.
+        """
+        films, salles, seances = GestionFilms(), GestionSalles(), GestionSeances()
+        with self._verrou:
+            self.flush()
+            c = self._conn
+            for titre, duree, genre, affiche in c.execute("SELECT titre, duree, genre, affiche FROM films"):
+                films.ajouter_film(Film(titre, duree, genre, affiche))
+            for numero, capacite, film_titre, disposition in c.execute(
+                    "SELECT numero, capacite, film_titre, disposition FROM salles"):
+                salle = Salle(numero, capacite, **json.loads(disposition)) if disposition else Salle(numero, capacite)
+                if film_titre and films.existe_film(film_titre):
+                    salle.affecter_film(films.get_film(film_titre))
+                salles.ajouter_salle(salle)
+            # filtre par salle appliqué par SQLite : seules les lignes des salles demandées sont lues
+            filtre, params = "", ()
+            if numeros_salles is not None:
+                params = tuple(sorted(numeros_salles))
+                filtre = f" WHERE seances.salle_numero IN ({', '.join('?' * len(params))})"
+            par_id = {}
+            for sid, film_titre, numero, horaire in c.execute(
+                    "SELECT id, film_titre, salle_numero, horaire FROM seances" + filtre + " ORDER BY id", params):
+                if not films.existe_film(film_titre):
+                    continue
+                try:
+                    salle = salles.get_salle(numero)
+                    # rechargée telle quelle, même si elle chevauche une autre séance
+                    par_id[sid] = seances.creer_seance(films.get_film(film_titre), salle, horaire,
+                                                       seance_id=sid, verifier=False)
+                except Exception:
+                    continue  # salle supprimée ou horaire illisible
+            requete = "SELECT seance_id, place, client_nom FROM reservations"
+            if filtre:
+                requete += " JOIN seances ON seances.id = reservations.seance_id" + filtre
+            for sid, place, client_nom in c.execute(requete + " ORDER BY seance_id", params):
+                seance = par_id.get(sid)
+                if seance is not None:
+                    try:
+                        seance.reserver(client_nom, place)
+                    except Exception:
+                        pass  # place invalide (ex: capacité réduite)
+        return films, salles, seances
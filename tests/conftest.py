@@ -0,0 +1,67 @@
+import json
+import os
+import sys
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# les modules du projet sont à la racine du dépôt
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import affiches  # noqa: E402
+
+
+class ServeurAffiches:
+    """
+    Serveur HTTP local imitant OMDb, TMDb et le téléchargement d'images ; compte les requêtes reçues.
+    Les titres commençant par "Inconnu" n'ont pas d'affiche.
+    """
+
+    def __init__(self):
+        serveur = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with serveur._verrou:
+                    serveur.nb_requetes += 1
+                url = urllib.parse.urlparse(self.path)
+                if url.path == "/omdb":
+                    titre = urllib.parse.parse_qs(url.query).get('t', [''])[0]
+                    poster = "N/A" if titre.startswith("Inconnu") else \
+                        f"http://127.0.0.1:{serveur.port}/img/{urllib.parse.quote(titre)}.jpg"
+                    corps, type_ = json.dumps({"Poster": poster}).encode(), "application/json"
+                elif url.path == "/tmdb":
+                    corps, type_ = json.dumps({"results": []}).encode(), "application/json"
+                else:
+                    corps, type_ = b"\xff\xd8\xff" + b"0" * 1000, "image/jpeg"
+                self.send_response(200)
+                self.send_header("Content-Type", type_)
+                self.send_header("Content-Length", str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+        self._verrou = threading.Lock()
+        self.nb_requetes = 0
+        self._serveur = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._serveur.daemon_threads = True
+        self.port = self._serveur.server_address[1]
+        threading.Thread(target=self._serveur.serve_forever, daemon=True).start()
+
+    def fermer(self):
+        self._serveur.shutdown()
+        self._serveur.server_close()
+
+
+@pytest.fixture
+def serveur_affiches(monkeypatch):
+    """Serveur d'affiches local, à la place d'OMDb et de TMDb le temps du test."""
+    serveur = ServeurAffiches()
+    monkeypatch.setattr(affiches, "OMDB_URL", f"http://127.0.0.1:{serveur.port}/omdb")
+    monkeypatch.setattr(affiches, "TMDB_URL", f"http://127.0.0.1:{serveur.port}/tmdb")
+    yield serveur
+    serveur.fermer()
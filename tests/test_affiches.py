@@ -0,0 +1,57 @@
+import os
+import time
+
+import affiches
+from film import Film
+
+
+def _attendre(prefetch, nombre, delai=10.0):
+    recues = {}
+    limite = time.monotonic() + delai
+    while len(recues) < nombre and time.monotonic() < limite:
+        prefetch.traiter_resultats(lambda f, chemin, miniature: recues.__setitem__(f.titre, chemin))
+        time.sleep(0.005)
+    return recues
+
+
+def test_prechargement_en_arriere_plan(serveur_affiches, tmp_path):
+    films = [Film(f"Film {i}", 100) for i in range(6)] + [Film("Inconnu", 100)]
+    prefetch = affiches.PrefetchAffiches(nb_threads=3, dossier=str(tmp_path))
+    prefetch.demander(films)
+    prefetch.demander(films[:2])  # déjà en file : ignorés
+    recues = _attendre(prefetch, len(films))
+    assert recues["Inconnu"] is None
+    assert sorted(os.path.basename(recues[f.titre]) for f in films[:6]) == [f"Film_{i}.jpg" for i in range(6)]
+    assert all(os.path.getsize(recues[f.titre]) > 0 for f in films[:6])
+    assert prefetch.en_attente() == 0
+    time.sleep(0.05)
+    assert prefetch.traiter_resultats(lambda *r: None) == 0  # aucun film traité deux fois
+
+
+def test_cache_evite_les_requetes(serveur_affiches, tmp_path):
+    films = [Film("Film 1", 100), Film("Inconnu", 100)]
+    chemin_cache = str(tmp_path / affiches.FICHIER_CACHE)
+    cache = affiches.CacheAffiches(chemin_cache)
+    assert affiches.recuperer_affiche(films[0], str(tmp_path), cache).endswith("Film_1.jpg")
+    assert affiches.recuperer_affiche(films[1], str(tmp_path), cache) is None
+    cache.sauver()
+    premieres = serveur_affiches.nb_requetes
+    # second lancement : affiche sur disque et absence mémorisée, aucune requête
+    cache = affiches.CacheAffiches(chemin_cache)
+    assert cache.get("Inconnu")['statut'] == 'absent'
+    assert affiches.recuperer_affiche(films[0], str(tmp_path), cache).endswith("Film_1.jpg")
+    assert affiches.recuperer_affiche(films[1], str(tmp_path), cache) is None
+    assert serveur_affiches.nb_requetes == premieres
+    # absence expirée : nouvelle recherche
+    cache = affiches.CacheAffiches(chemin_cache, ttl_absent=0)
+    affiches.recuperer_affiche(films[1], str(tmp_path), cache)
+    assert serveur_affiches.nb_requetes > premieres
+
+
+def test_cache_lru():
+    cache = affiches.CacheLRU(taille_max=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # "b" est le moins récemment utilisé
+    assert cache.get("b") is None and cache.get("a") == 1 and len(cache) == 2
@@ -0,0 +1,64 @@
+import pytest
+
+import analyses
+from analyses import TableSeances, carte_chaleur, meilleures_ventes, remplissage, ventes
+from film import Film
+from salle import Salle
+from reservation import GestionSeances
+
+
+@pytest.fixture
+def gestion():
+    inception = Film("Inception", 148, "Science-fiction")
+    matrix = Film("Matrix", 136, "Action")
+    petite, grande = Salle(1, 4, colonnes=2), Salle(2, 10, colonnes=5)
+    gs = GestionSeances()
+    a = gs.creer_seance(inception, petite, "2025-01-01 10:00")
+    b = gs.creer_seance(inception, petite, "2025-01-02 20:00")
+    c = gs.creer_seance(matrix, grande, "2025-01-02 10:00")
+    a.reserver_places("alice", ["A1", "A2", "B1"])
+    b.reserver("bob", "A1")
+    c.reserver_places("carole", ["A1", "A2", "A3", "A4", "A5", "B1"])
+    return gs
+
+
+def test_remplissage_et_ventes(gestion):
+    table = TableSeances.depuis_gestion(gestion)
+    assert len(table) == 3
+    assert remplissage(table, 'film') == {"Inception": 0.5, "Matrix": 0.6}
+    assert remplissage(table, 'salle') == {1: 0.5, 2: 0.6}
+    assert remplissage(table, 'jour') == {"2025-01-01": 0.75, "2025-01-02": 0.5}
+    assert remplissage(table, 'creneau') == {10: 9 / 14, 20: 0.25}
+    assert ventes(table, 'film') == {"Inception": 4, "Matrix": 6}
+    assert ventes(table, 'jour') == {"2025-01-01": 3, "2025-01-02": 7}
+    with pytest.raises(ValueError):
+        remplissage(table, 'genre')
+    assert remplissage(TableSeances(), 'jour') == {}
+
+
+def test_meilleures_ventes(gestion):
+    table = TableSeances.depuis_gestion(gestion)
+    assert meilleures_ventes(table) == [("Matrix", 6), ("Inception", 4)]
+    assert meilleures_ventes(table, 1) == [("Matrix", 6)]
+
+
+def test_colonnes_aller_retour(gestion, tmp_path):
+    table = TableSeances.depuis_gestion(gestion)
+    table.ecrire_colonnes(str(tmp_path))
+    relue = TableSeances.lire_colonnes(str(tmp_path))
+    assert relue.films == table.films
+    assert relue.colonnes == table.colonnes
+    assert ventes(relue, 'salle') == ventes(table, 'salle')
+    (tmp_path / "schema.json").write_text('{"type": "int64", "colonnes": []}', encoding='utf-8')
+    with pytest.raises(ValueError):
+        TableSeances.lire_colonnes(str(tmp_path))
+
+
+@pytest.mark.parametrize("numpy", [False, True])
+def test_carte_chaleur(gestion, monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(analyses, "HAS_NUMPY", numpy)
+    assert carte_chaleur(gestion, 1) == [[1.0, 0.5], [0.5, 0.0]]
+    assert carte_chaleur(gestion, 2) == [[1.0] * 5, [1.0, 0.0, 0.0, 0.0, 0.0]]
+    assert carte_chaleur(gestion, 3) == []
@@ -0,0 +1,74 @@
+import random
+import sys
+import threading
+
+import journal
+from film import Film, GestionFilms
+from salle import GestionSalles, Salle
+from reservation import GestionSeances, SallePleineError
+from stockage import StockageSQLite
+
+NB_THREADS = 8
+TENTATIVES = 400
+
+
+def _vendre(seances, n, ventes, depart):
+    rnd = random.Random(n)
+    places = [p for rangee in seances[0].plan for p in rangee]
+    depart.wait()
+    for _ in range(TENTATIVES):
+        s = rnd.choice(seances)
+        try:
+            if rnd.random() < 0.3:
+                demandees = rnd.sample(places, rnd.randint(2, 4))
+                s.reserver_places(f"vendeur{n}", demandees)
+                ventes[n].extend((s.id, p, f"vendeur{n}") for p in demandees)
+            else:
+                p = rnd.choice(places)
+                s.reserver(f"vendeur{n}", p)
+                ventes[n].append((s.id, p, f"vendeur{n}"))
+        except SallePleineError:
+            pass
+
+
+def test_aucune_double_reservation(tmp_path):
+    films, salles, gs = GestionFilms(), GestionSalles(), GestionSeances()
+    films.ajouter_film(Film("Inception", 148, "Science-fiction"))
+    salles.ajouter_salle(Salle(1, 120))
+    salles.ajouter_salle(Salle(2, 120))
+    stockage = StockageSQLite(str(tmp_path / "cinema.db"), taille_lot=16)
+    stockage.sauver_tout(films, salles, gs)
+    stockage.attacher(films, salles, gs)
+    jr = journal.JournalReservations(str(tmp_path / "journal"), fsync_tous=0, instantane_tous=200)
+    jr.attacher(gs)
+    seances = [gs.creer_seance(films.get_film("Inception"), salles.get_salle(n), "2025-12-10 18:00")
+               for n in (1, 2)]
+
+    ventes = [[] for _ in range(NB_THREADS)]
+    depart = threading.Barrier(NB_THREADS)
+    fils = [threading.Thread(target=_vendre, args=(seances, n, ventes, depart)) for n in range(NB_THREADS)]
+    intervalle = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)  # bascules de threads fréquentes pour provoquer les courses
+    try:
+        for f in fils:
+            f.start()
+        for f in fils:
+            f.join(30)
+    finally:
+        sys.setswitchinterval(intervalle)
+    assert not any(f.is_alive() for f in fils), "interblocage"
+
+    toutes = [v for lst in ventes for v in lst]
+    doubles = len(toutes) - len({(sid, p) for sid, p, _ in toutes})
+    assert toutes and doubles == 0
+    attendu = {(sid, p): client for sid, p, client in toutes}
+    obtenu = {(s.id, r.place): r.client_nom for s in seances for r in s.lister_reservations()}
+    assert obtenu == attendu
+    assert sum(s.places_disponibles() for s in seances) == 240 - len(toutes)
+
+    jr.fermer()
+    stockage.fermer()
+    restauree = journal.restaurer(str(tmp_path / "journal"), films, salles)
+    assert {(s.id, r.place): r.client_nom for s in restauree.seances() for r in s.lister_reservations()} == attendu
+    _, _, chargees = StockageSQLite(str(tmp_path / "cinema.db")).charger()
+    assert {(s.id, r.place): r.client_nom for s in chargees.seances() for r in s.lister_reservations()} == attendu
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from film import Film
+from reservation import Seance, SallePleineError
+from salle import Salle
+
+
+def _seance(salle=None):
+    return Seance(1, Film("Inception", 148, "Science-fiction"), salle or Salle(1, 40, 10, (5,)), "2025-12-10 18:00")
+
+
+def test_meilleur_bloc_centre_dans_la_rangee_ideale():
+    s = _seance()  # 4 rangées de 10 places, allée après la 5e place
+    assert [r.place for r in s.reserver_groupe("Alice", 2)] == ["C4", "C5"]
+    assert [r.place for r in s.reserver_groupe("Bob", 3)] == ["C6", "C7", "C8"]
+    # plus de bloc de 5 dans la rangée C : rangée suivante la plus proche
+    assert [r.place for r in s.reserver_groupe("Carole", 5)] == ["D1", "D2", "D3", "D4", "D5"]
+
+
+def test_bloc_ne_traverse_pas_les_allees():
+    s = _seance()
+    with pytest.raises(SallePleineError):
+        s.reserver_groupe("Alice", 6)  # 10 places libres par rangée, mais 5 de chaque côté de l'allée
+    assert s.places_disponibles() == 40
+    with pytest.raises(ValueError):
+        s.reserver_groupe("Alice", 0)
+
+
+def test_places_annulees_reutilisees():
+    s = _seance(Salle(1, 10, 10))
+    s.reserver_places("Alice", ["A1", "A2", "A3", "A6", "A9"])
+    with pytest.raises(SallePleineError):
+        s.reserver_groupe("Bob", 3)
+    s.annuler_reservation("Alice", "A6")
+    assert [r.place for r in s.reserver_groupe("Bob", 3)] == ["A5", "A6", "A7"]
+
+
+def test_blocs_contigus_et_libres():
+    rnd = random.Random(1)
+    s = _seance(Salle(1, 200, 20, (6, 14)))
+    segments = {p: (i, 0 if n <= 6 else 1 if n <= 14 else 2)
+                for i, rangee in enumerate(s.plan) for n, p in enumerate(rangee, 1)}
+    for p in rnd.sample([p for rangee in s.plan for p in rangee], 120):
+        s.reserver("x", p)
+    while True:
+        n = rnd.randint(2, 4)
+        libres = s.places_disponibles()
+        try:
+            places = [r.place for r in s.reserver_groupe("groupe", n)]
+        except SallePleineError:
+            break
+        assert s.places_disponibles() == libres - n
+        rangee = s.plan[segments[places[0]][0]]
+        debut = rangee.index(places[0])
+        assert places == rangee[debut:debut + n]
+        assert len({segments[p] for p in places}) == 1
@@ -0,0 +1,88 @@
+import gc
+import threading
+
+import pytest
+
+import import_films
+from film import Film, GestionFilms
+
+CATALOGUE = """titre,duree,genre
+Inception,148,Science-fiction
+,120,Drame
+Matrix,deux heures,Action
+Alien,0,Horreur
+Amélie,122
+Titanic,195,Drame
+
+Inception,150,Science-fiction
+"""
+
+
+def _ecrire(tmp_path, texte, nom="catalogue.csv"):
+    chemin = tmp_path / nom
+    chemin.write_text(texte, encoding='utf-8')
+    return str(chemin)
+
+
+def test_rejets_signales(tmp_path):
+    gestion = GestionFilms()
+    rapport = import_films.importer_films(_ecrire(tmp_path, CATALOGUE), gestion, taille_lot=3)
+    assert (rapport.lues, rapport.ajoutees, rapport.mises_a_jour, rapport.nb_rejetees) == (7, 2, 1, 4)  # la ligne vide est ignorée
+    assert [(r.numero, r.raison) for r in rapport.rejetees] == [
+        (3, "titre vide"),
+        (4, "durée non entière : 'deux heures'"),
+        (5, "durée non strictement positive : 0"),
+        (6, "2 colonnes au lieu de 3"),
+    ]
+    assert gestion.get_film("Inception").duree == 150  # la dernière occurrence l'emporte
+    rejets = tmp_path / "rejets.csv"
+    rapport.ecrire_rejets(str(rejets))
+    assert rejets.read_text(encoding='utf-8').splitlines()[1] == "3,titre vide,,120,Drame"
+
+
+def test_titre_existant_refuse_sans_mise_a_jour(tmp_path):
+    gestion = GestionFilms()
+    gestion.ajouter_film(Film("Inception", 148, "Science-fiction"))
+    rapport = import_films.importer_films(_ecrire(tmp_path, CATALOGUE), gestion, mise_a_jour=False)
+    assert (rapport.ajoutees, rapport.mises_a_jour) == (1, 0)
+    assert [(r.numero, r.raison) for r in rapport.rejetees[-2:]] == [
+        (2, "le film 'Inception' existe déjà"), (9, "le film 'Inception' existe déjà")]
+    assert gestion.get_film("Inception").duree == 148
+
+
+def test_colonne_obligatoire_absente(tmp_path):
+    with pytest.raises(ValueError, match="duree"):
+        import_films.importer_films(_ecrire(tmp_path, "titre,genre\nInception,Drame\n"))
+
+
+@pytest.mark.parametrize("actif", [True, False])
+def test_etat_du_ramasse_miettes_retabli(tmp_path, actif):
+    chemin = _ecrire(tmp_path, CATALOGUE)
+    etat = gc.isenabled()
+    (gc.enable if actif else gc.disable)()
+    try:
+        def interrompre(rapport):
+            raise RuntimeError("interrompu")
+        with pytest.raises(RuntimeError):
+            import_films.importer_films(chemin, rappel=interrompre, suspendre_gc=True)
+        assert gc.isenabled() is actif
+        # imports concurrents : l'état d'origine est rétabli quand le dernier se termine
+        demarres = threading.Barrier(4)
+        fils = [threading.Thread(target=import_films.importer_films,
+                                 kwargs={'chemin': chemin, 'taille_lot': 1, 'rappel': lambda r: demarres.wait(5),
+                                         'suspendre_gc': True})
+                for _ in range(4)]
+        for f in fils:
+            f.start()
+        for f in fils:
+            f.join(10)
+        assert gc.isenabled() is actif
+    finally:
+        (gc.enable if etat else gc.disable)()
+
+
+def test_ramasse_miettes_actif_par_defaut(tmp_path):
+    # appelé par l'interface et le serveur via charger_films_csv : le ramasse-miettes n'est pas touché
+    etats = []
+    import_films.importer_films(_ecrire(tmp_path, CATALOGUE), taille_lot=2, rappel=lambda r: etats.append(gc.isenabled()))
+    assert etats and all(etats)
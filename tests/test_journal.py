@@ -0,0 +1,112 @@
+import json
+import threading
+
+import journal
+from film import Film, GestionFilms
+from salle import GestionSalles, Salle
+from reservation import GestionSeances
+
+
+def _donnees():
+    films, salles = GestionFilms(), GestionSalles()
+    films.ajouter_film(Film("Inception", 148, "Science-fiction"))
+    salles.ajouter_salle(Salle(1, 48))
+    salles.ajouter_salle(Salle(2, 48))
+    return films, salles
+
+
+def _lancer(cibles, delai=10.0):
+    fils = [threading.Thread(target=c) for c in cibles]
+    for f in fils:
+        f.start()
+    for f in fils:
+        f.join(delai)
+    assert not any(f.is_alive() for f in fils), "interblocage"
+
+
+def test_instantane_automatique_pendant_des_reservations(tmp_path):
+    films, salles = _donnees()
+    gs = GestionSeances()
+    jr = journal.JournalReservations(str(tmp_path), fsync_tous=0, instantane_tous=3)
+    jr.attacher(gs)
+    s = gs.creer_seance(films.get_film("Inception"), salles.get_salle(1), "2025-12-10 18:00")
+    places = [p for rangee in s.plan for p in rangee]
+
+    def reserver(debut):
+        for p in places[debut::4]:
+            s.reserver(f"client {debut}", p)
+
+    _lancer([lambda d=d: reserver(d) for d in range(4)])
+    jr.fermer()
+    restauree = journal.restaurer(str(tmp_path), films, salles).get_seance(s.id)
+    assert restauree.places_disponibles() == 0
+    assert {r.place: r.client_nom for r in restauree.lister_reservations()} == \
+           {r.place: r.client_nom for r in s.lister_reservations()}
+
+
+def test_instantane_manuel_concurrent(tmp_path):
+    films, salles = _donnees()
+    gs = GestionSeances()
+    jr = journal.JournalReservations(str(tmp_path), fsync_tous=0)
+    jr.attacher(gs)
+    seances = [gs.creer_seance(films.get_film("Inception"), salles.get_salle(n), "2025-12-10 18:00")
+               for n in (1, 2)]
+
+    def reserver(s):
+        for rangee in s.plan:
+            for p in rangee:
+                s.reserver("Alice", p)
+                if p.endswith("3"):
+                    s.annuler_reservation("Alice", p)
+
+    def instantanes():
+        for _ in range(20):
+            jr.instantane(gs)
+
+    _lancer([lambda: reserver(seances[0]), lambda: reserver(seances[1]), instantanes])
+    jr.fermer()
+    restaurees = journal.restaurer(str(tmp_path), films, salles)
+    for s in seances:
+        assert sorted(r.place for r in restaurees.get_seance(s.id).lister_reservations()) == \
+               sorted(r.place for r in s.lister_reservations())
+
+
+def test_rejeu_entrees_invalides(tmp_path):
+    films, salles = _donnees()
+    gs = GestionSeances()
+    jr = journal.JournalReservations(str(tmp_path), fsync_tous=0)
+    jr.attacher(gs)
+    s = gs.creer_seance(films.get_film("Inception"), salles.get_salle(1), "2025-12-10 18:00")
+    s.reserver("Alice", "A1")
+    jr._ecrire("R\tabc\tA2\tBob\n")       # id illisible
+    jr._ecrire("R\t1\tA1\tBob\n")         # place déjà prise
+    jr._ecrire("R\t1\tZZ99\tBob\n")       # place inexistante
+    jr._ecrire("X\t1\n")                  # type inconnu
+    jr._ecrire("R\t1\n")                  # champs manquants
+    s.reserver("Carole", "A3")
+    jr.fermer()
+    ignorees = []
+    restauree = journal.restaurer(str(tmp_path), films, salles, ignorees).get_seance(s.id)
+    assert len(ignorees) == 5
+    assert all(e.startswith("journal.000001.log:") for e in ignorees)
+    assert {r.place: r.client_nom for r in restauree.lister_reservations()} == {"A1": "Alice", "A3": "Carole"}
+
+
+def test_instantane_avec_reservations_invalides(tmp_path):
+    films, salles = _donnees()
+    gs = GestionSeances()
+    jr = journal.JournalReservations(str(tmp_path), fsync_tous=0)
+    jr.attacher(gs)
+    s = gs.creer_seance(films.get_film("Inception"), salles.get_salle(1), "2025-12-10 18:00")
+    s.reserver("Alice", "A1")
+    jr.instantane(gs)
+    jr.fermer()
+    chemin = tmp_path / journal.FICHIER_INSTANTANE
+    etat = json.loads(chemin.read_text(encoding='utf-8'))
+    etat['seances'][0][4] += [["ZZ99", "Bob"], ["A1", "Bob"], ["A2", "Carole"]]
+    chemin.write_text(json.dumps(etat), encoding='utf-8')
+    ignorees = []
+    restauree = journal.restaurer(str(tmp_path), films, salles, ignorees).get_seance(s.id)
+    assert len(ignorees) == 2
+    assert all(e.startswith(f"{journal.FICHIER_INSTANTANE}:{s.id} : ") for e in ignorees)
+    assert {r.place: r.client_nom for r in restauree.lister_reservations()} == {"A1": "Alice", "A2": "Carole"}
@@ -0,0 +1,51 @@
+import pytest
+
+from plan_salle import (Disposition, PLANS_PARTAGES, PlaceInexistanteError, PlanSalle, etiquette_rangee,
+                        indice_rangee, plan_pour)
+
+
+def test_rangees_a_plusieurs_lettres():
+    assert [etiquette_rangee(i) for i in (0, 25, 26, 27, 701, 702)] == ["A", "Z", "AA", "AB", "ZZ", "AAA"]
+    assert [indice_rangee(e) for e in ("A", "Z", "AA", "ZZ", "AAA")] == [0, 25, 26, 701, 702]
+    for invalide in ("", "a", "A1"):
+        with pytest.raises(ValueError):
+            indice_rangee(invalide)
+    plan = PlanSalle(800, colonnes=1)
+    assert plan.etiquette(25) == "Z1" and plan.etiquette(26) == "AA1" and plan.etiquette(702) == "AAA1"
+    assert plan.index("AA1") == 26 and plan.index("AAA1") == 702
+    assert plan.rangee_de(26) == 26
+    for place in ("AA2", "AEF1", "1", "AA", "aa1", None):
+        with pytest.raises(PlaceInexistanteError):
+            plan.index(place)
+
+
+def test_places_absentes():
+    plan = PlanSalle(6, colonnes=4, absentes=frozenset({"A1", "B3"}))
+    assert plan.lignes == 2
+    assert plan.rangees() == [["A2", "A3", "A4"], ["B1", "B2", "B4"]]
+    assert plan.index("A2") == 0 and plan.index("B4") == 5 and plan.etiquette(3) == "B1"
+    assert plan.rangee_de(2) == 0 and plan.rangee_de(3) == 1
+    assert plan.bornes_rangee(1) == (3, 6)
+    for place in ("A1", "B3", "C1", "A5"):
+        with pytest.raises(PlaceInexistanteError):
+            plan.index(place)
+    with pytest.raises(ValueError):
+        Disposition(colonnes=12, absentes=frozenset({"A13"}))
+
+
+def test_segments_et_grille():
+    reguliere = PlanSalle(7, colonnes=4, allees=(2,))
+    assert reguliere.segments(0) == ((0, 2), (2, 4))
+    assert reguliere.segments(1) == ((4, 6), (6, 7))
+    assert reguliere.grille() == [["A1", "A2", None, "A3", "A4"], ["B1", "B2", None, "B3"]]
+    trouee = PlanSalle(6, colonnes=4, allees=(2,), absentes=frozenset({"A1", "B3"}))
+    assert trouee.segments(0) == ((0, 1), (1, 3))
+    assert trouee.segments(1) == ((3, 5), (5, 6))
+    assert trouee.grille() == [[None, "A2", None, "A3", "A4"], ["B1", "B2", None, None, "B4"]]
+
+
+def test_plan_partage():
+    disposition = Disposition(colonnes=10, allees=(5,))
+    assert plan_pour(50, disposition) is plan_pour(50, Disposition(colonnes=10, allees=(5,)))
+    assert plan_pour(50, disposition) is not plan_pour(60, disposition)
+    assert plan_pour.cache_info().maxsize == PLANS_PARTAGES
@@ -0,0 +1,50 @@
+from datetime import date
+
+import pytest
+
+from film import Film
+from programmation import planifier, programmer
+from reservation import CreneauOccupeError, GestionSeances
+from salle import Salle
+
+LUNDI = date(2025, 12, 8)
+
+
+def _donnees():
+    return [Film("Inception", 148, "Science-fiction"), Film("Matrix", 136, "Action")], [Salle(1, 48), Salle(2, 48)]
+
+
+def test_planifier_enchaine_les_seances():
+    films, salles = _donnees()
+    programme = planifier(films, salles, LUNDI, nb_jours=1)
+    salle1 = [h for _, s, h in programme if s.numero == 1]
+    # 10:00, fin 12:28 + 15 min de nettoyage -> 12:45 (arrondi à 5 min), ...
+    assert salle1[:3] == ["2025-12-08 10:00", "2025-12-08 12:45", "2025-12-08 15:30"]
+    with pytest.raises(ValueError):
+        planifier(films, salles, LUNDI, ouverture="23:00", fermeture="10:00")
+
+
+def test_programmer_ignore_les_creneaux_occupes():
+    films, salles = _donnees()
+    gs = GestionSeances()
+    existante = gs.creer_seance(films[1], salles[0], "2025-12-08 12:00")
+    prevu = planifier(films, salles, LUNDI, nb_jours=2)
+    ignorees = []
+    seances = programmer(gs, films, salles, LUNDI, nb_jours=2, ignorees=ignorees)
+    # les séances 10:00 et 12:45 de la salle 1 chevauchent la séance de 12:00
+    assert [(s.numero, h) for _, s, h in ignorees] == [(1, "2025-12-08 10:00"), (1, "2025-12-08 12:45")]
+    assert len(seances) == len(prevu) - 2
+    assert len(gs.lister_seances()) == len(prevu) - 1 and existante in gs.lister_seances()
+    # programmer à nouveau la même période ne crée rien
+    ignorees = []
+    assert programmer(gs, films, salles, LUNDI, nb_jours=2, ignorees=ignorees) == []
+    assert len(ignorees) == len(prevu)
+
+
+def test_creer_seances_tout_ou_rien_sans_liste_ignorees():
+    films, salles = _donnees()
+    gs = GestionSeances()
+    gs.creer_seance(films[1], salles[0], "2025-12-08 12:00")
+    with pytest.raises(CreneauOccupeError):
+        gs.creer_seances(planifier(films, salles, LUNDI, nb_jours=1))
+    assert len(gs.lister_seances()) == 1
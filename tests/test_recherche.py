@@ -0,0 +1,92 @@
+import pytest
+
+from film import Film, GestionFilms
+from recherche import IndexFilms, normaliser
+
+
+@pytest.fixture
+def gestion():
+    g = GestionFilms()
+    for film in (Film("Inception", 148, "Science-fiction"),
+                 Film("Matrix", 136, "Action"),
+                 Film("Matrix Reloaded", 138, "Action"),
+                 Film("Le Fabuleux Destin d'Amélie Poulain", 122, "Comédie"),
+                 Film("Interstellar", 169, "Science-fiction"),
+                 Film("L'Été meurtrier", 130, "Drame")):
+        g.ajouter_film(film)
+    return g
+
+
+def _titres(films):
+    return [f.titre for f in films]
+
+
+def test_normaliser():
+    assert normaliser("L'Été !") == "l ete  "
+    assert normaliser("Matrix-2") == "matrix 2"
+
+
+def test_prefixe_et_mots_entiers(gestion):
+    index = IndexFilms(gestion)
+    assert len(index) == 6
+    assert _titres(index.chercher("matrix")) == ["Matrix", "Matrix Reloaded"]
+    assert sorted(_titres(index.chercher("in"))) == ["Inception", "Interstellar"]
+    assert _titres(index.chercher("matrix rel")) == ["Matrix Reloaded"]
+    assert _titres(index.chercher("amelie")) == ["Le Fabuleux Destin d'Amélie Poulain"]
+    assert _titres(index.chercher("l'ete")) == ["L'Été meurtrier"]
+    assert index.chercher("zzz") == []
+
+
+def test_fautes_de_frappe(gestion):
+    index = IndexFilms(gestion)
+    assert _titres(index.chercher("inceptoin")) == ["Inception"]
+    assert _titres(index.chercher("interstelar")) == ["Interstellar"]
+    assert index.chercher("inceptoin", approche=False) == []
+
+
+def test_filtres_genre_et_duree(gestion):
+    index = IndexFilms(gestion)
+    assert sorted(_titres(index.chercher(genre="science fiction"))) == ["Inception", "Interstellar"]
+    assert _titres(index.chercher("in", duree_max=150)) == ["Inception"]
+    assert _titres(index.chercher("matrix", duree_min=137)) == ["Matrix Reloaded"]
+    assert _titres(index.chercher("matrix", genre="Drame")) == []
+    assert len(index.chercher(limite=2)) == 2 and index.chercher(limite=0) == []
+    with pytest.raises(ValueError):
+        index.chercher(limite=-1)
+
+
+def test_index_tenu_a_jour(gestion):
+    index = IndexFilms(gestion)
+    gestion.ajouter_film(Film("Matrix Revolutions", 129, "Action"))
+    assert _titres(index.chercher("matrix rev")) == ["Matrix Revolutions"]
+    gestion.supprimer_film("Inception")
+    assert index.chercher("inception", approche=False) == []
+    assert "inception" not in index._vocabulaire_trie()
+    gestion.mettre_a_jour_film(Film("Matrix", 136, "Science-fiction"))
+    assert _titres(index.chercher("matrix", genre="science-fiction")) == ["Matrix"]
+    assert len(index) == 6
+
+
+def test_filtre_duree_par_tranches(gestion):
+    index = IndexFilms(gestion)
+    assert index.chercher("matrix", duree_max=100) == []
+    assert index.chercher(duree_min=200) == []
+    assert _titres(index.chercher("ma", duree_min=130, duree_max=136)) == ["Matrix"]
+    assert sorted(_titres(index.chercher(duree_min=122, duree_max=130))) == [
+        "L'Été meurtrier", "Le Fabuleux Destin d'Amélie Poulain"]
+    gestion.mettre_a_jour_film(Film("Matrix", 95, "Action"))
+    assert _titres(index.chercher("matrix", duree_max=100)) == ["Matrix"]
+    assert index.chercher("matrix", duree_min=130, duree_max=136) == []
+
+
+def test_mot_frequent_parcouru_en_dernier(monkeypatch, gestion):
+    monkeypatch.setattr("recherche.FILMS_MOT_FREQUENT", 1)
+    gestion.ajouter_film(Film("Le Mans", 106, "Drame"))
+    gestion.ajouter_film(Film("Le Lac", 90, "Drame"))
+    index = IndexFilms(gestion)
+    # mot exact "l", puis "lac" ; "le" (3 films) est parcouru en dernier
+    trouves = _titres(index.chercher("l"))
+    assert trouves[:2] == ["L'Été meurtrier", "Le Lac"]
+    assert sorted(trouves[2:]) == ["Le Fabuleux Destin d'Amélie Poulain", "Le Mans"]
+    # même ordre quand les films du filtre sont vérifiés un à un
+    assert _titres(index.chercher("l", genre="drame")) == ["L'Été meurtrier", "Le Lac", "Le Mans"]
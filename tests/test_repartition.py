@@ -0,0 +1,92 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+from repartition import ConnexionShard, _connexion_shard
+
+
+class _ServiceFragile:
+    """Service de test : répond en écho, échoue sur /boum."""
+
+    def traiter(self, methode, chemin, corps):
+        if chemin == '/boum':
+            raise RuntimeError("bogue")
+        return HTTPStatus.OK, {'chemin': chemin}
+
+
+async def _shard(rappel):
+    serveur = await asyncio.start_server(rappel, '127.0.0.1', 0)
+    return serveur, serveur.sockets[0].getsockname()[1]
+
+
+def test_erreur_de_requete_sans_couper_le_lien():
+    async def scenario():
+        serveur, port = await _shard(_connexion_shard(_ServiceFragile()))
+        shard = ConnexionShard(port, delai=2)
+        await shard.ouvrir()
+        statut, corps = await shard.requete('GET', '/boum', b'')
+        assert statut == HTTPStatus.INTERNAL_SERVER_ERROR
+        statut, corps = await shard.requete('GET', '/films', b'')
+        assert statut == HTTPStatus.OK and json.loads(corps) == {'chemin': '/films'}
+        await shard.fermer()
+        serveur.close()
+
+    asyncio.run(scenario())
+
+
+def test_reconnexion_apres_lien_coupe():
+    connexions = []
+    service = _connexion_shard(_ServiceFragile())
+
+    async def une_fois_sur_deux(lecteur, ecrivain):
+        connexions.append(ecrivain)
+        if len(connexions) == 1:
+            await lecteur.read(1)
+            ecrivain.close()  # premier lien coupé dès la première requête
+        else:
+            await service(lecteur, ecrivain)
+
+    async def scenario():
+        serveur, port = await _shard(une_fois_sur_deux)
+        shard = ConnexionShard(port, delai=2)
+        await shard.ouvrir()
+        with pytest.raises(ConnectionError):
+            await shard.requete('GET', '/films', b'')
+        statut, _ = await asyncio.wait_for(shard.requete('GET', '/films', b''), 5)
+        assert statut == HTTPStatus.OK
+        await shard.fermer()
+        serveur.close()
+
+    asyncio.run(scenario())
+
+
+def test_shard_arrete_echec_immediat():
+    async def scenario():
+        serveur, port = await _shard(_connexion_shard(_ServiceFragile()))
+        shard = ConnexionShard(port, delai=2)
+        await shard.ouvrir()
+        serveur.close()
+        await serveur.wait_closed()
+        await shard.fermer()
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(shard.requete('GET', '/films', b''), 5)
+
+    asyncio.run(scenario())
+
+
+def test_shard_muet_delai():
+    async def muet(lecteur, ecrivain):
+        await lecteur.read()
+
+    async def scenario():
+        serveur, port = await _shard(muet)
+        shard = ConnexionShard(port, delai=0.2)
+        await shard.ouvrir()
+        with pytest.raises(asyncio.TimeoutError):
+            await shard.requete('GET', '/films', b'')
+        await shard.fermer()
+        serveur.close()
+
+    asyncio.run(scenario())
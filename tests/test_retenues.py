@@ -0,0 +1,68 @@
+import pytest
+
+from film import Film
+from reservation import Seance, SallePleineError
+from retenues import Echeancier
+from salle import Salle
+
+
+@pytest.fixture
+def seance():
+    return Seance(1, Film("Inception", 148, "Science-fiction"), Salle(1, 48), "2025-12-10 18:00")
+
+
+@pytest.fixture
+def echeancier():
+    return Echeancier(automatique=False)  # échéances déclenchées par le test (expirer)
+
+
+def test_place_retenue_bloquee_pour_les_autres(seance, echeancier):
+    seance.retenir("A1", "caisse 1", 60, echeancier)
+    assert seance.est_place_retenue("A1") and not seance.est_place_disponible("A1")
+    with pytest.raises(SallePleineError):
+        seance.reserver("Bob", "A1")
+    with pytest.raises(SallePleineError):
+        seance.reserver("Bob", "A1", titulaire="caisse 2")
+    with pytest.raises(SallePleineError):
+        seance.retenir("A1", "caisse 2", 60, echeancier)
+    assert not seance.liberer("A1", "caisse 2")
+
+
+def test_retenue_liberee_a_echeance(seance, echeancier):
+    echeance = seance.retenir("A1", "caisse 1", 60, echeancier)
+    assert echeancier.prochaine_echeance() == echeance
+    assert echeancier.expirer(echeance - 1) == 0 and seance.est_place_retenue("A1")
+    assert echeancier.expirer(echeance) == 1
+    assert seance.est_place_disponible("A1") and not seance.est_place_retenue("A1")
+    assert len(echeancier) == 0
+
+
+def test_retenue_confirmee_non_liberee(seance, echeancier):
+    echeance = seance.retenir("A1", "caisse 1", 60, echeancier)
+    seance.reserver("Alice", "A1", titulaire="caisse 1")
+    assert echeancier.expirer(echeance) == 0
+    assert seance.client_de("A1") == "Alice"
+
+
+def test_retenue_prolongee(seance, echeancier):
+    premiere = seance.retenir("A1", "caisse 1", 60, echeancier)
+    seconde = seance.retenir("A1", "caisse 1", 120, echeancier)
+    assert echeancier.expirer(premiere) == 0 and seance.est_place_retenue("A1")
+    assert echeancier.expirer(seconde) == 1
+
+
+def test_retenue_liberee_par_son_titulaire(seance, echeancier):
+    echeance = seance.retenir("A1", "caisse 1", 60, echeancier)
+    assert seance.liberer("A1", "caisse 1") and seance.est_place_disponible("A1")
+    assert echeancier.expirer(echeance) == 0
+
+
+def test_retenue_echue_libre_avant_l_echeancier(seance, echeancier):
+    # l'échéancier n'a pas encore tourné : la place est tout de même libre pour les autres
+    seance.retenir("A1", "caisse 1", -1, echeancier)
+    seance.retenir("A2", "caisse 1", -1, echeancier)
+    assert seance.est_place_disponible("A1")
+    seance.reserver("Bob", "A1")
+    assert [r.place for r in seance.reserver_places("Carole", ["A2", "A3"])] == ["A2", "A3"]
+    assert echeancier.expirer() == 0
+    assert seance.places_disponibles() == 45
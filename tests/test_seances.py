@@ -0,0 +1,126 @@
+import pytest
+
+from film import Film
+from salle import Salle
+from reservation import CreneauOccupeError, GestionSeances
+
+
+@pytest.fixture
+def film():
+    return Film("Inception", 148, "Science-fiction")
+
+
+@pytest.fixture
+def salle():
+    return Salle(1, 48)
+
+
+@pytest.mark.parametrize("horaire", ["2025-01-01", "20250101T1800", "2025-01-01T09:00",
+                                     "2025-01-02 10:00+05:00", "2025-1-1 9:00", "2025-02-30 10:00", None])
+def test_horaire_hors_format_refuse(film, salle, horaire):
+    gs = GestionSeances()
+    with pytest.raises(ValueError):
+        gs.creer_seance(film, salle, horaire)
+    assert not gs.lister_seances() and gs.compteurs.total() == (0, 0)
+
+
+def test_seances_entre(film, salle):
+    gs = GestionSeances()
+    a = gs.creer_seance(film, salle, "2025-01-01 20:00")
+    b = gs.creer_seance(film, salle, "2025-01-01 10:00")
+    gs.creer_seance(film, salle, "2025-01-02 10:00")
+    assert gs.seances_entre("2025-01-01 00:00", "2025-01-02 00:00") == [b, a]
+    assert gs.compteurs.instantane('jour') == {"2025-01-01": (0, 96), "2025-01-02": (0, 48)}
+
+
+def test_chevauchement_refuse(film, salle):
+    gs = GestionSeances()
+    gs.creer_seance(film, salle, "2025-01-01 18:00")  # 18:00 - 20:28
+    with pytest.raises(CreneauOccupeError):
+        gs.creer_seance(film, salle, "2025-01-01 20:00")
+    with pytest.raises(CreneauOccupeError):
+        gs.creer_seance(film, salle, "2025-01-01 16:00")
+    gs.creer_seance(film, salle, "2025-01-01 20:28")   # commence à la fin de la précédente
+    gs.creer_seance(film, Salle(2, 48), "2025-01-01 19:00")  # autre salle
+    assert not gs.est_salle_libre(salle, "2025-01-01 19:00", "2025-01-01 19:30")
+    assert gs.est_salle_libre(salle, "2025-01-02 10:00", "2025-01-02 12:00")
+
+
+def test_creer_seances_tout_ou_rien(film, salle):
+    gs = GestionSeances()
+    with pytest.raises(CreneauOccupeError):
+        gs.creer_seances([(film, salle, "2025-01-01 10:00"), (film, salle, "2025-01-01 11:00")])
+    assert not gs.lister_seances()
+    assert len(gs.creer_seances([(film, salle, "2025-01-01 10:00"), (film, salle, "2025-01-01 13:00")])) == 2
+
+
+def test_duree_du_film_modifiee(salle):
+    from film import GestionFilms
+    from salle import GestionSalles
+    films, salles = GestionFilms(), GestionSalles()
+    films.ajouter_film(Film("Court", 60, "Drame"))
+    salles.ajouter_salle(salle)
+    gs = GestionSeances()
+    gs.suivre(films, salles)
+    gs.creer_seance(films.get_film("Court"), salle, "2025-01-01 10:00")
+    films.mettre_a_jour_film(Film("Court", 300, "Drame"))
+    with pytest.raises(CreneauOccupeError):
+        gs.creer_seance(films.get_film("Court"), salle, "2025-01-01 14:00")
+    films.fusionner_films([Film("Court", 90, "Drame")])
+    gs.creer_seance(films.get_film("Court"), salle, "2025-01-01 11:30")
+
+
+def test_index_reservations_annulations():
+    from reservation import IndexReservations
+    index = IndexReservations()
+    for idx in range(100):
+        index.ajouter(7, 1, idx)
+    for idx in range(0, 100, 3):
+        index.retirer(7, 1, idx)
+    index.ajouter(7, 1, 0)  # place annulée puis réservée à nouveau
+    attendu = [(1, 0)] + [(1, i) for i in range(100) if i % 3]
+    assert index.places_du_client(7) == attendu and len(index) == len(attendu)
+    for s, idx in attendu:
+        index.retirer(7, s, idx)
+    assert index.places_du_client(7) == [] and len(index) == 0
+    assert not any(index._par_client) and not any(index._retirees)
+    # séances de partitions différentes ou de la même partition : une seule liste triée
+    for seance_id, idx in ((18, 4), (3, 1), (2, 9), (18, 0)):
+        index.ajouter(7, seance_id, idx)
+    index.retirer(7, 2, 9)
+    assert index.places_du_client(7) == [(3, 1), (18, 0), (18, 4)] and len(index) == 3
+
+
+def test_compteurs_ventes(salle):
+    from film import GestionFilms
+    from salle import GestionSalles
+    films, salles = GestionFilms(), GestionSalles()
+    films.ajouter_film(Film("Court", 60, "Drame"))
+    films.ajouter_film(Film("Long", 180, "Drame"))
+    salles.ajouter_salle(salle)
+    salles.ajouter_salle(Salle(2, 24))
+    gs = GestionSeances()
+    gs.suivre(films, salles)
+    c = gs.compteurs
+    court, long_ = films.get_film("Court"), films.get_film("Long")
+    a = gs.creer_seance(court, salle, "2025-01-01 10:00")
+    b = gs.creer_seance(long_, salles.get_salle(2), "2025-01-01 10:00")
+    gs.creer_seance(court, salle, "2025-01-02 10:00")
+    assert c.total() == (0, 120)
+    a.reserver_places("alice", ["A1", "A2", "A3"])
+    b.reserver("bob", "A1")
+    assert c.total() == (4, 120)
+    assert c.ventes('film', "Court") == 3 and c.ventes('salle', 2) == 1 and c.ventes('jour', "2025-01-01") == 4
+    assert c.remplissage('film', "Court") == 3 / 96 and c.remplissage('film', "Inconnu") == 0.0
+    assert c.instantane('jour') == {"2025-01-01": (4, 72), "2025-01-02": (0, 48)}
+    assert a.annuler_reservation("alice", "A2")
+    assert not a.annuler_reservation("alice", "A2")  # déjà annulée : rien ne bouge
+    assert c.instantane('film') == {"Court": (2, 96), "Long": (1, 24)}
+    gs.supprimer_seance(a.id)
+    assert c.instantane('jour') == {"2025-01-01": (1, 24), "2025-01-02": (0, 48)}
+    films.supprimer_film("Long")  # séances du film supprimées en cascade
+    assert c.instantane('film') == {"Court": (0, 48)} and c.instantane('salle') == {1: (0, 48)}
+    salles.supprimer_salle(1)
+    assert c.total() == (0, 0) and c.instantane('jour') == {}
+    with pytest.raises(ValueError):
+        c.instantane('genre')
@@ -0,0 +1,139 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+from film import Film, GestionFilms
+from salle import GestionSalles, Salle
+from reservation import GestionSeances
+from serveur import ServeurHTTP, ServiceCinema, TAILLE_MAX_CORPS
+
+
+@pytest.fixture
+def service():
+    films, salles, seances = GestionFilms(), GestionSalles(), GestionSeances()
+    films.ajouter_film(Film("Inception", 148, "Science-fiction"))
+    films.ajouter_film(Film("Matrix", 136, "Science-fiction"))
+    films.ajouter_film(Film("Intouchables", 112, "Comédie"))
+    salles.ajouter_salle(Salle(1, 24))
+    # rangée B entièrement sans siège
+    salles.ajouter_salle(Salle(2, 8, 4, (), ("B1", "B2", "B3", "B4")))
+    seances.creer_seance(films.get_film("Inception"), salles.get_salle(1), "2025-12-10 18:00")
+    seances.creer_seance(films.get_film("Matrix"), salles.get_salle(2), "2025-12-10 20:00")
+    seances.creer_seance(films.get_film("Inception"), salles.get_salle(1), "2025-12-11 18:00")
+    return ServiceCinema(films, salles, seances)
+
+
+def test_plan_avec_rangee_vide(service):
+    statut, seance = service.traiter('GET', '/seances/2', b'')
+    assert statut == HTTPStatus.OK
+    assert seance['plan'] == {'rangees': ['A', 'B', 'C'], 'occupation': ['0000', '', '0000']}
+
+
+def test_erreur_interne_500(service, monkeypatch):
+    def boum(params):
+        raise RuntimeError("bogue")
+    monkeypatch.setattr(service, '_chercher_seances', boum)
+    statut, corps = service.traiter('GET', '/seances', b'')
+    assert statut == HTTPStatus.INTERNAL_SERVER_ERROR and 'erreur' in corps
+
+
+def _corps(objet):
+    return json.dumps(objet).encode('utf-8')
+
+
+def test_films_pagination_et_genre(service):
+    statut, films = service.traiter('GET', '/films', b'')
+    assert statut == HTTPStatus.OK and [f['titre'] for f in films] == ["Inception", "Matrix", "Intouchables"]
+    _, films = service.traiter('GET', '/films?decalage=1&limite=1', b'')
+    assert films == [{'titre': "Matrix", 'duree': 136, 'genre': "Science-fiction"}]
+    _, films = service.traiter('GET', '/films?genre=Com%C3%A9die', b'')
+    assert [f['titre'] for f in films] == ["Intouchables"]
+    assert service.traiter('GET', '/films?limite=-1', b'')[0] == HTTPStatus.BAD_REQUEST
+    assert service.traiter('GET', '/films?decalage=x', b'')[0] == HTTPStatus.BAD_REQUEST
+
+
+def test_films_recherche(service):
+    _, films = service.traiter('GET', '/films?q=in', b'')
+    assert sorted(f['titre'] for f in films) == ["Inception", "Intouchables"]
+    _, films = service.traiter('GET', '/films?q=in&duree_max=120', b'')
+    assert [f['titre'] for f in films] == ["Intouchables"]
+    _, films = service.traiter('GET', '/films?q=matrx', b'')
+    assert [f['titre'] for f in films] == ["Matrix"]
+    assert service.traiter('GET', '/films?duree_min=long', b'')[0] == HTTPStatus.BAD_REQUEST
+
+
+def test_seances_filtres(service):
+    _, seances = service.traiter('GET', '/seances', b'')
+    assert [s['id'] for s in seances] == [1, 2, 3]
+    _, seances = service.traiter('GET', '/seances?film=Inception', b'')
+    assert [s['id'] for s in seances] == [1, 3]
+    _, seances = service.traiter('GET', '/seances?salle=1&debut=2025-12-11', b'')
+    assert [s['id'] for s in seances] == [3]
+    _, seances = service.traiter('GET', '/seances?debut=2025-12-10%2019:00&fin=2025-12-11&limite=5', b'')
+    assert [s['id'] for s in seances] == [2]
+    assert service.traiter('GET', '/seances?salle=un', b'')[0] == HTTPStatus.BAD_REQUEST
+
+
+def test_seance_et_plan(service):
+    statut, seance = service.traiter('GET', '/seances/1', b'')
+    assert statut == HTTPStatus.OK
+    assert (seance['film'], seance['salle'], seance['places_disponibles']) == ("Inception", 1, 24)
+    assert seance['plan'] == {'rangees': ['A', 'B'], 'occupation': ['0' * 12, '0' * 12]}
+    assert service.traiter('GET', '/seances/99', b'')[0] == HTTPStatus.NOT_FOUND
+    assert service.traiter('GET', '/seances/abc', b'')[0] == HTTPStatus.NOT_FOUND
+    assert service.traiter('GET', '/inconnu', b'')[0] == HTTPStatus.NOT_FOUND
+
+
+def test_reservations(service):
+    statut, r = service.traiter('POST', '/seances/1/reservations', _corps({'client': "Alice", 'places': ["A1", "A2"]}))
+    assert statut == HTTPStatus.CREATED and r == {'seance': 1, 'client': "Alice", 'places': ["A1", "A2"]}
+    statut, r = service.traiter('POST', '/seances/1/reservations', _corps({'client': "Bob", 'nombre': 3}))
+    assert statut == HTTPStatus.CREATED and len(r['places']) == 3
+    assert service.traiter('POST', '/seances/1/reservations', _corps({'client': "Bob", 'places': ["A2"]}))[0] \
+        == HTTPStatus.CONFLICT
+    assert service.traiter('POST', '/seances/1/reservations', _corps({'client': "Bob", 'places': ["Z9"]}))[0] \
+        == HTTPStatus.BAD_REQUEST
+    assert service.traiter('POST', '/seances/1/reservations', _corps({'places': ["A3"]}))[0] == HTTPStatus.BAD_REQUEST
+    assert service.traiter('POST', '/seances/1/reservations', b'{')[0] == HTTPStatus.BAD_REQUEST
+    assert service.traiter('POST', '/seances/1/reservations', _corps({'client': "Bob", 'nombre': "2"}))[0] \
+        == HTTPStatus.BAD_REQUEST
+    assert service.traiter('POST', '/seances/99/reservations', _corps({'client': "Bob"}))[0] == HTTPStatus.NOT_FOUND
+    assert service.traiter('GET', '/seances/1/reservations', b'')[0] == HTTPStatus.METHOD_NOT_ALLOWED
+    _, seance = service.traiter('GET', '/seances/1', b'')
+    assert seance['places_disponibles'] == 19
+
+
+def test_serveur_http(service):
+    async def echanger():
+        serveur = ServeurHTTP(service, port=0)
+        await serveur.demarrer()
+        try:
+            lecteur, ecrivain = await asyncio.open_connection(serveur.hote, serveur.port)
+            reponses = []
+            corps = _corps({'client': "Alice", 'places': ["B1"]})
+            # deux requêtes sur la même connexion (HTTP/1.1 persistant)
+            ecrivain.write(b"GET /seances/1 HTTP/1.1\r\nHost: x\r\n\r\n"
+                           b"POST /seances/1/reservations HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s"
+                           % (len(corps), corps))
+            for _ in range(2):
+                statut = (await lecteur.readline()).split()[1]
+                entetes = {}
+                while (ligne := await lecteur.readline()) != b'\r\n':
+                    nom, _, valeur = ligne.decode('latin-1').partition(':')
+                    entetes[nom.lower()] = valeur.strip()
+                reponses.append((int(statut), entetes['connection'],
+                                 json.loads(await lecteur.readexactly(int(entetes['content-length'])))))
+            ecrivain.write(b"POST /seances/1/reservations HTTP/1.1\r\nContent-Length: %d\r\n\r\n"
+                           % (TAILLE_MAX_CORPS + 1))
+            reponses.append(((await lecteur.readline()).split()[1], await lecteur.read()))
+            ecrivain.close()
+            return reponses
+        finally:
+            await serveur.arreter()
+
+    (s1, c1, seance), (s2, c2, reservation), (s3, fin) = asyncio.run(echanger())
+    assert (s1, c1, seance['id']) == (200, 'keep-alive', 1)
+    assert (s2, c2, reservation['places']) == (201, 'keep-alive', ["B1"])
+    assert s3 == b'413' and b'Connection: close' in fin
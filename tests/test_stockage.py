@@ -0,0 +1,115 @@
+import sqlite3
+import time
+
+import pytest
+
+from film import Film, GestionFilms
+from salle import GestionSalles, Salle
+from reservation import GestionSeances
+from stockage import StockageSQLite
+
+
+def _ouvrir(chemin):
+    films, salles, seances = GestionFilms(), GestionSalles(), GestionSeances()
+    films.ajouter_film(Film("Inception", 148, "Science-fiction", "posters/inception.jpg"))
+    films.ajouter_film(Film("Matrix", 136, "Science-fiction"))
+    salles.ajouter_salle(Salle(1, 48))
+    salles.ajouter_salle(Salle(2, 40, 10, (5,), ("A1",)))
+    stockage = StockageSQLite(chemin)
+    stockage.sauver_tout(films, salles, seances)
+    stockage.attacher(films, salles, seances)
+    return stockage, films, salles, seances
+
+
+def test_aller_retour(tmp_path):
+    stockage, films, salles, seances = _ouvrir(str(tmp_path / "cinema.db"))
+    s1 = seances.creer_seance(films.get_film("Inception"), salles.get_salle(1), "2025-12-10 18:00")
+    s2 = seances.creer_seance(films.get_film("Matrix"), salles.get_salle(2), "2025-12-10 18:00")
+    s1.reserver("Alice", "A1")
+    s1.reserver("Bob", "B2")
+    s2.reserver_groupe("Carole", 3)
+    s1.annuler_reservation("Bob", "B2")
+    stockage.flush()
+    films2, salles2, seances2 = stockage.charger()
+    assert sorted(f.titre for f in films2.films()) == ["Inception", "Matrix"]
+    assert films2.get_film("Inception").affiche == "posters/inception.jpg"
+    assert salles2.get_salle(2).disposition == salles.get_salle(2).disposition
+    for s in (s1, s2):
+        t = seances2.get_seance(s.id)
+        assert (t.film.titre, t.salle.numero, t.horaire) == (s.film.titre, s.salle.numero, s.horaire)
+        assert [(r.place, r.client_nom) for r in t.lister_reservations()] == \
+               [(r.place, r.client_nom) for r in s.lister_reservations()]
+    stockage.fermer()
+
+
+def test_etiquette_canonique(tmp_path):
+    stockage, films, salles, seances = _ouvrir(str(tmp_path / "cinema.db"))
+    s = seances.creer_seance(films.get_film("Inception"), salles.get_salle(1), "2025-12-10 18:00")
+    assert s.reserver("Bob", "A01").place == "A1"
+    assert s.annuler_reservation("Bob", "A1")
+    stockage.flush()
+    _, _, seances2 = stockage.charger()
+    assert seances2.get_seance(s.id).lister_reservations() == []
+    stockage.fermer()
+
+
+def test_charger_les_salles_demandees(tmp_path):
+    stockage, films, salles, seances = _ouvrir(str(tmp_path / "cinema.db"))
+    s1 = seances.creer_seance(films.get_film("Inception"), salles.get_salle(1), "2025-12-10 18:00")
+    s2 = seances.creer_seance(films.get_film("Matrix"), salles.get_salle(2), "2025-12-10 18:00")
+    s1.reserver("Alice", "A1")
+    s2.reserver("Bob", "B2")
+    requetes = []
+    stockage._conn.set_trace_callback(requetes.append)
+    _, _, seances2 = stockage.charger({2})
+    assert [s.id for s in seances2.seances()] == [s2.id]
+    assert [(r.client_nom, r.place) for r in seances2.get_seance(s2.id).lister_reservations()] == [("Bob", "B2")]
+    assert any("JOIN seances" in r for r in requetes)
+    _, _, seances3 = stockage.charger(set())
+    assert list(seances3.seances()) == []
+    _, _, toutes = stockage.charger()
+    assert sorted(s.id for s in toutes.seances()) == [s1.id, s2.id]
+
+
+def test_flush_echoue_sans_perdre_le_lot(tmp_path):
+    chemin = str(tmp_path / "cinema.db")
+    stockage, films, salles, seances = _ouvrir(chemin)
+    s = seances.creer_seance(films.get_film("Inception"), salles.get_salle(1), "2025-12-10 18:00")
+    s.reserver("Alice", "A1")
+    autre = sqlite3.connect(chemin, timeout=0)
+    autre.execute("BEGIN IMMEDIATE")  # verrou d'écriture tenu par une autre connexion
+    stockage._conn.execute("PRAGMA busy_timeout = 0")
+    with pytest.raises(sqlite3.OperationalError):
+        stockage.flush()
+    autre.rollback()
+    autre.close()
+    _, _, seances2 = stockage.charger()
+    assert [r.place for r in seances2.get_seance(s.id).lister_reservations()] == ["A1"]
+
+
+def test_reservation_sans_acces_a_la_base(tmp_path):
+    chemin = str(tmp_path / "cinema.db")
+    films, salles, seances = GestionFilms(), GestionSalles(), GestionSeances()
+    films.ajouter_film(Film("Inception", 148, "Science-fiction"))
+    salles.ajouter_salle(Salle(1, 48))
+    stockage = StockageSQLite(chemin, taille_lot=2, delai_max=0.05)
+    stockage.sauver_tout(films, salles, seances)
+    stockage.attacher(films, salles, seances)
+    s = seances.creer_seance(films.get_film("Inception"), salles.get_salle(1), "2025-12-10 18:00")
+    stockage._conn.execute("PRAGMA busy_timeout = 0")
+    autre = sqlite3.connect(chemin, timeout=0)
+    autre.execute("BEGIN IMMEDIATE")
+    # base verrouillée : les réservations aboutissent, les écritures restent en file
+    for place in ("A1", "A2", "A3"):
+        s.reserver("Alice", place)
+    time.sleep(0.2)
+    autre.rollback()
+    # écrites en arrière-plan sans flush explicite
+    limite = time.monotonic() + 5
+    while time.monotonic() < limite:
+        if autre.execute("SELECT COUNT(*) FROM reservations").fetchone()[0] == 3:
+            break
+        time.sleep(0.02)
+    assert autre.execute("SELECT COUNT(*) FROM reservations").fetchone()[0] == 3
+    autre.close()
+    stockage.fermer()
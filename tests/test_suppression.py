@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+
+from film import Film, GestionFilms
+from programmation import planifier
+from reservation import GestionSeances
+from salle import GestionSalles, Salle
+from stockage import StockageSQLite
+
+
+def _donnees():
+    films, salles, seances = GestionFilms(), GestionSalles(), GestionSeances()
+    films.ajouter_film(Film("Inception", 148, "Science-fiction"))
+    films.ajouter_film(Film("Matrix", 136, "Science-fiction"))
+    salles.ajouter_salle(Salle(1, 48))
+    salles.ajouter_salle(Salle(2, 48))
+    seances.suivre(films, salles)
+    return films, salles, seances
+
+
+def test_supprimer_un_film_supprime_ses_seances_et_reservations():
+    films, salles, seances = _donnees()
+    inception, matrix = films.get_film("Inception"), films.get_film("Matrix")
+    s1 = seances.creer_seance(inception, salles.get_salle(1), "2025-12-10 18:00")
+    s2 = seances.creer_seance(matrix, salles.get_salle(2), "2025-12-10 18:00")
+    s1.reserver("Alice", "A1")
+    s1.reserver_groupe("Bob", 2)
+    s2.reserver("Alice", "B3")
+    supprimees = []
+    seances.ajouter_ecouteur(type("Ecouteur", (), {'seance_supprimee': lambda self, s: supprimees.append(s.id)})())
+
+    films.supprimer_film("Inception")
+    assert supprimees == [s1.id]
+    assert [s.id for s in seances.seances()] == [s2.id]
+    assert [(s.id, places) for s, places in seances.reservations_du_client("Alice")] == [(s2.id, ["B3"])]
+    assert seances.reservations_du_client("Bob") == []
+    assert len(seances.index_reservations) == 1
+    assert seances.compteurs.ventes('film', "Inception") == 0
+    assert seances.compteurs.total()[0] == 1
+    # la salle est libre à nouveau
+    assert seances.est_salle_libre(salles.get_salle(1), "2025-12-10 18:00", "2025-12-10 20:00")
+
+
+def test_supprimer_une_salle_supprime_ses_seances():
+    films, salles, seances = _donnees()
+    s1 = seances.creer_seance(films.get_film("Inception"), salles.get_salle(1), "2025-12-10 18:00")
+    s1.reserver("Alice", "A1")
+    salles.supprimer_salle(1)
+    assert list(seances.seances()) == [] and seances.reservations_du_client("Alice") == []
+    with pytest.raises(KeyError):
+        seances.get_seance(s1.id)
+
+
+def test_film_supprime_desaffecte_les_salles(tmp_path):
+    films, salles, seances = _donnees()
+    stockage = StockageSQLite(str(tmp_path / "cinema.db"))
+    stockage.sauver_tout(films, salles, seances)
+    stockage.attacher(films, salles, seances)
+    salles.affecter_film_a_salle(1, films.get_film("Inception"))
+    films.supprimer_film("Inception")
+    assert salles.get_salle(1).film is None
+    programme = planifier(films.lister_films(), salles.lister_salles(), date(2025, 12, 10), nb_jours=1)
+    assert {f.titre for f, _, _ in programme} == {"Matrix"}
+    stockage.fermer()
+    _, salles2, _ = StockageSQLite(str(tmp_path / "cinema.db")).charger()
+    assert salles2.get_salle(1).film is None
@@ -0,0 +1,33 @@
+import pytest
+
+from vues import paginer
+
+
+MOTS = ["kiwi", "pomme", "fraise", "abricot", "figue", "poire", "melon"]
+
+
+def test_page_dans_l_ordre_du_parcours():
+    assert paginer(MOTS, debut=2, limite=3) == ["fraise", "abricot", "figue"]
+    assert paginer(MOTS, filtre=lambda m: len(m) == 5, debut=1) == ["figue", "poire", "melon"]
+    assert paginer(iter(MOTS), limite=2) == ["kiwi", "pomme"]
+
+
+def test_debut_au_dela_de_la_fin_et_limite_nulle():
+    assert paginer(MOTS, debut=7) == [] and paginer(MOTS, debut=100, limite=5) == []
+    assert paginer(MOTS, cle=len, debut=100, limite=5) == [] and paginer(MOTS, cle=len, debut=100) == []
+    assert paginer(MOTS, limite=0) == [] and paginer(MOTS, cle=len, limite=0) == []
+    assert paginer(MOTS, debut=5, limite=10) == ["poire", "melon"]
+    with pytest.raises(ValueError):
+        paginer(MOTS, debut=-1)
+    with pytest.raises(ValueError):
+        paginer(MOTS, limite=-1)
+
+
+@pytest.mark.parametrize("limite", [None, 2, 3, 10])
+def test_tri_par_cle_stable(limite):
+    # à longueur égale, l'ordre du parcours est conservé, dans les deux sens (comme sorted)
+    attendu = sorted(MOTS, key=len)[1:]
+    assert paginer(MOTS, cle=len, debut=1, limite=limite) == attendu[:limite]
+    attendu = sorted(MOTS, key=len, reverse=True)[1:]
+    assert paginer(MOTS, cle=len, inverse=True, debut=1, limite=limite) == attendu[:limite]
+    assert paginer(MOTS, cle=len, inverse=True, limite=3) == ["abricot", "fraise", "pomme"]
@@ -0,0 +1,38 @@
+"""
+Module : vues
+Fonction : requêtes paginées (filtre, tri, début, limite) sur les collections des gestionnaires.
+
+Les gestionnaires exposent leurs collections en vues en lecture seule (sans copie) ;
+`paginer` parcourt une vue et ne garde que la page demandée : sans tri, le parcours
+s'arrête dès que la page est complète ; avec tri et limite, seuls les `debut + limite`
+premiers éléments sont gardés (tas), au lieu de trier toute la collection.
+"""
+
+import heapq
+import itertools
+from typing import Any, Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+def paginer(elements: Iterable[T], filtre: Optional[Callable[[T], bool]] = None,
+            cle: Optional[Callable[[T], Any]] = None, inverse: bool = False,
+            debut: int = 0, limite: Optional[int] = None) -> List[T]:
+    """
+    Retourne la page [debut, debut + limite[ des éléments qui satisfont `filtre`,
+    triés par `cle` (ordre décroissant si `inverse`) ou dans l'ordre du parcours si `cle` est None.
+    Lève ValueError si `debut` ou `limite` est négatif.
+    """
+    if debut < 0 or (limite is not None and limite < 0):
+        raise ValueError("Le début et la limite d'une page doivent être positifs.")
+    if filtre is not None:
+        elements = filter(filtre, elements)
+    fin = None if limite is None else debut + limite
+    if cle is None:
+        return list(itertools.islice(elements, debut, fin))
+    if fin is None:
+        return sorted(elements, key=cle, reverse=inverse)[debut:]
+    # nlargest/nsmallest sont stables, comme sorted
+    premiers = heapq.nlargest(fin, elements, key=cle) if inverse else heapq.nsmallest(fin, elements, key=cle)
+    return premiers[debut:]
+
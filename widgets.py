@@ -0,0 +1,217 @@
+"""
+Module : widgets
+Fonction : composants Tkinter réutilisables par l'interface graphique.
+"""
+
+import string
+import tkinter as tk
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class ListeVirtuelle(tk.Frame):
+    """
+    Liste défilante qui n'instancie des widgets que pour les lignes visibles.
+    Les lignes qui sortent de la zone visible sont recyclées pour afficher les nouvelles :
+    `creer_ligne(parent)` construit un widget de ligne vide, `remplir_ligne(widget, index)`
+    le met à jour pour afficher la ligne `index`. Toutes les lignes ont la même hauteur.
+    """
+
+    def __init__(self, parent, nb_lignes: int, hauteur_ligne: int,
+                 creer_ligne: Callable, remplir_ligne: Callable, bg=None, **kwargs):
+        super().__init__(parent, bg=bg, **kwargs)
+        self.nb_lignes = nb_lignes
+        self.hauteur_ligne = hauteur_ligne
+        self.creer_ligne = creer_ligne
+        self.remplir_ligne = remplir_ligne
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side=tk.LEFT, fill='both', expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill='y')
+        self._visibles: Dict[int, Tuple[tk.Widget, int]] = {}  # index -> (widget, id canvas)
+        self._libres: List[Tuple[tk.Widget, int]] = []         # lignes recyclables
+        self._largeur = 1
+        self.canvas.bind('<Configure>', self._on_configure)
+        # Défilement avec la molette / pavé tactile lorsque le curseur survole la liste.
+        # Utilise <MouseWheel> (Windows/Mac) et <Button-4/5> (Linux) comme fallback.
+        self.bind('<Enter>', self._bind_scroll)
+        self.bind('<Leave>', self._unbind_scroll)
+        self._maj_scrollregion()
+
+    def rafraichir(self, tout: bool = False) -> None:
+        """Affiche les lignes de la zone visible ; `tout` force le remplissage de chacune."""
+        h = self.hauteur_ligne
+        if tout:
+            for idx in list(self._visibles):
+                self._liberer(idx)
+        haut = self.canvas.canvasy(0)
+        bas = haut + max(self.canvas.winfo_height(), h)
+        premier = max(0, int(haut // h))
+        dernier = min(self.nb_lignes, int(bas // h) + 1)
+        for idx in list(self._visibles):
+            if not premier <= idx < dernier:
+                self._liberer(idx)
+        for idx in range(premier, dernier):
+            if idx in self._visibles:
+                continue
+            if self._libres:
+                widget, item = self._libres.pop()
+                self.canvas.coords(item, 0, idx * h)
+                self.canvas.itemconfigure(item, state='normal')
+            else:
+                widget = self.creer_ligne(self.canvas)
+                item = self.canvas.create_window(0, idx * h, window=widget, anchor='nw',
+                                                 width=self._largeur, height=h)
+            self.remplir_ligne(widget, idx)
+            self._visibles[idx] = (widget, item)
+
+    def _liberer(self, idx: int) -> None:
+        widget, item = self._visibles.pop(idx)
+        self.canvas.itemconfigure(item, state='hidden')
+        self._libres.append((widget, item))
+
+    def _maj_scrollregion(self) -> None:
+        self.canvas.configure(scrollregion=(0, 0, self._largeur, self.nb_lignes * self.hauteur_ligne))
+
+    def _on_configure(self, event) -> None:
+        self._largeur = event.width
+        for _, item in list(self._visibles.values()) + self._libres:
+            self.canvas.itemconfigure(item, width=event.width)
+        self._maj_scrollregion()
+        self.rafraichir()
+
+    def _yview(self, *args) -> None:
+        self.canvas.yview(*args)
+        self.rafraichir()
+
+    def _on_mousewheel(self, event) -> None:
+        try:
+            # X11: Button-4 (up) / Button-5 (down)
+            if hasattr(event, 'num') and event.num in (4, 5):
+                delta = -1 if event.num == 4 else 1
+            else:
+                # Windows / Mac
+                delta = int(-1 * (event.delta / 120))
+            self.canvas.yview_scroll(delta, 'units')
+            self.rafraichir()
+        except Exception:
+            pass
+
+    def _bind_scroll(self, _) -> None:
+        self.canvas.bind_all('<MouseWheel>', self._on_mousewheel)
+        self.canvas.bind_all('<Button-4>', self._on_mousewheel)
+        self.canvas.bind_all('<Button-5>', self._on_mousewheel)
+
+    def _unbind_scroll(self, _) -> None:
+        try:
+            self.canvas.unbind_all('<MouseWheel>')
+            self.canvas.unbind_all('<Button-4>')
+            self.canvas.unbind_all('<Button-5>')
+        except Exception:
+            pass
+
+
+class PlanCanvas(tk.Frame):
+    """
+    Plan de salle dessiné sur un seul Canvas : chaque place est un rectangle (pas un widget).
+    Les clics sont localisés par calcul (rangée, colonne) et seule la place modifiée
+    est recolorée après une réservation via `maj_place`.
+    Une case None du plan (allée, emplacement sans siège) reste vide.
+    `est_retenue` (optionnel) distingue les places retenues temporairement par une caisse.
+    """
+
+    TAILLE_PLACE = 32
+    ESPACE = 6
+    MARGE = 40  # place pour les numéros de colonnes et les lettres de rangées
+    HAUTEUR_MAX = 420
+
+    def __init__(self, parent, plan: List[List[Optional[str]]], est_disponible: Callable, sur_clic: Callable,
+                 bg=None, fg_entetes=None, police=None, couleur_libre="green", couleur_prise="red",
+                 est_retenue: Optional[Callable] = None, couleur_retenue="orange", **kwargs):
+        super().__init__(parent, bg=bg, **kwargs)
+        self.plan = plan
+        self.est_disponible = est_disponible
+        self.sur_clic = sur_clic
+        self.couleur_libre = couleur_libre
+        self.couleur_prise = couleur_prise
+        self.est_retenue = est_retenue
+        self.couleur_retenue = couleur_retenue
+        self._items: Dict[str, int] = {}  # étiquette -> id du rectangle
+        pas = self.TAILLE_PLACE + self.ESPACE
+        colonnes = max(len(row) for row in plan) if plan else 0
+        largeur = self.MARGE + colonnes * pas
+        hauteur = self.MARGE + len(plan) * pas
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0, width=largeur,
+                                height=min(hauteur, self.HAUTEUR_MAX), scrollregion=(0, 0, largeur, hauteur))
+        self.canvas.pack(side=tk.LEFT)
+        if hauteur > self.HAUTEUR_MAX:
+            scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.canvas.yview)
+            self.canvas.configure(yscrollcommand=scrollbar.set)
+            scrollbar.pack(side=tk.RIGHT, fill='y')
+        self.dessiner(fg_entetes, police)
+        self.canvas.bind('<Button-1>', self._on_clic)
+
+    def dessiner(self, fg_entetes=None, police=None) -> None:
+        """(Re)dessine tout le plan : numéros de colonnes, lettres de rangées et places."""
+        c = self.canvas
+        c.delete('all')
+        self._items.clear()
+        pas = self.TAILLE_PLACE + self.ESPACE
+        demi = self.MARGE // 2
+        colonnes = max(len(row) for row in self.plan) if self.plan else 0
+        # Numérotation des colonnes en haut (numéro de la première place de chaque colonne ; rien au-dessus d'une allée)
+        numeros: List[Optional[str]] = [None] * colonnes
+        for row in self.plan:
+            for j, place in enumerate(row):
+                if place is not None and numeros[j] is None:
+                    numeros[j] = place.lstrip(string.ascii_uppercase)
+        for j, numero in enumerate(numeros):
+            if numero is not None:
+                c.create_text(self.MARGE + j * pas + self.TAILLE_PLACE // 2, demi, text=numero, fill=fg_entetes, font=police)
+        for i, row in enumerate(self.plan):
+            y = self.MARGE + i * pas
+            # Lettres de la rangée à gauche (préfixe de l'étiquette de la première place)
+            premiere = next((p for p in row if p is not None), None)
+            if premiere is not None:
+                lettre = premiere.rstrip('0123456789')
+                c.create_text(demi, y + self.TAILLE_PLACE // 2, text=lettre, fill=fg_entetes, font=police)
+            for j, place in enumerate(row):
+                if place is None:
+                    continue
+                x = self.MARGE + j * pas
+                self._items[place] = c.create_rectangle(
+                    x, y, x + self.TAILLE_PLACE, y + self.TAILLE_PLACE,
+                    fill=self._couleur(place), outline="")
+
+    def _couleur(self, place: str) -> str:
+        if self.est_disponible(place):
+            return self.couleur_libre
+        if self.est_retenue is not None and self.est_retenue(place):
+            return self.couleur_retenue
+        return self.couleur_prise
+
+    def maj_place(self, place: str) -> None:
+        """Recolore une seule place selon son état actuel."""
+        item = self._items.get(place)
+        if item is not None:
+            self.canvas.itemconfigure(item, fill=self._couleur(place))
+
+    def place_en(self, x: float, y: float):
+        """Retourne l'étiquette de la place sous le point (coordonnées canvas), ou None."""
+        pas = self.TAILLE_PLACE + self.ESPACE
+        if x < self.MARGE or y < self.MARGE:
+            return None
+        j, dx = divmod(int(x - self.MARGE), pas)
+        i, dy = divmod(int(y - self.MARGE), pas)
+        # clic dans l'espace entre deux places
+        if dx >= self.TAILLE_PLACE or dy >= self.TAILLE_PLACE:
+            return None
+        if i >= len(self.plan) or j >= len(self.plan[i]):
+            return None
+        return self.plan[i][j]
+
+    def _on_clic(self, event) -> None:
+        place = self.place_en(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        # les places réservées ne sont pas cliquables
+        if place is not None and self.est_disponible(place):
+            self.sur_clic(place)